@@ -18,13 +18,22 @@ urlpatterns = [
     path("ingreso-manual/listado/", views.manual_list, name="manual_list"),
     path("coupons/", views.admin_coupons, name="coupons"),
     path("coupons/export/", views.admin_coupons_export, name="coupons_export"),
+    path("vouchers/export/", views.admin_voucher_scans_export, name="voucher_scans_export"),
     path("coupons/<int:coupon_id>/print/", views.admin_print_coupon, name="print_coupon"),
     path(
         "coupons/<int:coupon_id>/reprint/",
         views.room_reprint_coupon,
         name="room_reprint_coupon",
     ),
+    path("exports/", views.admin_export_jobs, name="export_jobs"),
+    path("exports/status/", views.admin_export_jobs_status, name="export_jobs_status"),
+    path(
+        "exports/<int:job_id>/download/",
+        views.admin_export_job_download,
+        name="export_job_download",
+    ),
     path("reprints/", views.admin_reprints, name="reprints"),
+    path("reprints/export/", views.admin_reprints_export, name="reprints_export"),
     path("configuration/", views.admin_configuration, name="configuration"),
     path(
         "configuration/printers/",
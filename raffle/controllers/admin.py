@@ -1,6 +1,5 @@
-from datetime import datetime, time, timedelta
+from datetime import datetime
 
-from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import (
     get_user_model,
@@ -10,11 +9,9 @@ from django.contrib.auth import (
 )
 from django.contrib.auth.forms import PasswordChangeForm
 from django.db import IntegrityError, transaction
-from django.core.paginator import Paginator
-from django.db.models import Count, Q, Value
-from django.db.models.functions import Coalesce, Concat
+from django.db.models import Count, Q
 from django.forms import modelformset_factory
-from django.http import JsonResponse
+from django.http import FileResponse, JsonResponse, QueryDict
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
@@ -36,11 +33,17 @@ from ..forms import (
     VoucherAPITestForm,
 )
 from ..models import (
+    ArchivedCoupon,
+    ArchivedReprintLog,
+    ArchivedVoucherScan,
     Coupon,
     CouponReprint,
     CouponReprintLog,
     CouponSequence,
+    ExportDataVersion,
+    ExportJob,
     ManualCouponSequence,
+    NormalizationJob,
     Person,
     PrinterConfiguration,
     Room,
@@ -56,17 +59,41 @@ from ..services import (
     build_room_report_workbook,
     create_coupons,
     create_manual_coupon,
+    filter_coupon_queryset,
     get_or_create_printer_configuration,
     get_or_create_system_settings,
     print_coupon_backend,
+    printer_session_status,
+    register_entry,
     register_reprint,
     render_workbook_response,
-    validate_entry_rules,
+    spool_coupons,
 )
+from ..services.archive import (
+    archived_draws,
+    coupon_queryset,
+    reprint_log_queryset,
+    voucher_already_used,
+    voucher_scan_queryset,
+)
+from ..services.dashboard import DashboardFilters, get_dashboard_snapshot
+from ..services.export_jobs import apply_live_progress, evict_export_files, request_export
+from ..services.exports import (
+    COUPON_TABLE,
+    EXPORT_FORMATS,
+    REPRINT_LOG_TABLE,
+    VOUCHER_SCAN_TABLE,
+    render_export_response,
+)
+from ..services.normalization import active_normalization_job, request_normalization
+from ..services.pagination import cached_list_totals, keyset_paginate
+from ..services.participants import get_participant, refresh_participant
+from ..services.purge import purge_raffle_data
 from ..services.summary import get_coupon_room_summary as build_coupon_room_summary
+from ..services.terminals import terminal_names
 from ..utils.terminal import get_terminal_config, save_terminal_config
 from ..utils.terms import get_terms_text, save_terms_config
-from utils.printers import pyusb_available
+from utils.printers import close_usb_sessions, pyusb_available
 from .auth import admin_required, cashier_required, staff_required, user_is_administrator
 
 
@@ -235,11 +262,6 @@ def cashier_password_change(request):
 @admin_required
 def admin_dashboard(request):
     system_settings, _ = get_or_create_system_settings()
-    coupon_qs = Coupon.objects.select_related("person")
-    voucher_qs = VoucherScan.objects.select_related("person")
-    reprint_logs = CouponReprintLog.objects.values(
-        "user_id", "user__username", "user__first_name", "user__last_name"
-    )
 
     selected_room = request.GET.get("room")
     selected_source = request.GET.get("source")
@@ -250,22 +272,10 @@ def admin_dashboard(request):
 
     # FILTRO DE SALA
     room_id = int(selected_room) if selected_room and selected_room.isdigit() else None
-    if room_id:
-        coupon_qs = coupon_qs.filter(room_id=room_id)
-        voucher_qs = voucher_qs.filter(room_id=room_id)
-        reprint_logs = reprint_logs.filter(room_id=room_id)
-
-    if selected_terminal:
-        coupon_qs = coupon_qs.filter(terminal_name=selected_terminal)
-        voucher_qs = voucher_qs.filter(terminal_name=selected_terminal)
-        reprint_logs = reprint_logs.filter(coupon__terminal_name=selected_terminal)
 
     # FILTRO DE FUENTE
     valid_sources = {choice[0] for choice in Coupon.SOURCE_CHOICES}
     source_value = selected_source if selected_source in valid_sources else None
-    if source_value:
-        coupon_qs = coupon_qs.filter(source=source_value)
-        voucher_qs = voucher_qs.filter(source=source_value)
 
     # FILTRO DE FECHAS
     def _parse_date(value):
@@ -276,80 +286,26 @@ def admin_dashboard(request):
         except Exception:
             return None
 
-    start_date = _parse_date(date_start_param)
-    end_date = _parse_date(date_end_param)
-    current_tz = timezone.get_current_timezone()
-
-    if start_date:
-        dt = timezone.make_aware(datetime.combine(start_date, time.min), current_tz)
-        coupon_qs = coupon_qs.filter(scanned_at__gte=dt)
-        voucher_qs = voucher_qs.filter(scanned_at__gte=dt)
-
-    if end_date:
-        dt = timezone.make_aware(datetime.combine(end_date, time.max), current_tz)
-        coupon_qs = coupon_qs.filter(scanned_at__lte=dt)
-        voucher_qs = voucher_qs.filter(scanned_at__lte=dt)
-
     # DATASET
-    room_summary = _get_coupon_room_summary(coupon_qs)
-
-    reprint_totals = (
-        reprint_logs.annotate(total=Count("id")).order_by("-total", "user__username")
-    )
-
-    terminal_options = { "terminal" }
-    terminal_options.update(
-        Coupon.objects.exclude(terminal_name="").values_list("terminal_name", flat=True)
-    )
-    terminal_options.update(
-        VoucherScan.objects.exclude(terminal_name="").values_list("terminal_name", flat=True)
-    )
-    terminal_choices = sorted(filter(None, terminal_options))
-
-    recent_coupons = list(coupon_qs.order_by("-scanned_at")[:5])
-    chart_coupons = list(coupon_qs.order_by("-scanned_at")[:30])
-    burned_vouchers = list(voucher_qs.order_by("-scanned_at")[:10])
-    # Aggregate coupons generated by each cashier in the last 24 hours.
-    last_24_hours = timezone.now() - timedelta(hours=24)
-    cashier_last_24h = list(
-        coupon_qs.filter(scanned_at__gte=last_24_hours, created_by__isnull=False)
-        .values("created_by__username", "created_by__first_name", "created_by__last_name")
-        .annotate(
-            total=Count("id"),
-            display_name=Coalesce(
-                Concat("created_by__first_name", Value(" "), "created_by__last_name"),
-                Value(""),
-            ),
+    # Served from the per-filter snapshot cache; writes and a short TTL refresh it.
+    snapshot = get_dashboard_snapshot(
+        DashboardFilters(
+            room_id=room_id,
+            terminal_name=selected_terminal,
+            source=source_value,
+            start_date=_parse_date(date_start_param),
+            end_date=_parse_date(date_end_param),
         )
-        .order_by("-total", "created_by__username")
     )
 
-    dashboard_dataset = {
-        "roomLabels": [i["room"].name for i in room_summary],
-        "roomValues": [i["total"] for i in room_summary],
-        "sourceLabels": [c.get_source_display() for c in chart_coupons],
-        "recentDates": [c.scanned_at.date().isoformat() for c in chart_coupons],
-        "terminalLabels": [c.terminal_name or "Sin terminal" for c in chart_coupons],
-        "burnedRecentDates": [v.scanned_at.date().isoformat() for v in burned_vouchers],
-        "cashierLabels": [
-            (row["display_name"].strip() or row["created_by__username"] or "Sin usuario")
-            for row in cashier_last_24h
-        ],
-        "cashierValues": [row["total"] for row in cashier_last_24h],
-        "totalCoupons": coupon_qs.count(),
-        "totalBurned": voucher_qs.count(),
-    }
-
     context = _admin_context(
         {
-            "room_summary": room_summary,
-            "recent_coupons": recent_coupons,
-            "burned_vouchers": burned_vouchers,
-            "dashboard_dataset": dashboard_dataset,
+            **snapshot.data,
+            "snapshot_built_at": snapshot.built_at,
+            "snapshot_age": snapshot.age_seconds,
             "rooms": RoomDirectory.choices(),
             "sources": Coupon.SOURCE_CHOICES,
-            "terminals": terminal_choices,
-            "reprint_totals": reprint_totals,
+            "terminals": _coupon_terminal_options(system_settings),
             "filters": {
                 "room": room_id,
                 "source": source_value,
@@ -453,8 +409,7 @@ def staff_register(request):
             else:
                 form.add_error(None, "No se pudo completar el registro.")
         else:
-            for coupon in coupons:
-                print_coupon_backend(coupon)
+            spool_coupons(coupons)
             messages.success(request, "Participante registrado y cupones emitidos.")
             return redirect(reverse("raffle_admin:staff_register"))
 
@@ -541,52 +496,31 @@ def staff_entry(request):
         id_number = form.cleaned_data["id_number"]
         room_id = _get_active_room_id(request, system_settings)
         voucher_code = form.cleaned_data.get("voucher_code", "")
-        try:
-            person = Person.objects.get(id_number=id_number)
-        except Person.DoesNotExist:
+        person = get_participant(id_number)
+        if person is None:
             form.add_error("id_number", "No existe un participante con ese DNI.")
         else:
-            if VoucherScan.objects.filter(code=voucher_code).exists():
+            if voucher_already_used(voucher_code):
                 form.add_error(None, "El voucher ya fue utilizado.")
             else:
-                rule_check = validate_entry_rules(person, system_settings)
-                if not rule_check.is_valid:
-                    form.add_error(None, rule_check.message)
+                terminal_label = _get_terminal_label(system_settings)
+                try:
+                    coupons = register_entry(
+                        person,
+                        voucher_code,
+                        room_id,
+                        terminal_label,
+                        system_settings,
+                        created_by_user=request.user.has_operator_access,
+                    )
+                except EntryValidationError as error:
+                    form.add_error(None, str(error))
+                except IntegrityError:
+                    form.add_error(None, "No se pudo registrar el ingreso.")
                 else:
-                    terminal_label = _get_terminal_label(system_settings)
-                    try:
-                        with transaction.atomic():
-                            locked_rules = validate_entry_rules(
-                                person, system_settings, lock_rows=True
-                            )
-                            if not locked_rules.is_valid:
-                                raise EntryValidationError(locked_rules.message)
-
-                            VoucherScan.objects.create(
-                                code=voucher_code,
-                                person=person,
-                                room_id=room_id,
-                                terminal_name=terminal_label,
-                                source=Coupon.ENTRY,
-                            )
-                            coupons = create_coupons(
-                                person=person,
-                                quantity=1,
-                                source=Coupon.ENTRY,
-                                room_id=room_id,
-                                terminal_name=terminal_label,
-                                system_settings=system_settings,
-                                created_by_user=request.user.has_operator_access,
-                            )
-                    except EntryValidationError as error:
-                        form.add_error(None, str(error))
-                    except IntegrityError:
-                        form.add_error(None, "El voucher ya fue utilizado.")
-                    else:
-                        for coupon in coupons:
-                            print_coupon_backend(coupon)
-                        messages.success(request, "Ingreso registrado y cupón emitido.")
-                        return redirect(reverse("raffle_admin:staff_entry"))
+                    spool_coupons(coupons)
+                    messages.success(request, "Ingreso registrado y cupón emitido.")
+                    return redirect(reverse("raffle_admin:staff_entry"))
 
     context = _admin_context(
         {
@@ -617,25 +551,29 @@ def manual_entry(request):
 
     if request.method == "POST" and form.is_valid():
         id_number = form.cleaned_data["id_number"]
-        try:
-            person = Person.objects.get(id_number=id_number)
-        except Person.DoesNotExist:
+        person = get_participant(id_number)
+        if person is None:
             form.add_error("id_number", "No existe un participante con ese DNI.")
         else:
-            try:
-                with transaction.atomic():
-                    create_manual_coupon(
-                        person=person,
-                        user=request.user,
-                        room_id=_get_active_room_id(request, system_settings),
+            room_id = _get_active_room_id(request, system_settings)
+            for attempt in range(2):
+                try:
+                    with transaction.atomic():
+                        create_manual_coupon(person=person, user=request.user, room_id=room_id)
+                except IntegrityError:
+                    if attempt:
+                        form.add_error(None, "No se pudo generar el cupón manual.")
+                        break
+                    # The cached participant may have been deleted or merged elsewhere.
+                    person = refresh_participant(person)
+                    if person is None:
+                        form.add_error("id_number", "No existe un participante con ese DNI.")
+                        break
+                else:
+                    messages.success(
+                        request, "Cupón generado. Imprima los pendientes desde el listado."
                     )
-            except IntegrityError:
-                form.add_error(None, "No se pudo generar el cupón manual.")
-            else:
-                messages.success(
-                    request, "Cupón generado. Imprima los pendientes desde el listado."
-                )
-                return redirect("raffle_admin:manual_list")
+                    return redirect("raffle_admin:manual_list")
 
     context = _admin_context(
         {
@@ -679,39 +617,34 @@ def manual_list(request):
                 _set_active_room(request, selected_room_id, system_settings)
                 room_form = ManualPendingFilterForm(initial={"room_id": selected_room_id})
 
+    # Entry coupons are printed on the spot; they only show up here when the
+    # print spooler sent them back after a failed batch.
     pending_qs = (
         Coupon.objects.select_related("person", "created_by")
         .filter(
-            source__in=(Coupon.MANUAL, Coupon.REGISTER),
+            source__in=(Coupon.MANUAL, Coupon.REGISTER, Coupon.ENTRY),
             printed=False,
         )
         .order_by("scanned_at")
     )
+    failed_entry = Q(source=Coupon.ENTRY, room_id=selected_room_id)
 
     if is_admin_view:
         pass
     elif is_manager_view:
         pending_qs = pending_qs.filter(room_id=selected_room_id)
-        pending_qs = pending_qs.filter(created_by__role=UserModel.Role.CASHIER)
+        pending_qs = pending_qs.filter(
+            Q(created_by__role=UserModel.Role.CASHIER) | failed_entry
+        )
     else:
-        pending_qs = pending_qs.filter(created_by=request.user)
+        pending_qs = pending_qs.filter(Q(created_by=request.user) | failed_entry)
 
     cashier_summary = []
     room_summary = []
     room_creator_summary = []
     if is_admin_view:
-        room_summary_queryset = (
-            pending_qs.values("room_id")
-            .annotate(total=Count("id"))
-            .order_by("room_id")
-        )
-        room_summary = [
-            {
-                **item,
-                "room_name": RoomDirectory.get(item["room_id"]).name,
-            }
-            for item in room_summary_queryset
-        ]
+        # Buckets do not know the printed state; coupon_pending_idx keeps this small.
+        room_summary = _get_coupon_room_summary(pending_qs)
         room_creator_summary_queryset = (
             pending_qs.values(
                 "room_id",
@@ -784,14 +717,16 @@ def manual_list(request):
                 if not coupons:
                     messages.info(request, "No hay cupones pendientes de impresión.")
                     return redirect("raffle_admin:manual_list")
-                for coupon in coupons:
-                    print_coupon_backend(coupon)
-                    coupon.printed = True
-                    coupon.save(update_fields=["printed"])
+                # Claim the batch now; the spooler flags failures as pending again.
+                Coupon.objects.filter(id__in=[coupon.id for coupon in coupons]).update(
+                    printed=True
+                )
+                ExportDataVersion.bump()
+                spool_coupons(coupons)
         except Exception:
             messages.error(request, "No se pudo imprimir el lote de cupones.")
         else:
-            messages.success(request, "Cupones impresos y marcados como completados.")
+            messages.success(request, "Cupones enviados a la impresora y marcados como completados.")
         return redirect("raffle_admin:manual_list")
 
     context = _admin_context(
@@ -850,12 +785,17 @@ def configure_terminal(request):
 @admin_required
 @require_POST
 def admin_clear_database(request):
-    with transaction.atomic():
-        Coupon.objects.all().delete()
-        VoucherScan.objects.all().delete()
-        Person.objects.all().delete()
-
-    messages.success(request, "Se limpiaron todos los datos de la base.")
+    # Chunked set-based deletes; the ORM collector would load every row first.
+    report = purge_raffle_data()
+    counts = report.counts
+    messages.success(
+        request,
+        "Se limpiaron todos los datos de la base: "
+        f"{counts[Coupon._meta.db_table]} cupones, "
+        f"{counts[VoucherScan._meta.db_table]} vouchers y "
+        f"{counts[Person._meta.db_table]} participantes "
+        f"({report.total} filas en {report.seconds:.1f} s).",
+    )
     return redirect("raffle_admin:dashboard")
 
 
@@ -864,86 +804,24 @@ def admin_clear_database(request):
 # -----------------------------------------------------------------------------
 
 
-def _filter_coupons_queryset(request, coupons, system_settings):
-    """Apply room and terminal filters to the coupons queryset."""
-
-    selected_room = request.GET.get("room")
-    selected_room_id = int(selected_room) if selected_room and selected_room.isdigit() else None
-    if selected_room_id is not None:
-        coupons = coupons.filter(room_id=selected_room_id)
-
-    selected_terminal = (request.GET.get("terminal") or "").strip()
-    if selected_terminal:
-        coupons = coupons.filter(terminal_name=selected_terminal)
+def _coupon_terminal_options(system_settings) -> list[str]:
+    """Return the terminal names offered by the coupon filters."""
 
     terminal_options = {_get_terminal_label(system_settings)}
-    terminal_options.update(
-        Coupon.objects.exclude(terminal_name="").values_list("terminal_name", flat=True)
-    )
-    terminals = sorted(filter(None, terminal_options))
-
-    return coupons, selected_room_id, selected_terminal, terminals
+    terminal_options.update(terminal_names())
+    return sorted(filter(None, terminal_options))
 
 
-def _apply_coupon_filters(request, coupons, system_settings):
+def _apply_coupon_filters(request, coupons, system_settings, prefix="", date_field=None):
     """Apply all available filters to the coupon queryset."""
 
-    coupons, selected_room_id, selected_terminal, terminals = _filter_coupons_queryset(
-        request, coupons, system_settings
-    )
-
-    participant_query = (request.GET.get("participant") or "").strip()
-    if participant_query:
-        coupons = coupons.filter(
-            Q(person__first_name__icontains=participant_query)
-            | Q(person__last_name__icontains=participant_query)
-            | Q(person__id_number__icontains=participant_query)
-        )
-
-    coupon_query = (request.GET.get("coupon") or "").strip()
-    if coupon_query:
-        coupons = coupons.filter(
-            Q(code__icontains=coupon_query)
-            | Q(person__phone__icontains=coupon_query)
-            | Q(person__email__icontains=coupon_query)
-        )
-
-    source_value = (request.GET.get("source") or "").strip()
-    valid_sources = {choice[0] for choice in Coupon.SOURCE_CHOICES}
-    if source_value and source_value in valid_sources:
-        coupons = coupons.filter(source=source_value)
-    else:
-        source_value = ""
-
-    def _parse_date(value: str | None):
-        try:
-            return datetime.strptime(value, "%Y-%m-%d").date()
-        except (TypeError, ValueError):
-            return None
-
-    start_date = _parse_date(request.GET.get("date_start"))
-    end_date = _parse_date(request.GET.get("date_end"))
-    current_tz = timezone.get_default_timezone()
-    if start_date:
-        dt = datetime.combine(start_date, time.min)
-        dt = timezone.make_aware(dt, current_tz) if settings.USE_TZ else dt
-        coupons = coupons.filter(scanned_at__gte=dt)
-    if end_date:
-        dt = datetime.combine(end_date, time.max)
-        dt = timezone.make_aware(dt, current_tz) if settings.USE_TZ else dt
-        coupons = coupons.filter(scanned_at__lte=dt)
-
+    coupons, selections = filter_coupon_queryset(coupons, request.GET, prefix, date_field)
     filter_state = {
         "rooms": RoomDirectory.choices(),
-        "selected_room": selected_room_id,
-        "terminals": terminals,
-        "selected_terminal": selected_terminal,
-        "selected_participant": participant_query,
-        "selected_coupon": coupon_query,
-        "selected_source": source_value,
-        "date_start": request.GET.get("date_start", ""),
-        "date_end": request.GET.get("date_end", ""),
+        "terminals": _coupon_terminal_options(system_settings),
+        **selections,
         "source_choices": Coupon.SOURCE_CHOICES,
+        "archive_options": archived_draws(),
     }
 
     return coupons, filter_state
@@ -952,29 +830,35 @@ def _apply_coupon_filters(request, coupons, system_settings):
 @admin_required
 def admin_coupons(request):
     system_settings, _ = get_or_create_system_settings()
-    base_coupons = Coupon.objects.select_related("person").order_by("-scanned_at")
+    # Archived draws are only read when the "archive" filter asks for them.
+    base_coupons = coupon_queryset(request.GET).select_related("person").order_by("-scanned_at")
     coupons, filter_state = _apply_coupon_filters(request, base_coupons, system_settings)
 
-    paginator = Paginator(coupons, 100)
-    page_number = request.GET.get("page")
-    page_obj = paginator._get_page([], 1, paginator) if paginator.count == 0 else paginator.get_page(page_number)
+    # Seek pagination on (scanned_at, id): every page is an indexed range read.
+    page = keyset_paginate(coupons, after=request.GET.get("after"), before=request.GET.get("before"))
+
+    # Totals are shared by every page of the same filters until a write or the TTL.
+    # They stay on the detail rows: buckets also count archived draws and carry
+    # no participants or last emission.
+    filter_key = tuple(sorted(
+        (key, value) for key, value in request.GET.items() if key not in ("after", "before")
+    ))
+    totals = cached_list_totals(filter_key, lambda: _get_coupon_room_summary(coupons))
+    room_summary = totals.value
 
     base_params = request.GET.copy()
-    base_params.pop("page", None)
+    for key in ("after", "before", "page"):
+        base_params.pop(key, None)
     base_query = base_params.urlencode()
     base_query = f"{base_query}&" if base_query else ""
-    current_page = page_obj.number if paginator.count else 1
-    total_pages = paginator.num_pages or 1
 
     context = _admin_context(
         {
-            "coupons": page_obj.object_list,
-            "room_summary": _get_coupon_room_summary(coupons),
-            "coupon_count": paginator.count,
-            "paginator": paginator,
-            "page_obj": page_obj,
-            "current_page": current_page,
-            "total_pages": total_pages,
+            "coupons": page.object_list,
+            "room_summary": room_summary,
+            "coupon_count": sum(item["total"] for item in room_summary),
+            "coupon_count_age": totals.age_seconds,
+            "page_obj": page,
             "pagination_query": base_query,
             "export_query": request.GET.urlencode(),
             **filter_state,
@@ -985,12 +869,44 @@ def admin_coupons(request):
     return render(request, "raffle/admin_coupons.html", context)
 
 
+def _export_filename(prefix_tokens, filter_state) -> str:
+    """Build an export filename from the active filters and the local time."""
+
+    filename_tokens = list(prefix_tokens)
+    selected_room_id = filter_state.get("selected_room")
+    selected_terminal = filter_state.get("selected_terminal")
+    if selected_room_id is not None:
+        filename_tokens.append(f"sala{selected_room_id}")
+    if selected_terminal:
+        filename_tokens.append(selected_terminal)
+    if filter_state.get("selected_archive"):
+        filename_tokens.append(f"archivo_{filter_state['selected_archive']}")
+    now_value = timezone.now()
+    timestamp_reference = timezone.localtime(now_value) if timezone.is_aware(now_value) else now_value
+    timestamp = timestamp_reference.strftime("%Y%m%d_%H%M")
+    return "_".join(filename_tokens + [timestamp])
+
+
+def _wants_gzip(request) -> bool:
+    return (request.GET.get("gzip") or "").lower() in {"1", "true", "si", "yes"}
+
+
 @admin_required
 def admin_coupons_export(request):
     system_settings, _ = get_or_create_system_settings()
-    coupons = Coupon.objects.select_related("person").order_by("-scanned_at")
+    coupons = coupon_queryset(request.GET).select_related("person").order_by("-scanned_at")
     coupons, filter_state = _apply_coupon_filters(request, coupons, system_settings)
 
+    export_format = (request.GET.get("format") or "xlsx").lower()
+    if export_format in EXPORT_FORMATS:
+        return render_export_response(
+            COUPON_TABLE,
+            coupons,
+            export_format,
+            _export_filename(["cupones"], filter_state),
+            compress=_wants_gzip(request),
+        )
+
     export_type = (request.GET.get("export") or "all").lower()
     builder = {
         "all": build_coupon_report_workbook,
@@ -1004,20 +920,111 @@ def admin_coupons_export(request):
         filename_tokens.append("por_sala")
     elif export_type == "day":
         filename_tokens.append("por_dia")
-    selected_room_id = filter_state.get("selected_room")
-    selected_terminal = filter_state.get("selected_terminal")
-    if selected_room_id is not None:
-        filename_tokens.append(f"sala{selected_room_id}")
-    if selected_terminal:
-        filename_tokens.append(selected_terminal)
-    now_value = timezone.now()
-    timestamp_reference = timezone.localtime(now_value) if timezone.is_aware(now_value) else now_value
-    timestamp = timestamp_reference.strftime("%Y%m%d_%H%M")
-    filename = "_".join(filename_tokens + [timestamp]) + ".xlsx"
+    filename = _export_filename(filename_tokens, filter_state) + ".xlsx"
 
     return render_workbook_response(workbook, filename)
 
 
+@admin_required
+def admin_voucher_scans_export(request):
+    system_settings, _ = get_or_create_system_settings()
+    scans = voucher_scan_queryset(request.GET).order_by("-scanned_at")
+    scans, filter_state = _apply_coupon_filters(request, scans, system_settings)
+    return render_export_response(
+        VOUCHER_SCAN_TABLE,
+        scans,
+        (request.GET.get("format") or "csv").lower(),
+        _export_filename(["vouchers"], filter_state),
+        compress=_wants_gzip(request),
+    )
+
+
+@admin_required
+def admin_reprints_export(request):
+    system_settings, _ = get_or_create_system_settings()
+    reprints = reprint_log_queryset(request.GET).order_by("-created_at")
+    reprints, filter_state = _apply_coupon_filters(
+        request, reprints, system_settings, prefix="coupon__", date_field="created_at"
+    )
+    return render_export_response(
+        REPRINT_LOG_TABLE,
+        reprints,
+        (request.GET.get("format") or "csv").lower(),
+        _export_filename(["reimpresiones"], filter_state),
+        compress=_wants_gzip(request),
+    )
+
+
+# -----------------------------------------------------------------------------
+# EXPORTACIONES EN SEGUNDO PLANO
+# -----------------------------------------------------------------------------
+
+def _export_job_payload(job: ExportJob) -> dict:
+    return {
+        "id": job.pk,
+        "status": job.status,
+        "status_label": job.get_status_display(),
+        "progress": job.progress,
+        "rows_written": job.rows_written,
+        "total_rows": job.total_rows,
+        "error": job.error,
+        "download_url": (
+            reverse("raffle_admin:export_job_download", args=[job.pk])
+            if job.status == ExportJob.Status.DONE
+            else ""
+        ),
+    }
+
+
+@admin_required
+def admin_export_jobs(request):
+    if request.method == "POST":
+        params = QueryDict(request.POST.get("params", ""))
+        job, created = request_export(
+            request.POST.get("dataset", ExportJob.Dataset.COUPONS),
+            request.POST.get("format", ExportJob.Format.XLSX),
+            params,
+            user=request.user,
+            export_type=request.POST.get("export", "all"),
+            compress=bool(request.POST.get("gzip")),
+        )
+        if created:
+            messages.success(request, "Exportación en cola. Puede seguir trabajando mientras se genera.")
+        else:
+            messages.info(request, "Ya existe una exportación idéntica; se reutiliza el mismo archivo.")
+        return redirect(f"{reverse('raffle_admin:export_jobs')}?job={job.pk}")
+
+    evict_export_files()
+    jobs = [apply_live_progress(job) for job in ExportJob.objects.select_related("created_by")[:50]]
+    context = _admin_context(
+        {
+            "jobs": jobs,
+            "highlight_job": request.GET.get("job", ""),
+            "has_active_jobs": any(job.is_active for job in jobs),
+        },
+        user=request.user,
+    )
+    return render(request, "raffle/admin_export_jobs.html", context)
+
+
+@admin_required
+def admin_export_jobs_status(request):
+    ids = [int(value) for value in request.GET.getlist("id") if value.isdigit()]
+    jobs = ExportJob.objects.filter(pk__in=ids)
+    return JsonResponse({"jobs": [_export_job_payload(apply_live_progress(job)) for job in jobs]})
+
+
+@admin_required
+def admin_export_job_download(request, job_id: int):
+    job = get_object_or_404(ExportJob, pk=job_id, status=ExportJob.Status.DONE)
+    try:
+        handle = open(job.file_path, "rb")
+    except OSError:
+        messages.error(request, "El archivo ya no está disponible; genere la exportación nuevamente.")
+        return redirect("raffle_admin:export_jobs")
+    return FileResponse(handle, as_attachment=True, filename=job.filename)
+
+
 # -----------------------------------------------------------------------------
 # REIMPRESIONES
 # -----------------------------------------------------------------------------
@@ -1053,16 +1060,7 @@ def admin_reprints(request):
 
     room_lookup = {room.id: room.name for room in RoomDirectory.all()}
 
-    terminal_options = {_get_terminal_label(system_settings)}
-    terminal_options.update(
-        Coupon.objects.exclude(terminal_name="").values_list("terminal_name", flat=True)
-    )
-    terminal_options.update(
-        CouponReprintLog.objects.exclude(coupon__terminal_name="").values_list(
-            "coupon__terminal_name", flat=True
-        )
-    )
-    terminals = sorted(filter(None, terminal_options))
+    terminals = _coupon_terminal_options(system_settings)
 
     context = _admin_context(
         {
@@ -1156,6 +1154,8 @@ def admin_configuration(request):
 
         if active_tab == "printers" and configuration_form.is_valid():
             configuration_form.save()
+            # Drop open USB handles so the next job connects with the new identifiers.
+            close_usb_sessions()
             messages.success(request, "Configuración de impresora guardada correctamente.")
             return redirect(f"{reverse('raffle_admin:configuration')}?tab=printers")
 
@@ -1209,12 +1209,14 @@ def admin_configuration(request):
             "locked_room_ids": locked_room_ids,
             "usb_devices": None,
             "pyusb_available": pyusb_available(),
+            "printer_session": printer_session_status(configuration),
             "active_tab": active_tab,
             "user_form": user_form,
             "user_list": UserModel.objects.order_by("username"),
             "editing_user": editing_user,
             "delete_form": delete_form,
             "local_printer_form": printer_form,
+            "normalization_job": active_normalization_job() or NormalizationJob.objects.first(),
         },
         configuration=configuration,
         system_settings=system_settings,
@@ -1224,33 +1226,23 @@ def admin_configuration(request):
     return render(request, "raffle/admin_configuration.html", context)
 
 
-def _normalize_person_name(value: str) -> str:
-    # Collapse whitespace and convert to title case for consistent storage.
-    normalized = " ".join(value.split()).strip()
-    return normalized.title()
-
-
 @require_POST
 @admin_required
 def admin_normalize_participants(request):
-    # Normalize participant names across the roster.
-    updated = 0
-    for person in Person.objects.all().iterator():
-        normalized_first = _normalize_person_name(person.first_name)
-        normalized_last = _normalize_person_name(person.last_name)
-        if normalized_first != person.first_name or normalized_last != person.last_name:
-            Person.objects.filter(pk=person.pk).update(
-                first_name=normalized_first,
-                last_name=normalized_last,
-            )
-            updated += 1
-
-    if updated:
+    # Title-case participant names in the background, in PK-ordered batches.
+    job, created = request_normalization(request.user)
+    if not created:
+        messages.info(
+            request,
+            f"La normalización de participantes ya está en curso ({job.progress}%).",
+        )
+    elif job.last_pk:
         messages.success(
-            request, f"Normalized {updated} participant name(s) to Title Case."
+            request,
+            f"Normalización de participantes reanudada desde el participante #{job.last_pk}.",
         )
     else:
-        messages.info(request, "All participant names are already normalized.")
+        messages.success(request, "Normalización de participantes iniciada en segundo plano.")
 
     return redirect(f"{reverse('raffle_admin:configuration')}?tab=system")
 
@@ -1320,6 +1312,10 @@ def _rooms_with_dependencies(room_ids: set[int], system_settings: SystemSettings
                 "room_id", flat=True
             )
         ),
+        *(
+            set(model.objects.filter(room_id__in=room_ids).values_list("room_id", flat=True))
+            for model in (ArchivedCoupon, ArchivedVoucherScan, ArchivedReprintLog)
+        ),
     ]
 
     dependencies = set().union(*dependency_sets)
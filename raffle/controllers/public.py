@@ -4,15 +4,20 @@ from django.shortcuts import redirect, render
 from django.views.decorators.http import require_POST
 
 from ..forms import EntryForm, RegistrationForm
-from ..models import Coupon, Person, VoucherScan
+from ..models import Coupon, Person
 from ..services import (
     EntryValidationError,
     create_coupons,
     get_or_create_system_settings,
-    print_coupon_backend,
-    validate_entry_rules,
+    issue_validation_token,
+    register_entry,
+    spool_coupons,
     validate_voucher_code,
+    verify_validation_token,
 )
+from ..services.archive import voucher_already_used
+from ..services.participants import get_participant
+from ..services.voucher_validation import VoucherValidationResult
 from ..utils.terminal import get_terminal_config
 from ..utils.terms import get_terms_text
 
@@ -52,8 +57,7 @@ def register(request):
             else:
                 form.add_error(None, "No se pudo completar el registro.")
         else:
-            for coupon in coupons:
-                print_coupon_backend(coupon)
+            spool_coupons(coupons)
             if coupons:
                 return redirect("raffle:home")
     return render(
@@ -82,65 +86,46 @@ def entry(request):
         voucher_code = form.cleaned_data.get("voucher_code", "")
 
         # Buscar persona por DNI
-        try:
-            person = Person.objects.get(id_number=id_number)
-        except Person.DoesNotExist:
+        person = get_participant(id_number)
+        if person is None:
             form.add_error("id_number", "No existe un participante con ese DNI.")
         else:
-            validation = validate_voucher_code(
-                voucher_code, room_id, terminal_config.get("room_ip")
-            )
+            # A fresh token from the scanner means the room API already
+            # accepted this voucher; otherwise validate it live.
+            token = form.cleaned_data.get("validation_token", "")
+            if verify_validation_token(token, voucher_code, room_id, terminal_name):
+                validation = VoucherValidationResult(True, "")
+            else:
+                validation = validate_voucher_code(
+                    voucher_code, room_id, terminal_config.get("room_ip")
+                )
             if not validation.is_valid:
                 status_message = validation.message
                 form.add_error(None, validation.message)
-            elif VoucherScan.objects.filter(code=voucher_code).exists():
+            elif voucher_already_used(voucher_code):
                 form.add_error(None, "El voucher ya fue utilizado.")
             else:
-                rule_check = validate_entry_rules(person, system_settings)
-                if not rule_check.is_valid:
-                    form.add_error(None, rule_check.message)
-                    status_message = rule_check.message
+                try:
+                    # Registrar el voucher validado y crear el cupón
+                    coupons = register_entry(
+                        person,
+                        voucher_code,
+                        room_id,
+                        terminal_name,
+                        system_settings,
+                        created_by_user=False,
+                    )
+                except EntryValidationError as error:
+                    form.add_error(None, str(error))
+                    status_message = str(error)
+                except IntegrityError:
+                    form.add_error(None, "No se pudo registrar el ingreso.")
                 else:
-                    try:
-                        with transaction.atomic():
-                            locked_rules = validate_entry_rules(
-                                person, system_settings, lock_rows=True
-                            )
-                            if not locked_rules.is_valid:
-                                raise EntryValidationError(locked_rules.message)
-
-                            # Registrar el voucher validado
-                            VoucherScan.objects.create(
-                                code=voucher_code,
-                                person=person,
-                                room_id=room_id,
-                                terminal_name=terminal_name,
-                                source=Coupon.ENTRY,
-                            )
-
-                            # Crear cupón
-                            coupons = create_coupons(
-                                person=person,
-                                quantity=1,
-                                source=Coupon.ENTRY,
-                                room_id=room_id,
-                                terminal_name=terminal_name,
-                                system_settings=system_settings,
-                                created_by_user=False,
-                            )
-
-                    except EntryValidationError as error:
-                        form.add_error(None, str(error))
-                        status_message = str(error)
-                    except IntegrityError:
-                        form.add_error(None, "El voucher ya fue utilizado.")
-                    else:
-                        # Imprimir cupones
-                        for coupon in coupons:
-                            print_coupon_backend(coupon)
-
-                        if coupons:
-                            return redirect("raffle:home")
+                    # Imprimir cupones en segundo plano
+                    spool_coupons(coupons)
+
+                    if coupons:
+                        return redirect("raffle:home")
 
     return render(
         request,
@@ -163,12 +148,17 @@ def validate_entry_voucher(request):
     if not code:
         return JsonResponse({"valid": False, "message": "Voucher requerido."}, status=400)
 
-    validation = validate_voucher_code(
-        code.upper(), terminal_config["room_id"], terminal_config.get("room_ip")
-    )
-    status_code = 200 if validation.is_valid else 400
+    code = code.upper()
+    room_id = terminal_config["room_id"]
+    validation = validate_voucher_code(code, room_id, terminal_config.get("room_ip"))
+    if not validation.is_valid:
+        return JsonResponse({"valid": False, "message": validation.message}, status=400)
     return JsonResponse(
-        {"valid": validation.is_valid, "message": validation.message}, status=status_code
+        {
+            "valid": True,
+            "message": validation.message,
+            "token": issue_validation_token(code, room_id, terminal_config["terminal_id"]),
+        }
     )
 
 
@@ -178,9 +168,8 @@ def person_lookup(request):
     if not id_number:
         return JsonResponse({"error": "Missing id_number."}, status=400)
 
-    try:
-        person = Person.objects.get(id_number=id_number)
-    except Person.DoesNotExist:
+    person = get_participant(id_number)
+    if person is None:
         return JsonResponse({"error": "Person not found."}, status=404)
 
     full_name = f"{person.first_name} {person.last_name}".strip()
@@ -18,6 +18,7 @@ class EntryForm(forms.Form):
         widget=forms.HiddenInput(),
     )
     voucher_code = forms.CharField(required=True, widget=forms.HiddenInput())
+    validation_token = forms.CharField(required=False, widget=forms.HiddenInput())
 
     def clean_room_id(self) -> int:
         """Validate and convert the selected room identifier."""
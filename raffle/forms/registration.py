@@ -4,6 +4,7 @@ from django import forms
 
 from ..models import Person
 from ..rooms import RoomDirectory
+from ..services.participants import participant_exists
 
 
 class RegistrationForm(forms.ModelForm):
@@ -62,10 +63,22 @@ class RegistrationForm(forms.ModelForm):
         """Ensure the document number is unique."""
 
         id_number = self.cleaned_data["id_number"].strip()
-        if Person.objects.filter(id_number=id_number).exists():
+        if participant_exists(id_number):
             raise forms.ValidationError("Ya existe un participante con ese DNI.")
         return id_number
 
+    def validate_unique(self):
+        """Skip the DNI uniqueness query; ``clean_id_number`` already checked it."""
+
+        # A concurrent registration still fails on the unique index, which the
+        # registration views report as a duplicate DNI.
+        exclude = self._get_validation_exclusions()
+        exclude.add("id_number")
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except forms.ValidationError as error:
+            self._update_errors(error)
+
     def clean_email(self) -> str:
         """Normalize the email address before persisting it."""
 
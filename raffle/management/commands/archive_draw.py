@@ -0,0 +1,54 @@
+"""Move the coupons, voucher scans and reprint logs of past draws to the archive."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from raffle.services.archive import ARCHIVE_CHUNK_SIZE, archive_through, archived_draws, draw_cutoff
+from raffle.utils.terms import get_draw_dates
+
+
+class Command(BaseCommand):
+    help = "Archive every row scanned before a draw, split by the draw it belonged to."  # noqa: A003
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--draw-date",
+            help="Draw date (YYYY-MM-DD). Defaults to the latest draw already held.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=ARCHIVE_CHUNK_SIZE)
+        parser.add_argument("--list", action="store_true", help="List the archived draws and exit.")
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            for archive in archived_draws():
+                self.stdout.write(
+                    f"{archive.draw_date:%d/%m/%Y}: {archive.coupons} cupones, "
+                    f"{archive.voucher_scans} vouchers, {archive.reprint_logs} reimpresiones"
+                )
+            return
+
+        draw_date = self._draw_date(options["draw_date"])
+        report = archive_through(draw_date, chunk_size=options["chunk_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archivado hasta el sorteo del {draw_date:%d/%m/%Y}: {report.coupons} cupones, "
+                f"{report.voucher_scans} vouchers y {report.reprint_logs} reimpresiones "
+                f"en {report.seconds:.1f} s."
+            )
+        )
+
+    def _draw_date(self, value: str | None) -> date:
+        if value:
+            try:
+                return datetime.strptime(value, "%Y-%m-%d").date()
+            except ValueError as exc:
+                raise CommandError("La fecha del sorteo debe tener el formato AAAA-MM-DD.") from exc
+        now = timezone.now()
+        held = [day for day in get_draw_dates() if draw_cutoff(day) <= now]
+        if not held:
+            raise CommandError("Todavía no se realizó ningún sorteo; indique --draw-date.")
+        return held[-1]
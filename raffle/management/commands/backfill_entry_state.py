@@ -0,0 +1,42 @@
+"""Rebuild per-participant entry rate state from scans and coupons."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef, Q
+
+from raffle.models import ArchivedVoucherScan, Person, VoucherScan
+from raffle.services.entry_rules import rebuild_entry_rate_states
+
+
+class Command(BaseCommand):
+    help = "Backfill EntryRateState rows for every participant with entry activity."  # noqa: A003
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options["chunk_size"])
+        # Participants whose only scans were archived still need their state.
+        person_ids = (
+            Person.objects.filter(
+                Q(Exists(VoucherScan.objects.filter(person=OuterRef("pk"))))
+                | Q(Exists(ArchivedVoucherScan.objects.filter(person=OuterRef("pk"))))
+            )
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+        total = 0
+        last_pk = 0
+        while True:
+            chunk = list(person_ids.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+            last_pk = chunk[-1]
+            total += rebuild_entry_rate_states(chunk)
+            self.stdout.write(f"{total} participantes procesados...")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Estado de ingresos reconstruido para {total} participantes.")
+        )
@@ -0,0 +1,86 @@
+"""Measure coupon code throughput for per-code locking versus leased ranges."""
+
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from raffle.models import CouponSequence
+from raffle.services.sequences import allocate_coupon_numbers, reset_coupon_leases
+
+
+class _Rollback(Exception):
+    """Abort the benchmark transaction so no sequence numbers are consumed."""
+
+
+def _legacy_allocate(room_id: int, terminal_name: str) -> int:
+    # Previous behaviour: lock, increment and save the sequence for every code.
+    with transaction.atomic():
+        sequence, _ = CouponSequence.objects.select_for_update().get_or_create(
+            room_id=room_id, terminal_name=terminal_name, defaults={"last_number": 0}
+        )
+        sequence.last_number += 1
+        sequence.save(update_fields=["last_number"])
+        return sequence.last_number
+
+
+class Command(BaseCommand):
+    help = "Benchmark coupon number allocation (codes per second and queries per code)."  # noqa: A003
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=1000)
+        parser.add_argument("--room-id", type=int, default=1)
+        parser.add_argument("--terminal", default="BENCH")
+        parser.add_argument(
+            "--block-size",
+            type=int,
+            action="append",
+            dest="block_sizes",
+            help="Lease block size to measure; repeat to compare several sizes.",
+        )
+
+    def handle(self, *args, **options):
+        count = max(1, options["count"])
+        room_id = options["room_id"]
+        terminal = options["terminal"]
+        block_sizes = options["block_sizes"] or [1, 10, 50, 200]
+
+        runs = [("per-code lock (before)", lambda: _legacy_allocate(room_id, terminal))]
+        for size in block_sizes:
+            runs.append(
+                (
+                    f"leased block={size}",
+                    lambda size=size: allocate_coupon_numbers(room_id, terminal, block_size=size)[0],
+                )
+            )
+
+        for label, allocate in runs:
+            elapsed, queries = self._measure(allocate, count)
+            self.stdout.write(
+                f"{label:<24} {count / elapsed:>10.0f} codes/s  "
+                f"{queries / count:>6.2f} queries/code"
+            )
+
+    def _measure(self, allocate, count: int) -> tuple[float, int]:
+        executed = 0
+
+        def counter(execute, sql, params, many, context):
+            nonlocal executed
+            executed += 1
+            return execute(sql, params, many, context)
+
+        reset_coupon_leases()
+        try:
+            with connection.execute_wrapper(counter), transaction.atomic():
+                started = time.perf_counter()
+                for _ in range(count):
+                    allocate()
+                elapsed = time.perf_counter() - started
+                raise _Rollback
+        except _Rollback:
+            pass
+        finally:
+            reset_coupon_leases()
+        return elapsed, executed
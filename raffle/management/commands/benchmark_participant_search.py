@@ -0,0 +1,134 @@
+"""Compare the participant/coupon searches on icontains versus the trigram index."""
+
+from __future__ import annotations
+
+import random
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+
+from raffle.models import Coupon, Person
+from raffle.services.filters import filter_coupon_queryset
+from raffle.services.search import rebuild_search_index
+
+FIRST_NAMES = ["Juan", "María", "Lucía", "Martín", "Sofía", "Diego", "Valentina", "Tomás"]
+LAST_NAMES = ["Gómez", "Fernández", "Pérez", "Rodríguez", "Sosa", "Díaz", "Romero", "Álvarez"]
+BATCH_SIZE = 5000
+
+
+class _Rollback(Exception):
+    """Abort the benchmark transaction so the synthetic rows are discarded."""
+
+
+def _legacy_filter(queryset, params):
+    # Previous behaviour: leading-wildcard icontains over the joined tables.
+    participant = params.get("participant")
+    if participant:
+        queryset = queryset.filter(
+            Q(person__first_name__icontains=participant)
+            | Q(person__last_name__icontains=participant)
+            | Q(person__id_number__icontains=participant)
+        )
+    coupon = params.get("coupon")
+    if coupon:
+        queryset = queryset.filter(
+            Q(code__icontains=coupon)
+            | Q(person__phone__icontains=coupon)
+            | Q(person__email__icontains=coupon)
+        )
+    return queryset
+
+
+class Command(BaseCommand):
+    help = "Benchmark coupon list searches on synthetic participants and coupons."  # noqa: A003
+
+    def add_arguments(self, parser):
+        parser.add_argument("--coupons", type=int, default=1_000_000)
+        parser.add_argument("--people", type=int, default=50_000)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=2026)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        try:
+            with transaction.atomic():
+                self._populate(rng, max(1, options["people"]), max(1, options["coupons"]))
+                for params in self._queries():
+                    self._compare(params, max(1, options["repeat"]))
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _populate(self, rng, people_count: int, coupon_count: int) -> None:
+        started = time.perf_counter()
+        people = Person.objects.bulk_create(
+            [
+                Person(
+                    first_name=rng.choice(FIRST_NAMES),
+                    last_name=rng.choice(LAST_NAMES),
+                    id_number=f"9{index:08d}",
+                    phone=f"11{rng.randrange(10**8):08d}",
+                    email=f"bench{index}@example.com",
+                    birth_date=date(1990, 1, 1),
+                )
+                for index in range(people_count)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        person_ids = [person.pk for person in people]
+        batch = []
+        for index in range(coupon_count):
+            batch.append(
+                Coupon(
+                    person_id=rng.choice(person_ids),
+                    code=f"BENCH-T{index % 7}-{index:07d}",
+                    source=Coupon.ENTRY,
+                    room_id=1,
+                    terminal_name=f"T{index % 7}",
+                )
+            )
+            if len(batch) >= BATCH_SIZE:
+                Coupon.objects.bulk_create(batch)
+                batch = []
+        Coupon.objects.bulk_create(batch)
+        rebuild_search_index()
+        self.stdout.write(
+            f"{people_count} participantes y {coupon_count} cupones cargados "
+            f"en {time.perf_counter() - started:.1f} s"
+        )
+
+    def _queries(self) -> list[dict]:
+        return [
+            {"participant": "rodríguez"},
+            {"participant": "9000123"},
+            {"participant": "ar"},
+            {"coupon": "0004242"},
+            {"coupon": "bench77@"},
+            {"coupon": "T3-00"},
+        ]
+
+    def _compare(self, params: dict, repeat: int) -> None:
+        base = Coupon.objects.all()
+        legacy_elapsed, legacy_ids = self._measure(lambda: _legacy_filter(base, params), repeat)
+        indexed_elapsed, indexed_ids = self._measure(
+            lambda: filter_coupon_queryset(base, params)[0], repeat
+        )
+        if indexed_ids != legacy_ids:
+            raise CommandError(f"Resultados distintos para {params}")
+        self.stdout.write(
+            f"{params!s:<28} {len(legacy_ids):>8} filas  "
+            f"icontains {legacy_elapsed * 1000:>8.1f} ms  "
+            f"índice {indexed_elapsed * 1000:>8.1f} ms"
+        )
+
+    def _measure(self, build, repeat: int) -> tuple[float, set]:
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            ids = set(build().values_list("pk", flat=True))
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, ids
@@ -0,0 +1,46 @@
+"""Title-case participant names in resumable primary-key batches."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from raffle.models import NormalizationJob
+from raffle.services.normalization import (
+    NORMALIZE_BATCH_SIZE,
+    active_normalization_job,
+    prepare_normalization_job,
+    run_normalization_job,
+)
+
+
+class Command(BaseCommand):
+    help = "Normalize participant names in batches, resuming an interrupted run."  # noqa: A003
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=NORMALIZE_BATCH_SIZE)
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Start from the first participant instead of resuming an interrupted run.",
+        )
+
+    def handle(self, *args, **options):
+        if active_normalization_job() is not None:
+            raise CommandError("Ya hay una normalización de participantes en curso.")
+
+        job = prepare_normalization_job(restart=options["restart"])
+        if job.last_pk:
+            self.stdout.write(f"Reanudando desde el participante #{job.last_pk}.")
+
+        def report(current: NormalizationJob) -> None:
+            self.stdout.write(
+                f"{current.processed}/{current.total} procesados, "
+                f"{current.updated} actualizados (#{current.last_pk})"
+            )
+
+        job = run_normalization_job(job.pk, max(1, options["batch_size"]), on_batch=report)
+        if job.status != NormalizationJob.Status.DONE:
+            raise CommandError(f"Normalización interrumpida: {job.error}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Participantes normalizados: {job.updated} de {job.processed}.")
+        )
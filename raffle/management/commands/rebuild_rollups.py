@@ -0,0 +1,15 @@
+"""Recompute the hourly coupon and voucher rollup buckets."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from raffle.services.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild CouponRollup buckets from the coupon and voucher tables."  # noqa: A003
+
+    def handle(self, *args, **options):
+        total = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rollups reconstruidos: {total} intervalos."))
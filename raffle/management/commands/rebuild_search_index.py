@@ -0,0 +1,15 @@
+"""Recompute the participant search keys and trigram index."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from raffle.services.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the PersonSearchGram index from participants and coupons."  # noqa: A003
+
+    def handle(self, *args, **options):
+        total = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"Índice de búsqueda reconstruido: {total} participantes."))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-16 20:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('raffle', '0007_room_room_ip'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EntryRateState',
+            fields=[
+                ('person', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='entry_state', serialize=False, to='raffle.person')),
+                ('last_scan_at', models.DateTimeField(blank=True, null=True)),
+                ('current_day', models.DateField(blank=True, null=True)),
+                ('coupons_today', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
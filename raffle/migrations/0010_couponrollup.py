@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-16 21:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('raffle', '0009_exportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CouponRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('coupon', 'Cupones'), ('voucher', 'Vouchers')], max_length=10)),
+                ('room_id', models.PositiveSmallIntegerField()),
+                ('terminal_name', models.CharField(default='', max_length=120)),
+                ('source', models.CharField(max_length=20)),
+                ('user_id', models.PositiveIntegerField(default=0)),
+                ('hour', models.DateTimeField()),
+                ('total', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ('kind', 'hour', 'room_id'),
+                'indexes': [models.Index(fields=['kind', 'hour'], name='raffle_rollup_kind_hour')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'room_id', 'terminal_name', 'source', 'user_id', 'hour'), name='raffle_rollup_bucket_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.8 on 2026-10-16 21:12
+
+from django.db import migrations, models
+from django.db.models import Max, Min
+
+
+def populate_terminals(apps, schema_editor):
+    Coupon = apps.get_model("raffle", "Coupon")
+    VoucherScan = apps.get_model("raffle", "VoucherScan")
+    Terminal = apps.get_model("raffle", "Terminal")
+
+    activity = {}
+    for model in (Coupon, VoucherScan):
+        rows = (
+            model.objects.exclude(terminal_name="")
+            .values("terminal_name")
+            .annotate(first=Min("scanned_at"), last=Max("scanned_at"))
+            .order_by()
+        )
+        for row in rows:
+            first, last = activity.get(row["terminal_name"], (row["first"], row["last"]))
+            activity[row["terminal_name"]] = (min(first, row["first"]), max(last, row["last"]))
+    Terminal.objects.bulk_create(
+        Terminal(name=name, first_seen_at=first, last_seen_at=last)
+        for name, (first, last) in activity.items()
+    )
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('raffle', '0010_couponrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Terminal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=120, unique=True)),
+                ('first_seen_at', models.DateTimeField()),
+                ('last_seen_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ('name',),
+            },
+        ),
+        migrations.RunPython(populate_terminals, noop_reverse),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-16 21:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('raffle', '0011_terminal'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='coupon',
+            index=models.Index(fields=['scanned_at'], name='coupon_scanned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coupon',
+            index=models.Index(fields=['room_id', 'scanned_at'], name='coupon_room_scanned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coupon',
+            index=models.Index(fields=['terminal_name', 'scanned_at'], name='coupon_terminal_scanned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coupon',
+            index=models.Index(fields=['person', 'source', 'scanned_at'], name='coupon_person_source_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coupon',
+            index=models.Index(fields=['printed', 'source', 'room_id'], name='coupon_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='couponreprintlog',
+            index=models.Index(fields=['created_at'], name='reprintlog_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='couponreprintlog',
+            index=models.Index(fields=['room_id', 'created_at'], name='reprintlog_room_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voucherscan',
+            index=models.Index(fields=['scanned_at'], name='voucher_scanned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voucherscan',
+            index=models.Index(fields=['room_id', 'scanned_at'], name='voucher_room_scanned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voucherscan',
+            index=models.Index(fields=['person', 'scanned_at'], name='voucher_person_scanned_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+import raffle.models.fields
+
+
+def backfill_scanned_date(apps, schema_editor):
+    # TruncDate converts to the configured TIME_ZONE, like LocalDateField does.
+    for model_name in ("Coupon", "VoucherScan"):
+        model = apps.get_model("raffle", model_name)
+        model.objects.update(scanned_date=TruncDate("scanned_at"))
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("raffle", "0012_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="coupon",
+            name="scanned_date",
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="voucherscan",
+            name="scanned_date",
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_scanned_date, noop_reverse),
+        migrations.AlterField(
+            model_name="coupon",
+            name="scanned_date",
+            field=raffle.models.fields.LocalDateField(db_index=True, source="scanned_at"),
+        ),
+        migrations.AlterField(
+            model_name="voucherscan",
+            name="scanned_date",
+            field=raffle.models.fields.LocalDateField(db_index=True, source="scanned_at"),
+        ),
+        migrations.RemoveIndex(
+            model_name="coupon",
+            name="coupon_person_source_idx",
+        ),
+        migrations.AddIndex(
+            model_name="coupon",
+            index=models.Index(
+                fields=["person", "source", "scanned_date"], name="coupon_person_day_idx"
+            ),
+        ),
+    ]
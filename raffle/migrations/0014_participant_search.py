@@ -0,0 +1,75 @@
+import django.db.models.deletion
+import raffle.models.fields
+from django.db import migrations, models
+
+from raffle.utils.search import fold_search_text, search_key, trigrams
+
+BATCH_SIZE = 1000
+
+
+def backfill_search_index(apps, schema_editor):
+    Person = apps.get_model("raffle", "Person")
+    Coupon = apps.get_model("raffle", "Coupon")
+    PersonSearchGram = apps.get_model("raffle", "PersonSearchGram")
+
+    grams = []
+    for person in Person.objects.order_by("pk").iterator(chunk_size=BATCH_SIZE):
+        person.search_name = search_key([person.first_name, person.last_name, person.id_number])
+        person.search_contact = search_key([person.phone, person.email])
+        Person.objects.filter(pk=person.pk).update(
+            search_name=person.search_name, search_contact=person.search_contact
+        )
+        for kind, text in (("n", person.search_name), ("c", person.search_contact)):
+            grams += [PersonSearchGram(person_id=person.pk, kind=kind, gram=g) for g in trigrams(text)]
+        if len(grams) >= BATCH_SIZE:
+            PersonSearchGram.objects.bulk_create(grams, ignore_conflicts=True)
+            grams = []
+
+    coupons = Coupon.objects.values_list("person_id", "code").order_by()
+    for person_id, code in coupons.iterator(chunk_size=BATCH_SIZE):
+        grams += [
+            PersonSearchGram(person_id=person_id, kind="k", gram=g)
+            for g in trigrams(fold_search_text(code))
+        ]
+        if len(grams) >= BATCH_SIZE:
+            PersonSearchGram.objects.bulk_create(grams, ignore_conflicts=True)
+            grams = []
+    PersonSearchGram.objects.bulk_create(grams, ignore_conflicts=True)
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('raffle', '0013_scanned_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='person',
+            name='search_contact',
+            field=raffle.models.fields.SearchKeyField(max_length=300, sources=('phone', 'email')),
+        ),
+        migrations.AddField(
+            model_name='person',
+            name='search_name',
+            field=raffle.models.fields.SearchKeyField(max_length=255, sources=('first_name', 'last_name', 'id_number')),
+        ),
+        migrations.CreateModel(
+            name='PersonSearchGram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('n', 'Nombre o DNI'), ('c', 'Teléfono o correo'), ('k', 'Código de cupón')], max_length=1)),
+                ('gram', models.CharField(max_length=3)),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_grams', to='raffle.person')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'gram', 'person'], name='raffle_search_gram_lookup')],
+                'constraints': [models.UniqueConstraint(fields=('person', 'kind', 'gram'), name='raffle_search_gram_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_search_index, noop_reverse),
+    ]
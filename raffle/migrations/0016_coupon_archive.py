@@ -0,0 +1,102 @@
+# Generated by Django 5.2.8 on 2026-10-17 10:40
+
+import django.db.models.deletion
+import raffle.models.archive
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('raffle', '0015_normalizationjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CouponArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('draw_date', models.DateField(unique=True)),
+                ('cutoff', models.DateTimeField()),
+                ('coupons', models.PositiveIntegerField(default=0)),
+                ('voucher_scans', models.PositiveIntegerField(default=0)),
+                ('reprint_logs', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ('-draw_date',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedCoupon',
+            fields=[
+                ('id', models.PositiveBigIntegerField(primary_key=True, serialize=False)),
+                ('draw_date', models.DateField()),
+                ('code', models.CharField(max_length=120, unique=True)),
+                ('scanned_at', models.DateTimeField()),
+                ('scanned_date', models.DateField()),
+                ('source', models.CharField(choices=[('entry', 'Cargó Voucher'), ('register', 'Registro'), ('manual', 'Ingreso manual')], max_length=20)),
+                ('created_by_user', models.BooleanField(default=False)),
+                ('reprint_count', models.PositiveSmallIntegerField(default=0)),
+                ('terminal_name', models.CharField(default='', max_length=120)),
+                ('printed', models.BooleanField(default=True)),
+                ('room_id', models.PositiveSmallIntegerField(default=1)),
+                ('reprinted_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_coupons', to=settings.AUTH_USER_MODEL)),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_coupons', to='raffle.person')),
+                ('reprinted_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_coupon_reprints', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('-scanned_at',),
+            },
+            bases=(raffle.models.archive._ArchivedRoomMixin, models.Model),
+        ),
+        migrations.CreateModel(
+            name='ArchivedReprintLog',
+            fields=[
+                ('id', models.PositiveBigIntegerField(primary_key=True, serialize=False)),
+                ('draw_date', models.DateField()),
+                ('room_id', models.PositiveSmallIntegerField(default=1)),
+                ('reprint_number', models.PositiveSmallIntegerField(default=1)),
+                ('created_at', models.DateTimeField()),
+                ('coupon', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reprint_logs', to='raffle.archivedcoupon')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_reprint_logs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('-created_at',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedVoucherScan',
+            fields=[
+                ('id', models.PositiveBigIntegerField(primary_key=True, serialize=False)),
+                ('draw_date', models.DateField()),
+                ('code', models.CharField(max_length=64, unique=True)),
+                ('terminal_name', models.CharField(default='', max_length=120)),
+                ('room_id', models.PositiveSmallIntegerField(default=1)),
+                ('source', models.CharField(choices=[('entry', 'Cargó Voucher'), ('register', 'Registro'), ('manual', 'Ingreso manual')], max_length=20)),
+                ('scanned_at', models.DateTimeField()),
+                ('scanned_date', models.DateField()),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_voucher_scans', to='raffle.person')),
+            ],
+            options={
+                'ordering': ('-scanned_at',),
+            },
+            bases=(raffle.models.archive._ArchivedRoomMixin, models.Model),
+        ),
+        migrations.AddIndex(
+            model_name='archivedcoupon',
+            index=models.Index(fields=['draw_date', 'scanned_at'], name='archcoupon_draw_scanned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedreprintlog',
+            index=models.Index(fields=['draw_date', 'created_at'], name='archreprint_draw_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedvoucherscan',
+            index=models.Index(fields=['draw_date', 'scanned_at'], name='archvoucher_draw_scanned_idx'),
+        ),
+    ]
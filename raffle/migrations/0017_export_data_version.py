@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-17 14:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fail_duplicate_active_jobs(apps, schema_editor):
+    # Keep the newest queued or running job of each fingerprint.
+    ExportJob = apps.get_model("raffle", "ExportJob")
+    seen = set()
+    duplicates = []
+    active = ExportJob.objects.filter(status__in=("pending", "running")).order_by("-created_at")
+    for job_id, fingerprint in active.values_list("id", "fingerprint"):
+        if fingerprint in seen:
+            duplicates.append(job_id)
+        seen.add(fingerprint)
+    ExportJob.objects.filter(pk__in=duplicates).update(
+        status="failed", error="Exportación duplicada."
+    )
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('raffle', '0016_coupon_archive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportDataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(fail_duplicate_active_jobs, noop_reverse),
+        migrations.AddConstraint(
+            model_name='exportjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ('pending', 'running'))), fields=('fingerprint',), name='exportjob_active_fingerprint_unique'),
+        ),
+    ]
@@ -1,6 +1,6 @@
 # Import each model explicitly so Django registers them correctly.
 from .rooms import Room
-from .people import Person
+from .people import EntryRateState, Person
 from .printers import PrinterConfiguration
 from .system import SystemSettings
 from .coupons import (
@@ -11,10 +11,17 @@ from .coupons import (
     CouponReprint,
     CouponReprintLog,
 )
+from .exports import ExportDataVersion, ExportJob
+from .rollups import CouponRollup
+from .terminals import Terminal
+from .search import PersonSearchGram
+from .normalization import NormalizationJob
+from .archive import ArchivedCoupon, ArchivedReprintLog, ArchivedVoucherScan, CouponArchive
 
 __all__ = [
     "Room",
     "Person",
+    "EntryRateState",
     "PrinterConfiguration",
     "SystemSettings",
     "Coupon",
@@ -23,4 +30,14 @@ __all__ = [
     "VoucherScan",
     "CouponReprint",
     "CouponReprintLog",
+    "ExportJob",
+    "ExportDataVersion",
+    "CouponRollup",
+    "Terminal",
+    "PersonSearchGram",
+    "NormalizationJob",
+    "CouponArchive",
+    "ArchivedCoupon",
+    "ArchivedVoucherScan",
+    "ArchivedReprintLog",
 ]
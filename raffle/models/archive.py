@@ -0,0 +1,125 @@
+from django.conf import settings
+from django.db import models
+
+from ..rooms import RoomDirectory
+from .coupons import Coupon
+
+
+class CouponArchive(models.Model):
+    """Draw whose coupons, voucher scans and reprint logs were moved out of the hot tables."""
+
+    draw_date = models.DateField(unique=True)
+    # Rows scanned before this moment belong to the draw or an earlier one.
+    cutoff = models.DateTimeField()
+    coupons = models.PositiveIntegerField(default=0)
+    voucher_scans = models.PositiveIntegerField(default=0)
+    reprint_logs = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ("-draw_date",)
+
+    def __str__(self) -> str:
+        return f"Sorteo {self.draw_date:%d/%m/%Y}: {self.coupons} cupones"
+
+
+class _ArchivedRoomMixin:
+    @property
+    def room(self):
+        return RoomDirectory.get(self.room_id)
+
+    @property
+    def room_name(self) -> str:
+        return self.room.name
+
+
+class ArchivedCoupon(_ArchivedRoomMixin, models.Model):
+    """Coupon of a past draw, kept with its original id for audits."""
+
+    # Same range as the BigAutoField ids copied from the live tables.
+    id = models.PositiveBigIntegerField(primary_key=True)
+    draw_date = models.DateField()
+    person = models.ForeignKey(
+        "raffle.Person", related_name="archived_coupons", on_delete=models.CASCADE
+    )
+    code = models.CharField(max_length=120, unique=True)
+    scanned_at = models.DateTimeField()
+    scanned_date = models.DateField()
+    source = models.CharField(max_length=20, choices=Coupon.SOURCE_CHOICES)
+    created_by_user = models.BooleanField(default=False)
+    reprint_count = models.PositiveSmallIntegerField(default=0)
+    terminal_name = models.CharField(max_length=120, default="")
+    printed = models.BooleanField(default=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        related_name="archived_coupons",
+        on_delete=models.SET_NULL,
+    )
+    room_id = models.PositiveSmallIntegerField(default=1)
+    # The coupon's CouponReprint record: who reprinted it and when.
+    reprinted_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        related_name="archived_coupon_reprints",
+        on_delete=models.SET_NULL,
+    )
+    reprinted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("-scanned_at",)
+        indexes = [
+            models.Index(fields=("draw_date", "scanned_at"), name="archcoupon_draw_scanned_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.code} - {self.person}"
+
+
+class ArchivedVoucherScan(_ArchivedRoomMixin, models.Model):
+    id = models.PositiveBigIntegerField(primary_key=True)
+    draw_date = models.DateField()
+    code = models.CharField(max_length=64, unique=True)
+    person = models.ForeignKey(
+        "raffle.Person", related_name="archived_voucher_scans", on_delete=models.CASCADE
+    )
+    terminal_name = models.CharField(max_length=120, default="")
+    room_id = models.PositiveSmallIntegerField(default=1)
+    source = models.CharField(max_length=20, choices=Coupon.SOURCE_CHOICES)
+    scanned_at = models.DateTimeField()
+    scanned_date = models.DateField()
+
+    class Meta:
+        ordering = ("-scanned_at",)
+        indexes = [
+            models.Index(fields=("draw_date", "scanned_at"), name="archvoucher_draw_scanned_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.code} - {self.person}"
+
+
+class ArchivedReprintLog(models.Model):
+    id = models.PositiveBigIntegerField(primary_key=True)
+    draw_date = models.DateField()
+    coupon = models.ForeignKey(
+        ArchivedCoupon, related_name="reprint_logs", on_delete=models.CASCADE
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name="archived_reprint_logs", on_delete=models.CASCADE
+    )
+    room_id = models.PositiveSmallIntegerField(default=1)
+    reprint_number = models.PositiveSmallIntegerField(default=1)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=("draw_date", "created_at"), name="archreprint_draw_created_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Log {self.reprint_number} for {self.coupon.code} by {self.user}"
@@ -4,6 +4,7 @@ from django.utils import timezone
 
 # Importamos RoomDirectory pero no lo ejecutamos al declarar modelos
 from ..rooms import RoomDirectory
+from .fields import LocalDateField
 
 
 class Coupon(models.Model):
@@ -19,6 +20,8 @@ class Coupon(models.Model):
     person = models.ForeignKey("raffle.Person", related_name="coupons", on_delete=models.CASCADE)
     code = models.CharField(max_length=120, unique=True)
     scanned_at = models.DateTimeField(default=timezone.now)
+    # Local calendar day of scanned_at, for index-friendly daily filters.
+    scanned_date = LocalDateField(db_index=True)
     source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
     created_by_user = models.BooleanField(default=False)
     reprint_count = models.PositiveSmallIntegerField(default=0)
@@ -40,6 +43,21 @@ class Coupon(models.Model):
 
     class Meta:
         ordering = ("-scanned_at",)
+        # Built around the list, dashboard, pending-print and entry-rule filters;
+        # person and created_by already get single-column FK indexes.
+        indexes = [
+            models.Index(fields=("scanned_at",), name="coupon_scanned_idx"),
+            models.Index(fields=("room_id", "scanned_at"), name="coupon_room_scanned_idx"),
+            models.Index(
+                fields=("terminal_name", "scanned_at"), name="coupon_terminal_scanned_idx"
+            ),
+            models.Index(
+                fields=("person", "source", "scanned_date"), name="coupon_person_day_idx"
+            ),
+            models.Index(
+                fields=("printed", "source", "room_id"), name="coupon_pending_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.code} - {self.person}"
@@ -93,9 +111,15 @@ class VoucherScan(models.Model):
 
     source = models.CharField(max_length=20, choices=Coupon.SOURCE_CHOICES)
     scanned_at = models.DateTimeField(default=timezone.now)
+    scanned_date = LocalDateField(db_index=True)
 
     class Meta:
         ordering = ("-scanned_at",)
+        indexes = [
+            models.Index(fields=("scanned_at",), name="voucher_scanned_idx"),
+            models.Index(fields=("room_id", "scanned_at"), name="voucher_room_scanned_idx"),
+            models.Index(fields=("person", "scanned_at"), name="voucher_person_scanned_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.code} - {self.person}"
@@ -145,6 +169,10 @@ class CouponReprintLog(models.Model):
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=("created_at",), name="reprintlog_created_idx"),
+            models.Index(fields=("room_id", "created_at"), name="reprintlog_room_created_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Log {self.reprint_number} for {self.coupon.code} by {self.user}"
@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import F, Q
+
+
+class ExportJob(models.Model):
+    """Report built in the background and kept on disk for download."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "En cola"
+        RUNNING = "running", "Generando"
+        DONE = "done", "Listo"
+        FAILED = "failed", "Error"
+        EXPIRED = "expired", "Vencido"
+
+    class Dataset(models.TextChoices):
+        COUPONS = "coupons", "Cupones"
+        VOUCHERS = "vouchers", "Vouchers"
+        REPRINTS = "reprints", "Reimpresiones"
+
+    class Format(models.TextChoices):
+        XLSX = "xlsx", "Excel"
+        CSV = "csv", "CSV"
+        NDJSON = "ndjson", "NDJSON"
+
+    dataset = models.CharField(max_length=20, choices=Dataset.choices, default=Dataset.COUPONS)
+    export_format = models.CharField(max_length=10, choices=Format.choices, default=Format.XLSX)
+    # Workbook layout for XLSX coupon exports: all, room or day.
+    export_type = models.CharField(max_length=10, default="all")
+    compress = models.BooleanField(default=False)
+    params = models.JSONField(default=dict, blank=True)
+    # Hash of the request and the data version; identical requests share a job.
+    fingerprint = models.CharField(max_length=64, db_index=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    progress = models.PositiveSmallIntegerField(default=0)
+    rows_written = models.PositiveIntegerField(default=0)
+    total_rows = models.PositiveIntegerField(default=0)
+    filename = models.CharField(max_length=200, blank=True, default="")
+    file_path = models.CharField(max_length=500, blank=True, default="")
+    file_size = models.PositiveBigIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        related_name="export_jobs",
+        on_delete=models.SET_NULL,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("-created_at",)
+        constraints = [
+            # Identical requests racing each other must share one build.
+            models.UniqueConstraint(
+                fields=("fingerprint",),
+                condition=Q(status__in=("pending", "running")),
+                name="exportjob_active_fingerprint_unique",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.dataset}.{self.export_format} [{self.status}] {self.progress}%"
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (self.Status.PENDING, self.Status.RUNNING)
+
+
+class ExportDataVersion(models.Model):
+    """Single-row counter of in-place edits to exported rows.
+
+    Inserts and deletes already change the row counts in the export
+    fingerprint; edits such as a printed flag or a renamed participant bump
+    this counter instead, so cached export files are not reused after them.
+    """
+
+    value = models.PositiveBigIntegerField(default=0)
+
+    @classmethod
+    def bump(cls) -> None:
+        if not cls.objects.filter(pk=1).update(value=F("value") + 1):
+            cls.objects.get_or_create(pk=1, defaults={"value": 1})
+
+    @classmethod
+    def current(cls) -> int:
+        return cls.objects.filter(pk=1).values_list("value", flat=True).first() or 0
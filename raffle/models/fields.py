@@ -0,0 +1,62 @@
+from django.db import models
+from django.utils import timezone
+
+from ..utils.search import search_key
+
+
+def local_date(value):
+    """Calendar date of a timestamp in the configured TIME_ZONE."""
+
+    return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+
+
+class LocalDateField(models.DateField):
+    """Local date of another datetime field, stored so day filters can use an index.
+
+    The value is derived in ``pre_save``, which ``bulk_create`` also calls, so
+    every insert path fills it. ``QuerySet.update()`` of the source column does
+    not; update both together in that case.
+    """
+
+    def __init__(self, *args, source: str = "scanned_at", **kwargs):
+        self.source = source
+        kwargs.setdefault("editable", False)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["source"] = self.source
+        kwargs.pop("editable", None)
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.source)
+        day = local_date(value) if value is not None else None
+        setattr(model_instance, self.attname, day)
+        return day
+
+
+class SearchKeyField(models.CharField):
+    """Folded, separator-joined copy of other text fields, kept for search.
+
+    Like ``LocalDateField`` the value is derived in ``pre_save``.
+    """
+
+    def __init__(self, *args, sources: tuple[str, ...] = (), **kwargs):
+        self.sources = tuple(sources)
+        kwargs.setdefault("editable", False)
+        kwargs.setdefault("default", "")
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["sources"] = self.sources
+        kwargs.pop("editable", None)
+        if kwargs.get("default") == "":
+            kwargs.pop("default")
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = search_key(getattr(model_instance, source) for source in self.sources)
+        setattr(model_instance, self.attname, value)
+        return value
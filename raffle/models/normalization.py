@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.db import models
+
+
+class NormalizationJob(models.Model):
+    """Pass over the participant roster that title-cases names in PK batches."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "En cola"
+        RUNNING = "running", "En curso"
+        DONE = "done", "Completado"
+        FAILED = "failed", "Interrumpido"
+
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    # Highest participant id already written; a resumed run continues after it.
+    last_pk = models.PositiveBigIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        related_name="normalization_jobs",
+        on_delete=models.SET_NULL,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Refreshed with every batch, so a run whose process died can be detected.
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("-created_at",)
+
+    def __str__(self) -> str:
+        return f"normalization [{self.status}] {self.processed}/{self.total}"
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (self.Status.PENDING, self.Status.RUNNING)
+
+    @property
+    def progress(self) -> int:
+        if self.status == self.Status.DONE:
+            return 100
+        return min(99, self.processed * 100 // max(self.total, 1))
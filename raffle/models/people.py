@@ -1,5 +1,7 @@
 from django.db import models
 
+from .fields import SearchKeyField
+
 
 class Person(models.Model):
     first_name = models.CharField(max_length=100)
@@ -8,9 +10,34 @@ class Person(models.Model):
     email = models.EmailField(blank=True, default="")
     phone = models.CharField(max_length=20)
     birth_date = models.DateField()
+    # Folded keys for the participant search; see PersonSearchGram.
+    search_name = SearchKeyField(max_length=255, sources=("first_name", "last_name", "id_number"))
+    search_contact = SearchKeyField(max_length=300, sources=("phone", "email"))
 
     class Meta:
         ordering = ("last_name", "first_name")
 
     def __str__(self) -> str:
         return f"{self.first_name} {self.last_name} ({self.id_number})"
+
+
+class EntryRateState(models.Model):
+    """Per-participant counters behind the entry rate limits."""
+
+    person = models.OneToOneField(
+        "raffle.Person",
+        primary_key=True,
+        related_name="entry_state",
+        on_delete=models.CASCADE,
+    )
+    last_scan_at = models.DateTimeField(null=True, blank=True)
+    current_day = models.DateField(null=True, blank=True)
+    coupons_today = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.person_id}: {self.coupons_today} ({self.current_day})"
+
+    def coupons_on(self, day) -> int:
+        """Return the entry coupons counted for the given day."""
+
+        return self.coupons_today if self.current_day == day else 0
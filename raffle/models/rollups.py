@@ -0,0 +1,32 @@
+from django.db import models
+
+
+class CouponRollup(models.Model):
+    """Hourly coupon or voucher count for one room, terminal, source and user."""
+
+    class Kind(models.TextChoices):
+        COUPON = "coupon", "Cupones"
+        VOUCHER = "voucher", "Vouchers"
+
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    room_id = models.PositiveSmallIntegerField()
+    terminal_name = models.CharField(max_length=120, default="")
+    source = models.CharField(max_length=20)
+    # Plain id of the generating user (0 when none) so the key stays unique
+    # without relying on NULL handling in unique indexes.
+    user_id = models.PositiveIntegerField(default=0)
+    hour = models.DateTimeField()
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ("kind", "hour", "room_id")
+        constraints = [
+            models.UniqueConstraint(
+                fields=("kind", "room_id", "terminal_name", "source", "user_id", "hour"),
+                name="raffle_rollup_bucket_unique",
+            )
+        ]
+        indexes = [models.Index(fields=("kind", "hour"), name="raffle_rollup_kind_hour")]
+
+    def __str__(self) -> str:
+        return f"{self.kind} {self.room_id}/{self.terminal_name} {self.hour:%Y-%m-%d %H}h: {self.total}"
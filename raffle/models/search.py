@@ -0,0 +1,29 @@
+from django.db import models
+
+
+class PersonSearchGram(models.Model):
+    """Trigram of a participant's folded name, contact or coupon codes."""
+
+    class Kind(models.TextChoices):
+        NAME = "n", "Nombre o DNI"
+        CONTACT = "c", "Teléfono o correo"
+        CODE = "k", "Código de cupón"
+
+    person = models.ForeignKey(
+        "raffle.Person", related_name="search_grams", on_delete=models.CASCADE
+    )
+    kind = models.CharField(max_length=1, choices=Kind.choices)
+    gram = models.CharField(max_length=3)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("person", "kind", "gram"), name="raffle_search_gram_unique"
+            )
+        ]
+        indexes = [
+            models.Index(fields=("kind", "gram", "person"), name="raffle_search_gram_lookup")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.person_id}:{self.kind}:{self.gram}"
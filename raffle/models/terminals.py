@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class Terminal(models.Model):
+    """Terminal that has issued coupons or burned vouchers, with its activity range."""
+
+    name = models.CharField(max_length=120, unique=True)
+    first_seen_at = models.DateTimeField()
+    last_seen_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ("name",)
+
+    def __str__(self) -> str:
+        return self.name
@@ -1,5 +1,8 @@
 """Room directory utilities backed by the database when available."""
 
+import os
+import threading
+import time
 from dataclasses import dataclass
 from typing import Dict, Iterable, Tuple
 
@@ -7,6 +10,9 @@ from django.apps import apps
 from django.db import DatabaseError, OperationalError, ProgrammingError, connection
 
 
+ROOM_CACHE_TTL = float(os.getenv("ROOM_CACHE_TTL", "300"))
+
+
 @dataclass(frozen=True)
 class Room:
     """Data structure representing a room."""
@@ -30,6 +36,13 @@ class RoomDirectory:
         8: Room(id=8, name="ERAY", room_ip="10.32.58.18"),
     }
 
+    # Process-wide catalog: (version, loaded_at, rooms). Room writes bump the
+    # version so the next lookup reloads; the TTL covers edits made by other
+    # terminals that share the database but not this process.
+    _version = 0
+    _cache: Tuple[int, float, Dict[int, Room]] | None = None
+    _lock = threading.Lock()
+
     @classmethod
     def _room_model(cls):
         """Return the Django model used to persist rooms."""
@@ -37,29 +50,53 @@ class RoomDirectory:
         return apps.get_model("raffle", "Room")
 
     @classmethod
-    def _load_from_db(cls) -> Dict[int, Room]:
-        """Return rooms stored in the database or fall back to defaults."""
+    def _query_rooms(cls) -> Dict[int, Room]:
+        """Read the room table, falling back to defaults when it is empty."""
+
+        model = cls._room_model()
+        rooms = {
+            room_id: Room(id=room_id, name=name, room_ip=room_ip)
+            for room_id, name, room_ip in model.objects.order_by("id").values_list(
+                "id", "name", "room_ip"
+            )
+        }
+        return rooms or cls._DEFAULT_ROOMS
 
-        def _query_rooms() -> Dict[int, Room]:
-            model = cls._room_model()
-            entries = model.objects.order_by("id")
-            if not entries.exists():
-                return cls._DEFAULT_ROOMS
-            return {
-                entry.id: Room(id=entry.id, name=entry.name, room_ip=entry.room_ip)
-                for entry in entries
-            }
-
-        try:
-            return _query_rooms()
-        except DatabaseError:
-            connection.close()  # Retry once after closing a potentially stale connection.
+    @classmethod
+    def _load_from_db(cls) -> Dict[int, Room]:
+        """Return the cached catalog, reloading it when stale or invalidated."""
+
+        cached = cls._cache
+        if (
+            cached is not None
+            and cached[0] == cls._version
+            and time.monotonic() - cached[1] < ROOM_CACHE_TTL
+        ):
+            return cached[2]
+
+        with cls._lock:
+            version = cls._version
             try:
-                return _query_rooms()
+                rooms = cls._query_rooms()
             except DatabaseError:
+                connection.close()  # Retry once after closing a potentially stale connection.
+                try:
+                    rooms = cls._query_rooms()
+                except DatabaseError:
+                    return cls._DEFAULT_ROOMS
+            except (LookupError, ProgrammingError, OperationalError):
                 return cls._DEFAULT_ROOMS
-        except (LookupError, ProgrammingError, OperationalError):
-            return cls._DEFAULT_ROOMS
+            # Only publish the snapshot if no write happened while loading.
+            if version == cls._version:
+                cls._cache = (version, time.monotonic(), rooms)
+            return rooms
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Bump the catalog version so the next lookup reloads from the database."""
+
+        cls._version += 1
+        cls._cache = None
 
     @classmethod
     def all(cls) -> Iterable[Room]:
@@ -8,18 +8,36 @@ from .printing import (
     available_printers,
     get_or_create_printer_configuration,
     print_coupon_backend,
+    print_coupons_backend,
+    printer_session_status,
+)
+from .print_queue import spool_coupons
+from .voucher_validation import (
+    issue_validation_token,
+    validate_voucher_code,
+    verify_validation_token,
 )
-from .voucher_validation import validate_voucher_code
 from .system import get_or_create_system_settings
-from .entry_rules import EntryValidationError, EntryValidationResult, validate_entry_rules
+from .entry_rules import (
+    EntryValidationError,
+    EntryValidationResult,
+    record_entry_scan,
+    register_entry,
+    validate_entry_rules,
+)
 from .reports import (
     build_coupon_report_workbook,
     build_daily_report_workbook,
     build_room_report_workbook,
     render_workbook_response,
 )
-from .summary import get_coupon_room_summary
+from .exports import render_export_response
+from .export_jobs import request_export, run_export_job
+from .filters import filter_coupon_queryset
+from .summary import get_coupon_room_summary, get_coupon_terminal_summary
 from .reprints import register_reprint
+from .rollups import rebuild_rollups
+from .search import rebuild_search_index
 
 __all__ = [
     "available_printers",
@@ -27,17 +45,31 @@ __all__ = [
     "build_daily_report_workbook",
     "build_room_report_workbook",
     "render_workbook_response",
+    "render_export_response",
+    "request_export",
+    "run_export_job",
     "calculate_entry_coupon_quantity",
     "create_coupons",
     "generate_coupon_code",
     "create_manual_coupon",
     "EntryValidationError",
     "EntryValidationResult",
+    "filter_coupon_queryset",
     "get_coupon_room_summary",
+    "get_coupon_terminal_summary",
     "get_or_create_system_settings",
     "get_or_create_printer_configuration",
     "print_coupon_backend",
+    "print_coupons_backend",
+    "printer_session_status",
+    "record_entry_scan",
+    "register_entry",
     "validate_entry_rules",
     "register_reprint",
+    "rebuild_rollups",
+    "rebuild_search_index",
+    "spool_coupons",
     "validate_voucher_code",
+    "issue_validation_token",
+    "verify_validation_token",
 ]
@@ -0,0 +1,258 @@
+"""Per-draw archive of coupons, voucher scans and reprint logs.
+
+After a draw its coupons are only needed for audits, yet they keep growing
+the tables every dashboard, filter and entry-rule query reads. Archiving
+moves every row scanned before a draw's cutoff into the ``Archived*`` tables
+in chunks of ``ARCHIVE_CHUNK_SIZE``, each chunk copied and deleted in one
+transaction. The rows keep their ids and are tagged with the draw they
+belonged to; a coupon's reprint record moves onto its archived row. Reports
+and exports can read one draw, or every archived draw, by passing
+``archive`` with the coupon list filters.
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time
+from typing import Mapping
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+from ..models import (
+    ArchivedCoupon,
+    ArchivedReprintLog,
+    ArchivedVoucherScan,
+    Coupon,
+    CouponArchive,
+    CouponReprint,
+    CouponReprintLog,
+    ExportDataVersion,
+    VoucherScan,
+)
+from ..utils.terms import get_draw_dates
+from .dashboard import invalidate_dashboard_snapshots
+from .pagination import invalidate_list_totals
+
+# Rows moved per transaction; kept below SQL Server's 2100 parameter limit.
+ARCHIVE_CHUNK_SIZE = int(os.getenv("ARCHIVE_CHUNK_SIZE", "1000"))
+# The terms schedule every draw from 21:00 local time.
+DRAW_HOUR = int(os.getenv("DRAW_HOUR", "21"))
+ALL_ARCHIVES = "all"
+
+COUPON_FIELDS = (
+    "id",
+    "person_id",
+    "code",
+    "scanned_at",
+    "scanned_date",
+    "source",
+    "created_by_user",
+    "reprint_count",
+    "terminal_name",
+    "printed",
+    "created_by_id",
+    "room_id",
+)
+VOUCHER_FIELDS = (
+    "id",
+    "code",
+    "person_id",
+    "terminal_name",
+    "room_id",
+    "source",
+    "scanned_at",
+    "scanned_date",
+)
+REPRINT_LOG_FIELDS = ("id", "coupon_id", "user_id", "room_id", "reprint_number", "created_at")
+
+
+@dataclass(frozen=True)
+class ArchiveReport:
+    draw_date: date
+    coupons: int
+    voucher_scans: int
+    reprint_logs: int
+    seconds: float
+
+
+def draw_cutoff(draw_date: date) -> datetime:
+    value = datetime.combine(draw_date, dt_time(DRAW_HOUR))
+    if settings.USE_TZ:
+        value = timezone.make_aware(value, timezone.get_default_timezone())
+    return value
+
+
+def archive_through(
+    draw_date: date,
+    chunk_size: int = ARCHIVE_CHUNK_SIZE,
+    draw_dates: list[date] | None = None,
+) -> ArchiveReport:
+    """Archive everything scanned before the draw's cutoff, tagged with its own draw.
+
+    Rows are assigned to the first scheduled draw whose cutoff is after their
+    scan, so archiving several draws at once still separates them.
+    """
+
+    chunk_size = max(1, chunk_size)
+    schedule = sorted({day for day in (draw_dates or get_draw_dates()) if day < draw_date})
+    schedule.append(draw_date)
+    cutoffs = [draw_cutoff(day) for day in schedule]
+    for day, cutoff in zip(schedule, cutoffs):
+        CouponArchive.objects.get_or_create(draw_date=day, defaults={"cutoff": cutoff})
+
+    def draw_for(scanned_at) -> date:
+        return schedule[bisect.bisect_right(cutoffs, scanned_at)]
+
+    started = time.perf_counter()
+    totals = {"coupons": 0, "voucher_scans": 0, "reprint_logs": 0}
+    coupons = Coupon.objects.filter(scanned_at__lt=cutoffs[-1]).order_by("scanned_at", "pk")
+    while rows := list(coupons.values_list(*COUPON_FIELDS)[:chunk_size]):
+        with transaction.atomic():
+            moved, logs = _archive_coupons(rows, draw_for)
+        totals["coupons"] += sum(moved.values())
+        totals["reprint_logs"] += sum(logs.values())
+
+    scans = VoucherScan.objects.filter(scanned_at__lt=cutoffs[-1]).order_by("scanned_at", "pk")
+    while rows := list(scans.values_list(*VOUCHER_FIELDS)[:chunk_size]):
+        with transaction.atomic():
+            moved = _archive_voucher_scans(rows, draw_for)
+        totals["voucher_scans"] += sum(moved.values())
+
+    # Rollup buckets keep counting archived rows; only the detail moved.
+    ExportDataVersion.bump()
+    invalidate_dashboard_snapshots()
+    invalidate_list_totals()
+    return ArchiveReport(draw_date, seconds=time.perf_counter() - started, **totals)
+
+
+def _archive_coupons(rows: list[tuple], draw_for) -> tuple[dict, dict]:
+    ids = [row[0] for row in rows]
+    reprints = {
+        coupon_id: (user_id, created_at)
+        for coupon_id, user_id, created_at in CouponReprint.objects.filter(
+            coupon_id__in=ids
+        ).values_list("coupon_id", "user_id", "created_at")
+    }
+    archived = []
+    draws = {}
+    for row in rows:
+        values = dict(zip(COUPON_FIELDS, row))
+        draws[values["id"]] = draw_for(values["scanned_at"])
+        reprinted_by_id, reprinted_at = reprints.get(values["id"], (None, None))
+        archived.append(
+            ArchivedCoupon(
+                draw_date=draws[values["id"]],
+                reprinted_by_id=reprinted_by_id,
+                reprinted_at=reprinted_at,
+                **values,
+            )
+        )
+    ArchivedCoupon.objects.bulk_create(archived)
+
+    logs = CouponReprintLog.objects.filter(coupon_id__in=list(draws)).values_list(*REPRINT_LOG_FIELDS)
+    archived_logs = []
+    for row in logs:
+        values = dict(zip(REPRINT_LOG_FIELDS, row))
+        archived_logs.append(ArchivedReprintLog(draw_date=draws[values["coupon_id"]], **values))
+    ArchivedReprintLog.objects.bulk_create(archived_logs)
+
+    _delete_in(CouponReprintLog, "coupon_id", ids)
+    _delete_in(CouponReprint, "coupon_id", ids)
+    _delete_in(Coupon, "id", ids)
+
+    moved = _count_by_draw(coupon.draw_date for coupon in archived)
+    moved_logs = _count_by_draw(log.draw_date for log in archived_logs)
+    _add_to_archives(moved, "coupons")
+    _add_to_archives(moved_logs, "reprint_logs")
+    return moved, moved_logs
+
+
+def _archive_voucher_scans(rows: list[tuple], draw_for) -> dict:
+    archived = []
+    for row in rows:
+        values = dict(zip(VOUCHER_FIELDS, row))
+        archived.append(ArchivedVoucherScan(draw_date=draw_for(values["scanned_at"]), **values))
+    ArchivedVoucherScan.objects.bulk_create(archived)
+    _delete_in(VoucherScan, "id", [scan.id for scan in archived])
+
+    moved = _count_by_draw(scan.draw_date for scan in archived)
+    _add_to_archives(moved, "voucher_scans")
+    return moved
+
+
+def _count_by_draw(draw_dates) -> dict:
+    counts: dict[date, int] = {}
+    for day in draw_dates:
+        counts[day] = counts.get(day, 0) + 1
+    return counts
+
+
+def _add_to_archives(counts: dict, field: str) -> None:
+    for day, count in counts.items():
+        CouponArchive.objects.filter(draw_date=day).update(**{field: F(field) + count})
+
+
+def _delete_in(model, column: str, ids: list) -> int:
+    # A plain DELETE: the moved rows need no collector or per-row signals.
+    if not ids:
+        return 0
+    table = connection.ops.quote_name(model._meta.db_table)
+    placeholders = ", ".join(["%s"] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {table} WHERE {connection.ops.quote_name(column)} IN ({placeholders})",
+            ids,
+        )
+        return max(cursor.rowcount, 0)
+
+
+def parse_archive_param(value: str | None) -> date | str | None:
+    """Return the archived draw date, ``ALL_ARCHIVES`` or None for the live tables."""
+
+    value = (value or "").strip()
+    if value == ALL_ARCHIVES:
+        return ALL_ARCHIVES
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def _scoped(live: QuerySet, archived: QuerySet, params: Mapping) -> QuerySet:
+    scope = parse_archive_param(params.get("archive"))
+    if scope is None:
+        return live
+    return archived if scope == ALL_ARCHIVES else archived.filter(draw_date=scope)
+
+
+def coupon_queryset(params: Mapping) -> QuerySet:
+    """Live coupons, or the archived ones selected by the ``archive`` parameter."""
+
+    return _scoped(Coupon.objects.all(), ArchivedCoupon.objects.all(), params)
+
+
+def voucher_scan_queryset(params: Mapping) -> QuerySet:
+    return _scoped(VoucherScan.objects.all(), ArchivedVoucherScan.objects.all(), params)
+
+
+def reprint_log_queryset(params: Mapping) -> QuerySet:
+    return _scoped(CouponReprintLog.objects.all(), ArchivedReprintLog.objects.all(), params)
+
+
+def voucher_already_used(code: str) -> bool:
+    """Voucher codes stay single-use after their scan is archived."""
+
+    return (
+        VoucherScan.objects.filter(code=code).exists()
+        or ArchivedVoucherScan.objects.filter(code=code).exists()
+    )
+
+
+def archived_draws() -> list[CouponArchive]:
+    return list(CouponArchive.objects.all())
@@ -11,12 +11,16 @@ from django.utils import timezone
 
 from ..models import (
     Coupon,
-    CouponSequence,
     ManualCouponSequence,
     Person,
     SystemSettings,
 )
 from ..rooms import RoomDirectory
+from .dashboard import invalidate_dashboard_snapshots
+from .pagination import invalidate_list_totals
+from .rollups import record_coupons
+from .search import index_coupon_codes
+from .sequences import allocate_coupon_numbers
 from .system import get_or_create_system_settings
 from ..utils.terminal import get_terminal_config, get_terminal_room
 
@@ -27,19 +31,21 @@ def _sanitize_identifier(value: str) -> str:
     return re.sub(r"[^A-Za-z0-9]+", "", value or "").strip()
 
 
-def generate_coupon_code(room_id: int, terminal_name: str) -> str:
-    """Generate the next sequential coupon code for the room and terminal."""
+def _coupon_code_prefix(room_id: int, terminal_name: str) -> str:
+    """Return the sanitized room and terminal prefix used by coupon codes."""
 
     room_name = RoomDirectory.get(room_id).name
     cleaned_room = _sanitize_identifier(room_name) or f"ROOM{room_id}"
     cleaned_terminal = _sanitize_identifier(terminal_name) or "TERMINAL"
-    with transaction.atomic():
-        sequence, _ = CouponSequence.objects.select_for_update().get_or_create(
-            room_id=room_id, terminal_name=terminal_name, defaults={"last_number": 0}
-        )
-        sequence.last_number += 1
-        sequence.save(update_fields=["last_number"])
-        return f"{cleaned_room}{cleaned_terminal}-{sequence.last_number:06d}"
+    return f"{cleaned_room}{cleaned_terminal}"
+
+
+def generate_coupon_code(room_id: int, terminal_name: str) -> str:
+    """Generate the next sequential coupon code for the room and terminal."""
+
+    prefix = _coupon_code_prefix(room_id, terminal_name)
+    number = allocate_coupon_numbers(room_id, terminal_name)[0]
+    return f"{prefix}-{number:06d}"
 
 
 def generate_manual_coupon_code(room_id: int) -> str:
@@ -66,8 +72,14 @@ def create_coupons(
     created_by_user: bool = False,
     created_by=None,
     printed: bool = True,
+    batched: bool = True,
 ) -> List[Coupon]:
-    """Create the desired amount of coupons for a person."""
+    """Create the desired amount of coupons for a person.
+
+    In batched mode the sequence numbers are reserved in one step and every
+    coupon is written with a single ``bulk_create``, so the query count does
+    not depend on the quantity (or the active entry multiplier).
+    """
 
     settings, _ = (
         get_or_create_system_settings() if system_settings is None else (system_settings, False)
@@ -78,11 +90,11 @@ def create_coupons(
     multiplier = _get_entry_multiplier(settings) if source == Coupon.ENTRY else 1
     effective_quantity = max(1, quantity) * multiplier
     entry_flag = created_by_user if source == Coupon.ENTRY else False
-    coupons: List[Coupon] = []
-    for _ in range(effective_quantity):
-        coupon = Coupon.objects.create(
+
+    def build_coupon(code: str) -> Coupon:
+        return Coupon(
             person=person,
-            code=generate_coupon_code(active_room_id, terminal_label),
+            code=code,
             scanned_at=timezone.now(),
             source=source,
             created_by_user=entry_flag,
@@ -91,7 +103,34 @@ def create_coupons(
             created_by=created_by,
             printed=printed,
         )
-        coupons.append(coupon)
+
+    if not batched:
+        coupons: List[Coupon] = []
+        for _ in range(effective_quantity):
+            coupon = build_coupon(generate_coupon_code(active_room_id, terminal_label))
+            coupon.save(force_insert=True)
+            coupons.append(coupon)
+        return coupons
+
+    prefix = _coupon_code_prefix(active_room_id, terminal_label)
+    numbers = allocate_coupon_numbers(active_room_id, terminal_label, count=effective_quantity)
+    coupons = Coupon.objects.bulk_create(
+        [build_coupon(f"{prefix}-{number:06d}") for number in numbers]
+    )
+    if any(coupon.pk is None for coupon in coupons):
+        # Backends without RETURNING support leave primary keys unset.
+        coupons = list(
+            Coupon.objects.select_related("person")
+            .filter(code__in=[coupon.code for coupon in coupons])
+            .order_by("id")
+        )
+    # bulk_create skips post_save, so the rollups, code index and cached
+    # aggregates are updated here.
+    record_coupons(coupons)
+    index_coupon_codes(coupons)
+    for invalidate in (invalidate_dashboard_snapshots, invalidate_list_totals):
+        invalidate()
+        transaction.on_commit(invalidate)
     return coupons
 
 
@@ -0,0 +1,194 @@
+"""Cached admin dashboard snapshots, one per filter combination."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.utils import timezone
+
+from ..models import Coupon, CouponReprintLog, CouponRollup, VoucherScan
+from .rollups import filter_rollups, hour_bucket, rollup_room_summary, rollup_total, rollup_user_totals
+
+# Snapshots older than this (seconds) are rebuilt even without a local write,
+# which covers coupons issued by other processes sharing the database.
+DASHBOARD_SNAPSHOT_TTL = float(os.getenv("DASHBOARD_SNAPSHOT_TTL", "30"))
+# Filter combinations kept per process; the least recently viewed go first.
+DASHBOARD_SNAPSHOT_LIMIT = 64
+
+
+@dataclass(frozen=True)
+class DashboardFilters:
+    room_id: int | None = None
+    terminal_name: str = ""
+    source: str | None = None
+    start_date: date | None = None
+    end_date: date | None = None
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    data: dict
+    built_at: datetime
+    version: int
+    loaded_at: float
+
+    @property
+    def age_seconds(self) -> int:
+        return int(time.monotonic() - self.loaded_at)
+
+
+# Coupon, voucher and reprint writes bump the version so the next view rebuilds.
+_version = 0
+_snapshots: OrderedDict[DashboardFilters, DashboardSnapshot] = OrderedDict()
+_lock = threading.Lock()
+
+
+def invalidate_dashboard_snapshots() -> None:
+    """Mark every cached snapshot as stale.
+
+    Called from signal handlers inside open transactions, so it must not take
+    the lock a concurrent rebuild may be holding.
+    """
+
+    global _version
+    _version += 1
+
+
+def get_dashboard_snapshot(filters: DashboardFilters) -> DashboardSnapshot:
+    """Return the cached snapshot for the filters, rebuilding it when stale."""
+
+    cached = _snapshots.get(filters)
+    if (
+        cached is not None
+        and cached.version == _version
+        and time.monotonic() - cached.loaded_at < DASHBOARD_SNAPSHOT_TTL
+    ):
+        with _lock:
+            if filters in _snapshots:
+                _snapshots.move_to_end(filters)
+        return cached
+
+    version = _version
+    snapshot = DashboardSnapshot(
+        data=build_dashboard_data(filters),
+        built_at=timezone.now(),
+        version=version,
+        loaded_at=time.monotonic(),
+    )
+    # Only publish the snapshot if no write happened while it was built.
+    if version == _version:
+        with _lock:
+            _snapshots[filters] = snapshot
+            _snapshots.move_to_end(filters)
+            while len(_snapshots) > DASHBOARD_SNAPSHOT_LIMIT:
+                _snapshots.popitem(last=False)
+    return snapshot
+
+
+def _local_datetime(day: date, moment) -> datetime:
+    value = datetime.combine(day, moment)
+    if settings.USE_TZ:
+        value = timezone.make_aware(value, timezone.get_current_timezone())
+    return value
+
+
+def build_dashboard_data(filters: DashboardFilters) -> dict:
+    """Run the dashboard queries for one filter combination."""
+
+    coupon_qs = Coupon.objects.select_related("person")
+    voucher_qs = VoucherScan.objects.select_related("person")
+    reprint_logs = CouponReprintLog.objects.values(
+        "user_id", "user__username", "user__first_name", "user__last_name"
+    )
+
+    if filters.room_id:
+        coupon_qs = coupon_qs.filter(room_id=filters.room_id)
+        voucher_qs = voucher_qs.filter(room_id=filters.room_id)
+        reprint_logs = reprint_logs.filter(room_id=filters.room_id)
+
+    if filters.terminal_name:
+        coupon_qs = coupon_qs.filter(terminal_name=filters.terminal_name)
+        voucher_qs = voucher_qs.filter(terminal_name=filters.terminal_name)
+        reprint_logs = reprint_logs.filter(coupon__terminal_name=filters.terminal_name)
+
+    if filters.source:
+        coupon_qs = coupon_qs.filter(source=filters.source)
+        voucher_qs = voucher_qs.filter(source=filters.source)
+
+    # Day filters use the stored local date; the rollups take hour bounds.
+    start_dt = end_dt = None
+    if filters.start_date:
+        coupon_qs = coupon_qs.filter(scanned_date__gte=filters.start_date)
+        voucher_qs = voucher_qs.filter(scanned_date__gte=filters.start_date)
+        start_dt = _local_datetime(filters.start_date, datetime.min.time())
+
+    if filters.end_date:
+        coupon_qs = coupon_qs.filter(scanned_date__lte=filters.end_date)
+        voucher_qs = voucher_qs.filter(scanned_date__lte=filters.end_date)
+        end_dt = _local_datetime(filters.end_date, datetime.max.time())
+
+    # Totals come from the hourly rollup buckets; the detail tables are only
+    # read for the few recent rows shown on the page.
+    rollup_filters = {
+        "room_id": filters.room_id,
+        "terminal_name": filters.terminal_name,
+        "source": filters.source,
+        "start": start_dt,
+        "end": end_dt,
+    }
+    coupon_rollups = filter_rollups(CouponRollup.Kind.COUPON, **rollup_filters)
+    room_summary = rollup_room_summary(coupon_rollups)
+
+    reprint_totals = list(
+        reprint_logs.annotate(total=Count("id")).order_by("-total", "user__username")
+    )
+
+    chart_coupons = list(coupon_qs.order_by("-scanned_at")[:30])
+    burned_vouchers = list(voucher_qs.order_by("-scanned_at")[:10])
+    # Aggregate coupons generated by each cashier in the last 24 hours.
+    last_24_hours = timezone.now() - timedelta(hours=24)
+    cashier_totals = rollup_user_totals(coupon_rollups.filter(hour__gte=hour_bucket(last_24_hours)))
+    cashiers = get_user_model().objects.in_bulk([user_id for user_id, _ in cashier_totals])
+    cashier_last_24h = [
+        {"user": cashiers.get(user_id), "total": total} for user_id, total in cashier_totals
+    ]
+
+    dashboard_dataset = {
+        "roomLabels": [i["room"].name for i in room_summary],
+        "roomValues": [i["total"] for i in room_summary],
+        "sourceLabels": [c.get_source_display() for c in chart_coupons],
+        "recentDates": [c.scanned_date.isoformat() for c in chart_coupons],
+        "terminalLabels": [c.terminal_name or "Sin terminal" for c in chart_coupons],
+        "burnedRecentDates": [v.scanned_date.isoformat() for v in burned_vouchers],
+        "cashierLabels": [
+            (
+                (row["user"].get_full_name() or row["user"].username)
+                if row["user"]
+                else "Sin usuario"
+            )
+            for row in cashier_last_24h
+        ],
+        "cashierValues": [row["total"] for row in cashier_last_24h],
+        # The room summary already counted every filtered coupon.
+        "totalCoupons": sum(item["total"] for item in room_summary),
+        "totalBurned": rollup_total(
+            filter_rollups(CouponRollup.Kind.VOUCHER, **rollup_filters)
+        ),
+    }
+
+    return {
+        "room_summary": room_summary,
+        # The newest chart rows double as the recent coupon table.
+        "recent_coupons": chart_coupons[:5],
+        "burned_vouchers": burned_vouchers,
+        "reprint_totals": reprint_totals,
+        "dashboard_dataset": dashboard_dataset,
+    }
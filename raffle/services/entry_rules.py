@@ -5,13 +5,23 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import timedelta
 
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Max, Value, When
 from django.utils import timezone
 
-from ..models import Coupon, VoucherScan
-from .coupons import calculate_entry_coupon_quantity
+from ..models import ArchivedCoupon, ArchivedVoucherScan, Coupon, EntryRateState, VoucherScan
+from ..models.fields import local_date
+from .archive import voucher_already_used
+from .coupons import calculate_entry_coupon_quantity, create_coupons
+from .participants import refresh_participant
 
 
 DAILY_ENTRY_LIMIT = 10
+SCAN_INTERVAL = timedelta(hours=2)
+# Archiving right after a draw moves the day's scans and coupons, so the
+# history is read from both the live and the archived tables.
+SCAN_MODELS = (VoucherScan, ArchivedVoucherScan)
+COUPON_MODELS = (Coupon, ArchivedCoupon)
 
 
 @dataclass
@@ -26,27 +36,127 @@ class EntryValidationError(Exception):
     """Raised when an entry attempt violates business rules."""
 
 
+def _local_today():
+    return local_date(timezone.now())
+
+
+def compute_entry_rate_state(person, day=None) -> EntryRateState:
+    """Build an unsaved state row from the participant's scan and coupon history."""
+
+    day = day or _local_today()
+    last_scans = [
+        model.objects.filter(person=person)
+        .order_by("-scanned_at")
+        .values_list("scanned_at", flat=True)
+        .first()
+        for model in SCAN_MODELS
+    ]
+    last_scan_at = max(filter(None, last_scans), default=None)
+    coupons_today = sum(
+        model.objects.filter(person=person, source=Coupon.ENTRY, scanned_date=day).count()
+        for model in COUPON_MODELS
+    )
+    return EntryRateState(
+        person=person,
+        last_scan_at=last_scan_at,
+        current_day=day,
+        coupons_today=coupons_today,
+    )
+
+
+def rebuild_entry_rate_states(person_ids, day=None) -> int:
+    """Recompute the state rows of the given participants with grouped queries."""
+
+    person_ids = list(person_ids)
+    day = day or _local_today()
+    last_scans = {}
+    for model in SCAN_MODELS:
+        rows = (
+            model.objects.filter(person_id__in=person_ids)
+            .values("person_id")
+            .annotate(last=Max("scanned_at"))
+            .values_list("person_id", "last")
+        )
+        for person_id, last in rows:
+            last_scans[person_id] = max(last, last_scans.get(person_id, last))
+    coupons_today = {}
+    for model in COUPON_MODELS:
+        rows = (
+            model.objects.filter(
+                person_id__in=person_ids,
+                source=Coupon.ENTRY,
+                scanned_date=day,
+            )
+            .values("person_id")
+            .annotate(total=Count("id"))
+            .values_list("person_id", "total")
+        )
+        for person_id, total in rows:
+            coupons_today[person_id] = coupons_today.get(person_id, 0) + total
+    states = [
+        EntryRateState(
+            person_id=person_id,
+            last_scan_at=last_scans.get(person_id),
+            current_day=day,
+            coupons_today=coupons_today.get(person_id, 0),
+        )
+        for person_id in person_ids
+    ]
+    with transaction.atomic():
+        EntryRateState.objects.filter(person_id__in=person_ids).delete()
+        EntryRateState.objects.bulk_create(states)
+    return len(states)
+
+
+def get_entry_rate_state(person, lock_rows: bool = False) -> EntryRateState:
+    """Return the participant's state row, creating it from history when missing."""
+
+    queryset = EntryRateState.objects.all()
+    if lock_rows:
+        queryset = queryset.select_for_update()
+    state = queryset.filter(pk=person.pk).first()
+    if state is not None:
+        return state
+
+    state = compute_entry_rate_state(person)
+    try:
+        with transaction.atomic():
+            state.save(force_insert=True)
+    except IntegrityError:
+        # Another request created the row first; read (and lock) theirs.
+        return queryset.get(pk=person.pk)
+    return state
+
+
+def record_entry_scan(person, scanned_at, coupon_count: int) -> None:
+    """Update the participant's state in the same transaction as the voucher scan."""
+
+    day = local_date(scanned_at)
+    updated = EntryRateState.objects.filter(pk=person.pk).update(
+        last_scan_at=scanned_at,
+        coupons_today=Case(
+            When(current_day=day, then=F("coupons_today") + coupon_count),
+            default=Value(coupon_count),
+        ),
+        current_day=day,
+    )
+    if not updated:
+        # No prior validation created the row: rebuild it from history, which
+        # already includes the scan and coupons of this transaction.
+        get_entry_rate_state(person)
+
+
 def validate_entry_rules(person, system_settings, lock_rows: bool = False) -> EntryValidationResult:
     """Validate whether a person can scan a voucher in the entry flow."""
 
-    scan_qs = VoucherScan.objects.all()
-    coupon_qs = Coupon.objects.filter(person=person, source=Coupon.ENTRY)
-    if lock_rows:
-        scan_qs = scan_qs.select_for_update()
-        coupon_qs = coupon_qs.select_for_update()
-
-    last_scan = scan_qs.filter(person=person).order_by("-scanned_at").first()
-    if last_scan:
-        cutoff = timezone.now() - timedelta(hours=2)
-        if last_scan.scanned_at >= cutoff:
-            return EntryValidationResult(
-                False, "Solo puedes escanear un ticket cada dos horas."
-            )
+    state = get_entry_rate_state(person, lock_rows=lock_rows)
+
+    if state.last_scan_at and state.last_scan_at >= timezone.now() - SCAN_INTERVAL:
+        return EntryValidationResult(
+            False, "Solo puedes escanear un ticket cada dos horas."
+        )
 
-    now_value = timezone.now()
-    today = timezone.localdate(now_value) if timezone.is_aware(now_value) else now_value.date()
-    existing_coupons = coupon_qs.filter(scanned_at__date=today).count()
-    projected_coupons = existing_coupons + calculate_entry_coupon_quantity(
+    projected_coupons = state.coupons_on(_local_today()) + calculate_entry_coupon_quantity(
         system_settings, requested_quantity=1
     )
     if projected_coupons > DAILY_ENTRY_LIMIT:
@@ -55,3 +165,54 @@ def validate_entry_rules(person, system_settings, lock_rows: bool = False) -> En
         )
 
     return EntryValidationResult(True, "")
+
+
+def register_entry(
+    person,
+    voucher_code: str,
+    room_id: int,
+    terminal_name: str,
+    system_settings,
+    created_by_user: bool = False,
+) -> list[Coupon]:
+    """Record the voucher scan and its entry coupons in one transaction.
+
+    ``person`` may come from the participant cache. When the insert fails
+    because that row was deleted or merged on another terminal, the cached
+    entry is dropped and the entry retried once with a fresh lookup; only a
+    clash on the voucher code is reported as a used voucher.
+    """
+
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                rule_check = validate_entry_rules(person, system_settings, lock_rows=True)
+                if not rule_check.is_valid:
+                    raise EntryValidationError(rule_check.message)
+
+                scan = VoucherScan.objects.create(
+                    code=voucher_code,
+                    person=person,
+                    room_id=room_id,
+                    terminal_name=terminal_name,
+                    source=Coupon.ENTRY,
+                )
+                coupons = create_coupons(
+                    person=person,
+                    quantity=1,
+                    source=Coupon.ENTRY,
+                    room_id=room_id,
+                    terminal_name=terminal_name,
+                    system_settings=system_settings,
+                    created_by_user=created_by_user,
+                )
+                record_entry_scan(person, scan.scanned_at, len(coupons))
+                return coupons
+        except IntegrityError:
+            if voucher_already_used(voucher_code):
+                raise EntryValidationError("El voucher ya fue utilizado.") from None
+            if attempt:
+                raise
+            person = refresh_participant(person)
+            if person is None:
+                raise EntryValidationError("No existe un participante con ese DNI.") from None
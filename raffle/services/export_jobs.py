@@ -0,0 +1,303 @@
+"""Background report builds with deduplication and an on-disk result cache."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import Mapping
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from ..models import ExportDataVersion, ExportJob
+from .archive import coupon_queryset, reprint_log_queryset, voucher_scan_queryset
+from .exports import (
+    COUPON_TABLE,
+    REPRINT_LOG_TABLE,
+    VOUCHER_SCAN_TABLE,
+    iter_csv,
+    iter_gzip,
+    iter_ndjson,
+)
+from .filters import COUPON_FILTER_KEYS, filter_coupon_queryset
+from .reports import (
+    build_coupon_report_workbook,
+    build_daily_report_workbook,
+    build_room_report_workbook,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+EXPORT_JOB_DIR = Path(os.getenv("EXPORT_JOB_DIR", str(Path(settings.MEDIA_ROOT) / "exports")))
+EXPORT_JOB_WORKERS = int(os.getenv("EXPORT_JOB_WORKERS", "2"))
+# Finished files are kept this long (seconds) and within this total size.
+EXPORT_JOB_MAX_AGE = int(os.getenv("EXPORT_JOB_MAX_AGE", str(6 * 3600)))
+EXPORT_JOB_MAX_BYTES = int(os.getenv("EXPORT_JOB_MAX_BYTES", str(2 * 1024**3)))
+# Queued/running jobs older than this are assumed lost with a restarted process.
+EXPORT_JOB_STALE_AFTER = int(os.getenv("EXPORT_JOB_STALE_AFTER", "3600"))
+# Rows written between progress updates. Progress of running jobs is kept in
+# memory (job id -> rows) rather than written mid-cursor, which some backends
+# reject while a chunked read is still open on the same connection.
+PROGRESS_EVERY = 5000
+_LIVE_PROGRESS: dict[int, int] = {}
+
+# dataset -> (base queryset factory taking the filters, filter prefix, date field, text table)
+DATASETS = {
+    ExportJob.Dataset.COUPONS: (
+        lambda params: coupon_queryset(params).select_related("person").order_by("-scanned_at"),
+        "",
+        None,
+        COUPON_TABLE,
+    ),
+    ExportJob.Dataset.VOUCHERS: (
+        lambda params: voucher_scan_queryset(params).order_by("-scanned_at"),
+        "",
+        None,
+        VOUCHER_SCAN_TABLE,
+    ),
+    ExportJob.Dataset.REPRINTS: (
+        lambda params: reprint_log_queryset(params).order_by("-created_at"),
+        "coupon__",
+        "created_at",
+        REPRINT_LOG_TABLE,
+    ),
+}
+WORKBOOK_BUILDERS = {
+    "all": build_coupon_report_workbook,
+    "room": build_room_report_workbook,
+    "day": build_daily_report_workbook,
+}
+ACTIVE_STATUSES = (ExportJob.Status.PENDING, ExportJob.Status.RUNNING)
+
+EXPORT_EXECUTOR = ThreadPoolExecutor(
+    max_workers=EXPORT_JOB_WORKERS, thread_name_prefix="export-job"
+)
+
+
+def data_version(dataset: str, params: Mapping | None = None) -> str:
+    """Return a cheap version stamp that changes when exported rows change.
+
+    Row count and last id cover inserts and deletes; ``ExportDataVersion``
+    counts the in-place edits (printed flags, reprints, renamed participants).
+    """
+
+    model = DATASETS[dataset][0](params or {}).model
+    stats = model.objects.aggregate(total=Count("id"), last_id=Max("id"))
+    return f"{stats['total']}:{stats['last_id'] or 0}:{ExportDataVersion.current()}"
+
+
+def export_fingerprint(dataset, export_format, export_type, compress, params, version) -> str:
+    payload = json.dumps(
+        [dataset, export_format, export_type, bool(compress), sorted(params.items()), version]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def clean_export_params(params: Mapping) -> dict:
+    """Keep only the non-empty coupon list filters."""
+
+    cleaned = {}
+    for key in COUPON_FILTER_KEYS:
+        value = (params.get(key) or "").strip()
+        if value:
+            cleaned[key] = value
+    return cleaned
+
+
+def request_export(
+    dataset: str,
+    export_format: str,
+    params: Mapping,
+    user=None,
+    export_type: str = "all",
+    compress: bool = False,
+) -> tuple[ExportJob, bool]:
+    """Return a job for this export, reusing an identical queued or finished one."""
+
+    dataset = dataset if dataset in DATASETS else ExportJob.Dataset.COUPONS
+    if export_format not in ExportJob.Format.values:
+        export_format = ExportJob.Format.XLSX
+    if dataset != ExportJob.Dataset.COUPONS and export_format == ExportJob.Format.XLSX:
+        export_format = ExportJob.Format.CSV
+    if export_format == ExportJob.Format.XLSX:
+        compress = False
+    export_type = export_type if export_type in WORKBOOK_BUILDERS else "all"
+    params = clean_export_params(params)
+    fingerprint = export_fingerprint(
+        dataset, export_format, export_type, compress, params, data_version(dataset, params)
+    )
+
+    _expire_stale_jobs()
+    existing = (
+        ExportJob.objects.filter(
+            fingerprint=fingerprint,
+            status__in=(*ACTIVE_STATUSES, ExportJob.Status.DONE),
+        )
+        .order_by("-created_at")
+        .first()
+    )
+    if existing is not None and (
+        existing.status != ExportJob.Status.DONE or Path(existing.file_path).exists()
+    ):
+        return existing, False
+
+    try:
+        with transaction.atomic():
+            job = ExportJob.objects.create(
+                dataset=dataset,
+                export_format=export_format,
+                export_type=export_type,
+                compress=compress,
+                params=params,
+                fingerprint=fingerprint,
+                created_by=user if getattr(user, "is_authenticated", False) else None,
+            )
+    except IntegrityError:
+        # An identical request queued its build first; share that job.
+        return ExportJob.objects.get(fingerprint=fingerprint, status__in=ACTIVE_STATUSES), False
+    transaction.on_commit(lambda: EXPORT_EXECUTOR.submit(_run_in_worker, job.pk))
+    return job, True
+
+
+def _run_in_worker(job_id: int) -> None:
+    try:
+        run_export_job(job_id)
+    except Exception:  # pragma: no cover - defensive
+        LOGGER.exception("Export job %s crashed.", job_id)
+    finally:
+        close_old_connections()
+
+
+def run_export_job(job_id: int) -> ExportJob:
+    """Build the job's file, recording progress, then apply the cache limits."""
+
+    job = ExportJob.objects.get(pk=job_id)
+    factory, prefix, date_field, table = DATASETS[job.dataset]
+    queryset, _ = filter_coupon_queryset(factory(job.params), job.params, prefix, date_field)
+    total_rows = queryset.count()
+    _update(job, status=ExportJob.Status.RUNNING, started_at=timezone.now(), total_rows=total_rows)
+
+    EXPORT_JOB_DIR.mkdir(parents=True, exist_ok=True)
+    filename = _job_filename(job)
+    target = EXPORT_JOB_DIR / f"{job.pk}_{filename}"
+    partial = target.with_name(target.name + ".part")
+    try:
+        if job.export_format == ExportJob.Format.XLSX:
+            workbook = WORKBOOK_BUILDERS[job.export_type](queryset)
+            _update(job, progress=90)
+            workbook.save(partial)
+            rows_written = total_rows
+        else:
+            rows_written = _write_text_export(job, table, queryset, partial)
+        partial.replace(target)
+    except Exception as exc:
+        partial.unlink(missing_ok=True)
+        LOGGER.exception("Export job %s failed.", job.pk)
+        _update(job, status=ExportJob.Status.FAILED, error=str(exc), finished_at=timezone.now())
+        return job
+
+    _update(
+        job,
+        status=ExportJob.Status.DONE,
+        progress=100,
+        rows_written=rows_written,
+        filename=filename,
+        file_path=str(target),
+        file_size=target.stat().st_size,
+        finished_at=timezone.now(),
+    )
+    evict_export_files()
+    return job
+
+
+def _write_text_export(job: ExportJob, table, queryset, path: Path) -> int:
+    written = 0
+
+    def counted_rows():
+        nonlocal written
+        for row in table.rows(queryset):
+            yield row
+            written += 1
+            if written % PROGRESS_EVERY == 0:
+                _LIVE_PROGRESS[job.pk] = written
+
+    encoder = iter_csv if job.export_format == ExportJob.Format.CSV else iter_ndjson
+    stream = encoder(table.headers, counted_rows())
+    if job.compress:
+        stream = iter_gzip(stream)
+    try:
+        with open(path, "wb") as handle:
+            for chunk in stream:
+                handle.write(chunk)
+    finally:
+        _LIVE_PROGRESS.pop(job.pk, None)
+    return written
+
+
+def apply_live_progress(job: ExportJob) -> ExportJob:
+    """Fill in the row counter of a job being written by this process."""
+
+    written = _LIVE_PROGRESS.get(job.pk)
+    if written is not None and job.status == ExportJob.Status.RUNNING:
+        job.rows_written = written
+        job.progress = min(99, written * 100 // max(job.total_rows, 1))
+    return job
+
+
+def _job_filename(job: ExportJob) -> str:
+    tokens = [job.dataset]
+    if job.export_format == ExportJob.Format.XLSX and job.export_type != "all":
+        tokens.append(f"por_{'sala' if job.export_type == 'room' else 'dia'}")
+    if job.params.get("room"):
+        tokens.append(f"sala{job.params['room']}")
+    if job.params.get("terminal"):
+        tokens.append(job.params["terminal"])
+    now_value = timezone.now()
+    if timezone.is_aware(now_value):
+        now_value = timezone.localtime(now_value)
+    tokens.append(now_value.strftime("%Y%m%d_%H%M"))
+    filename = "_".join(tokens) + f".{job.export_format}"
+    return f"{filename}.gz" if job.compress else filename
+
+
+def _update(job: ExportJob, **fields) -> None:
+    for name, value in fields.items():
+        setattr(job, name, value)
+    ExportJob.objects.filter(pk=job.pk).update(**fields)
+
+
+def _expire_stale_jobs() -> None:
+    cutoff = timezone.now() - timedelta(seconds=EXPORT_JOB_STALE_AFTER)
+    ExportJob.objects.filter(status__in=ACTIVE_STATUSES, created_at__lt=cutoff).update(
+        status=ExportJob.Status.FAILED,
+        error="El proceso que generaba la exportación se detuvo.",
+        finished_at=timezone.now(),
+    )
+
+
+def evict_export_files(now=None) -> int:
+    """Delete finished files past the age limit or beyond the total size budget."""
+
+    now = now or timezone.now()
+    cutoff = now - timedelta(seconds=EXPORT_JOB_MAX_AGE)
+    expired_ids = []
+    kept_bytes = 0
+    finished = ExportJob.objects.filter(status=ExportJob.Status.DONE).order_by("-finished_at")
+    for job_id, path, size, finished_at in finished.values_list(
+        "id", "file_path", "file_size", "finished_at"
+    ):
+        if finished_at and finished_at >= cutoff and kept_bytes + size <= EXPORT_JOB_MAX_BYTES:
+            kept_bytes += size
+            continue
+        Path(path).unlink(missing_ok=True)
+        expired_ids.append(job_id)
+    if expired_ids:
+        ExportJob.objects.filter(pk__in=expired_ids).update(status=ExportJob.Status.EXPIRED)
+    return len(expired_ids)
@@ -0,0 +1,180 @@
+"""Streaming CSV and NDJSON exports for coupons, voucher scans and reprints."""
+
+from __future__ import annotations
+
+import csv
+import json
+import zlib
+from typing import Callable, Iterable, Iterator, Sequence
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from ..models import Coupon
+from ..rooms import RoomDirectory
+from .reports import EXPORT_CHUNK_SIZE
+
+
+EXPORT_FORMATS = ("csv", "ndjson")
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+# Rows encoded per chunk handed to the WSGI server.
+ROWS_PER_CHUNK = 500
+SOURCE_LABELS = dict(Coupon.SOURCE_CHOICES)
+
+
+class ExportTable:
+    """Column layout and row formatting for one exportable queryset."""
+
+    def __init__(self, columns: Sequence[tuple[str, str, Callable | None]]):
+        # Each column is (output name, values_list lookup, optional formatter).
+        self.columns = columns
+
+    @property
+    def headers(self) -> list[str]:
+        return [name for name, _, _ in self.columns]
+
+    def rows(self, queryset) -> Iterator[list]:
+        """Yield formatted rows from a chunked database cursor."""
+
+        lookups = [lookup for _, lookup, _ in self.columns]
+        formatters = [formatter for _, _, formatter in self.columns]
+        cursor = queryset.values_list(*lookups).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        for values in cursor:
+            yield [
+                formatter(value) if formatter is not None else value
+                for formatter, value in zip(formatters, values)
+            ]
+
+
+def _local_isoformat(value) -> str:
+    if not value:
+        return ""
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.isoformat(timespec="seconds")
+
+
+def _room_name(room_id) -> str:
+    return RoomDirectory.get(room_id).name
+
+
+def _source_label(value) -> str:
+    return SOURCE_LABELS.get(value, value)
+
+
+COUPON_TABLE = ExportTable(
+    [
+        ("codigo", "code", None),
+        ("nombre", "person__first_name", None),
+        ("apellido", "person__last_name", None),
+        ("dni", "person__id_number", None),
+        ("telefono", "person__phone", None),
+        ("correo", "person__email", None),
+        ("sala_id", "room_id", None),
+        ("sala", "room_id", _room_name),
+        ("terminal", "terminal_name", None),
+        ("origen", "source", _source_label),
+        ("impreso", "printed", None),
+        ("fecha_escaneo", "scanned_at", _local_isoformat),
+    ]
+)
+
+VOUCHER_SCAN_TABLE = ExportTable(
+    [
+        ("voucher", "code", None),
+        ("nombre", "person__first_name", None),
+        ("apellido", "person__last_name", None),
+        ("dni", "person__id_number", None),
+        ("sala_id", "room_id", None),
+        ("sala", "room_id", _room_name),
+        ("terminal", "terminal_name", None),
+        ("origen", "source", _source_label),
+        ("fecha_escaneo", "scanned_at", _local_isoformat),
+    ]
+)
+
+REPRINT_LOG_TABLE = ExportTable(
+    [
+        ("codigo", "coupon__code", None),
+        ("reimpresion", "reprint_number", None),
+        ("usuario", "user__username", None),
+        ("dni", "coupon__person__id_number", None),
+        ("sala_id", "room_id", None),
+        ("sala", "room_id", _room_name),
+        ("terminal", "coupon__terminal_name", None),
+        ("fecha_cupon", "coupon__scanned_at", _local_isoformat),
+        ("fecha_reimpresion", "created_at", _local_isoformat),
+    ]
+)
+
+
+class _LineBuffer:
+    """Minimal file object that hands csv.writer output straight back."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv(headers: Sequence[str], rows: Iterable[list]) -> Iterator[bytes]:
+    """Encode rows as UTF-8 CSV (with BOM for spreadsheet tools), a chunk at a time."""
+
+    writer = csv.writer(_LineBuffer())
+    yield ("\ufeff" + writer.writerow(headers)).encode("utf-8")
+    chunk: list[str] = []
+    for row in rows:
+        chunk.append(writer.writerow(row))
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield "".join(chunk).encode("utf-8")
+            chunk = []
+    if chunk:
+        yield "".join(chunk).encode("utf-8")
+
+
+def iter_ndjson(headers: Sequence[str], rows: Iterable[list]) -> Iterator[bytes]:
+    """Encode rows as one JSON object per line, a chunk at a time."""
+
+    chunk: list[str] = []
+    for row in rows:
+        chunk.append(json.dumps(dict(zip(headers, row)), ensure_ascii=False, default=str))
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield ("\n".join(chunk) + "\n").encode("utf-8")
+            chunk = []
+    if chunk:
+        yield ("\n".join(chunk) + "\n").encode("utf-8")
+
+
+def iter_gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Compress a byte stream into a gzip member as it is produced."""
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def render_export_response(
+    table: ExportTable,
+    queryset,
+    export_format: str,
+    filename: str,
+    compress: bool = False,
+) -> StreamingHttpResponse:
+    """Stream the queryset in the requested format, optionally gzip-compressed."""
+
+    export_format = export_format if export_format in EXPORT_FORMATS else "csv"
+    encoder = iter_csv if export_format == "csv" else iter_ndjson
+    stream = encoder(table.headers, table.rows(queryset))
+    filename = f"{filename}.{export_format}"
+    content_type = CONTENT_TYPES[export_format]
+    if compress:
+        stream = iter_gzip(stream)
+        filename = f"{filename}.gz"
+        content_type = "application/gzip"
+    response = StreamingHttpResponse(stream, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
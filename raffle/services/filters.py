@@ -0,0 +1,101 @@
+"""Shared filters for the coupon list and its exports."""
+
+from __future__ import annotations
+
+from datetime import datetime, time
+from typing import Mapping
+
+from django.conf import settings
+from django.utils import timezone
+
+from ..models import Coupon
+from .archive import parse_archive_param
+from .search import CODE_MODELS, coupon_search_q, participant_search_q
+
+# Query-string keys understood by filter_coupon_queryset().
+COUPON_FILTER_KEYS = (
+    "room",
+    "terminal",
+    "participant",
+    "coupon",
+    "source",
+    "date_start",
+    "date_end",
+    "archive",
+)
+
+
+def _parse_date(value: str | None):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def filter_coupon_queryset(queryset, params: Mapping, prefix: str = "", date_field: str | None = None):
+    """Narrow a queryset with the coupon list filters and return the selections.
+
+    ``prefix`` points the lookups at a related coupon (e.g. ``"coupon__"``);
+    voucher scans share the coupon field names and need none. ``date_field``
+    names a datetime to range over instead of the stored ``scanned_date``.
+    """
+
+    selected_room = params.get("room")
+    selected_room_id = int(selected_room) if selected_room and selected_room.isdigit() else None
+    if selected_room_id is not None:
+        queryset = queryset.filter(**{f"{prefix}room_id": selected_room_id})
+
+    selected_terminal = (params.get("terminal") or "").strip()
+    if selected_terminal:
+        queryset = queryset.filter(**{f"{prefix}terminal_name": selected_terminal})
+
+    participant_query = (params.get("participant") or "").strip()
+    if participant_query:
+        queryset = queryset.filter(participant_search_q(participant_query, prefix))
+
+    coupon_query = (params.get("coupon") or "").strip()
+    if coupon_query:
+        # A prefix always points at a coupon; unprefixed codes may be vouchers.
+        indexed_codes = bool(prefix) or queryset.model in CODE_MODELS
+        queryset = queryset.filter(coupon_search_q(coupon_query, prefix, indexed_codes))
+
+    source_value = (params.get("source") or "").strip()
+    valid_sources = {choice[0] for choice in Coupon.SOURCE_CHOICES}
+    if source_value and source_value in valid_sources:
+        queryset = queryset.filter(**{f"{prefix}source": source_value})
+    else:
+        source_value = ""
+
+    start_date = _parse_date(params.get("date_start"))
+    end_date = _parse_date(params.get("date_end"))
+    if date_field is None:
+        # Coupons and scans carry their local day, so no datetime bounds needed.
+        if start_date:
+            queryset = queryset.filter(**{f"{prefix}scanned_date__gte": start_date})
+        if end_date:
+            queryset = queryset.filter(**{f"{prefix}scanned_date__lte": end_date})
+    else:
+        current_tz = timezone.get_default_timezone()
+        if start_date:
+            dt = datetime.combine(start_date, time.min)
+            dt = timezone.make_aware(dt, current_tz) if settings.USE_TZ else dt
+            queryset = queryset.filter(**{f"{date_field}__gte": dt})
+        if end_date:
+            dt = datetime.combine(end_date, time.max)
+            dt = timezone.make_aware(dt, current_tz) if settings.USE_TZ else dt
+            queryset = queryset.filter(**{f"{date_field}__lte": dt})
+
+    archive = parse_archive_param(params.get("archive"))
+
+    selections = {
+        "selected_room": selected_room_id,
+        "selected_terminal": selected_terminal,
+        "selected_participant": participant_query,
+        "selected_coupon": coupon_query,
+        "selected_source": source_value,
+        "date_start": params.get("date_start", ""),
+        "date_end": params.get("date_end", ""),
+        # The caller picks the live or archived tables; see archive.coupon_queryset.
+        "selected_archive": str(archive or ""),
+    }
+    return queryset, selections
@@ -0,0 +1,137 @@
+"""Keep-alive HTTP/1.1 connection pool for the room endpoints."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from http import client
+from typing import Dict, List, Mapping, Tuple
+
+
+# Errors that mean a reused socket was closed by the server while idle.
+STALE_CONNECTION_ERRORS = (
+    client.BadStatusLine,
+    client.CannotSendRequest,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+)
+
+
+@dataclass(frozen=True)
+class RequestTimings:
+    """Latency breakdown of a pooled request, in seconds."""
+
+    connect: float
+    request: float
+    total: float
+    reused: bool
+
+    def as_milliseconds(self) -> dict:
+        return {
+            "connect_ms": round(self.connect * 1000, 1),
+            "request_ms": round(self.request * 1000, 1),
+            "total_ms": round(self.total * 1000, 1),
+            "reused": self.reused,
+        }
+
+
+@dataclass
+class PooledResponse:
+    """Fully read response returned by the pool."""
+
+    status: int
+    body: bytes
+    timings: RequestTimings
+
+
+class HTTPConnectionPool:
+    """Thread-safe pool of persistent connections keyed by host."""
+
+    def __init__(self, timeout: float = 5.0, max_idle_per_host: int = 4, idle_timeout: float = 30.0):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.idle_timeout = idle_timeout
+        self._idle: Dict[str, List[Tuple[client.HTTPConnection, float]]] = {}
+        self._lock = threading.Lock()
+
+    def _checkout(self, host: str) -> Tuple[client.HTTPConnection, bool]:
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(host, [])
+            while idle:
+                connection, released_at = idle.pop()
+                if now - released_at < self.idle_timeout:
+                    return connection, True
+                connection.close()
+        return client.HTTPConnection(host, timeout=self.timeout), False
+
+    def _checkin(self, host: str, connection: client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(host, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append((connection, time.monotonic()))
+                return
+        connection.close()
+
+    def request(
+        self,
+        host: str,
+        method: str,
+        path: str,
+        body: bytes | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> PooledResponse:
+        """Send a request reusing an idle connection when one is available."""
+
+        started = time.perf_counter()
+        connection, reused = self._checkout(host)
+        try:
+            return self._send(connection, reused, started, host, method, path, body, headers)
+        except STALE_CONNECTION_ERRORS:
+            if not reused:
+                raise
+            # The server dropped the idle socket; retry once on a fresh one.
+            connection = client.HTTPConnection(host, timeout=self.timeout)
+            return self._send(connection, False, started, host, method, path, body, headers)
+
+    def _send(self, connection, reused, started, host, method, path, body, headers) -> PooledResponse:
+        connect_time = 0.0
+        try:
+            if connection.sock is None:
+                connect_started = time.perf_counter()
+                connection.connect()
+                connect_time = time.perf_counter() - connect_started
+            connection.request(method, path, body=body, headers=dict(headers or {}))
+            response = connection.getresponse()
+            payload = response.read()
+        except BaseException:
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._checkin(host, connection)
+
+        total = time.perf_counter() - started
+        return PooledResponse(
+            status=response.status,
+            body=payload,
+            timings=RequestTimings(
+                connect=connect_time,
+                request=total - connect_time,
+                total=total,
+                reused=reused,
+            ),
+        )
+
+    def clear(self) -> None:
+        """Close every idle connection."""
+
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection, _ in connections:
+                connection.close()
@@ -0,0 +1,160 @@
+"""Chunked, resumable title-casing of participant names.
+
+The roster is read in primary-key order, one batch per query, and each
+batch's changes are written with a single ``bulk_update`` in the same
+transaction that advances the job's ``last_pk``. An interrupted run therefore
+resumes exactly after the last batch it committed.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Callable
+
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from ..models import ExportDataVersion, NormalizationJob, Person
+from .participants import clear_participant_cache
+from .search import index_people
+
+LOGGER = logging.getLogger(__name__)
+
+NORMALIZE_BATCH_SIZE = int(os.getenv("NORMALIZE_BATCH_SIZE", "1000"))
+# Jobs without a batch written for this long (seconds) are assumed lost.
+NORMALIZE_JOB_STALE_AFTER = int(os.getenv("NORMALIZE_JOB_STALE_AFTER", "600"))
+ACTIVE_STATUSES = (NormalizationJob.Status.PENDING, NormalizationJob.Status.RUNNING)
+BATCH_FIELDS = ("pk", "first_name", "last_name", "id_number", "search_contact")
+
+NORMALIZE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="normalize-job")
+
+
+def normalize_person_name(value: str) -> str:
+    # Collapse whitespace and convert to title case for consistent storage.
+    normalized = " ".join(value.split()).strip()
+    return normalized.title()
+
+
+def active_normalization_job() -> NormalizationJob | None:
+    _expire_stale_jobs()
+    return NormalizationJob.objects.filter(status__in=ACTIVE_STATUSES).first()
+
+
+def prepare_normalization_job(user=None, restart: bool = False) -> NormalizationJob:
+    """Reopen the latest interrupted job, or create a new one from the start."""
+
+    latest = NormalizationJob.objects.first()
+    if not restart and latest is not None and latest.status == NormalizationJob.Status.FAILED:
+        _update(latest, status=NormalizationJob.Status.PENDING, error="", finished_at=None)
+        return latest
+    return NormalizationJob.objects.create(
+        created_by=user if getattr(user, "is_authenticated", False) else None
+    )
+
+
+def request_normalization(user=None) -> tuple[NormalizationJob, bool]:
+    """Return the job already in progress, or queue one in the background."""
+
+    job = active_normalization_job()
+    if job is not None:
+        return job, False
+    job = prepare_normalization_job(user)
+    transaction.on_commit(lambda: NORMALIZE_EXECUTOR.submit(_run_in_worker, job.pk))
+    return job, True
+
+
+def _run_in_worker(job_id: int) -> None:
+    try:
+        run_normalization_job(job_id)
+    except Exception:  # pragma: no cover - defensive
+        LOGGER.exception("Normalization job %s crashed.", job_id)
+    finally:
+        close_old_connections()
+
+
+def run_normalization_job(
+    job_id: int,
+    batch_size: int = NORMALIZE_BATCH_SIZE,
+    on_batch: Callable[[NormalizationJob], None] | None = None,
+) -> NormalizationJob:
+    """Normalize every participant after the job's ``last_pk``, batch by batch."""
+
+    job = NormalizationJob.objects.get(pk=job_id)
+    _update(
+        job,
+        status=NormalizationJob.Status.RUNNING,
+        total=Person.objects.count(),
+        processed=Person.objects.filter(pk__lte=job.last_pk).count(),
+    )
+    try:
+        while True:
+            rows = list(
+                Person.objects.filter(pk__gt=job.last_pk)
+                .order_by("pk")
+                .values_list(*BATCH_FIELDS)[:batch_size]
+            )
+            if not rows:
+                break
+            with transaction.atomic():
+                changed = _write_batch(rows)
+                _update(
+                    job,
+                    last_pk=rows[-1][0],
+                    processed=job.processed + len(rows),
+                    updated=job.updated + changed,
+                )
+            if on_batch is not None:
+                on_batch(job)
+    except Exception as exc:
+        LOGGER.exception("Normalization job %s failed.", job.pk)
+        _update(job, status=NormalizationJob.Status.FAILED, error=str(exc), finished_at=timezone.now())
+        return job
+
+    _update(job, status=NormalizationJob.Status.DONE, finished_at=timezone.now())
+    return job
+
+
+def _write_batch(rows: list[tuple]) -> int:
+    changed = []
+    for pk, first_name, last_name, id_number, search_contact in rows:
+        normalized_first = normalize_person_name(first_name)
+        normalized_last = normalize_person_name(last_name)
+        if normalized_first == first_name and normalized_last == last_name:
+            continue
+        person = Person(
+            pk=pk,
+            first_name=normalized_first,
+            last_name=normalized_last,
+            id_number=id_number,
+            search_contact=search_contact,
+        )
+        # bulk_update skips pre_save, so derive the folded search key here.
+        Person._meta.get_field("search_name").pre_save(person, False)
+        changed.append(person)
+
+    if changed:
+        Person.objects.bulk_update(changed, ["first_name", "last_name", "search_name"])
+        index_people(changed)
+        ExportDataVersion.bump()
+        # The bulk write sends no signals; drop cached rows with the old names.
+        clear_participant_cache()
+        transaction.on_commit(clear_participant_cache)
+    return len(changed)
+
+
+def _update(job: NormalizationJob, **fields) -> None:
+    for name, value in fields.items():
+        setattr(job, name, value)
+    job.save(update_fields=[*fields, "updated_at"])
+
+
+def _expire_stale_jobs() -> None:
+    cutoff = timezone.now() - timedelta(seconds=NORMALIZE_JOB_STALE_AFTER)
+    NormalizationJob.objects.filter(status__in=ACTIVE_STATUSES, updated_at__lt=cutoff).update(
+        status=NormalizationJob.Status.FAILED,
+        error="El proceso que normalizaba los participantes se detuvo.",
+        finished_at=timezone.now(),
+    )
@@ -0,0 +1,144 @@
+"""Seek-based pagination and cached totals for long coupon lists."""
+
+from __future__ import annotations
+
+import base64
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from django.db.models import Q, QuerySet
+
+COUPON_PAGE_SIZE = 100
+# Totals shown next to a paginated list are reused for this long (seconds).
+LIST_TOTALS_TTL = float(os.getenv("LIST_TOTALS_TTL", "60"))
+LIST_TOTALS_LIMIT = 64
+
+
+@dataclass(frozen=True)
+class KeysetPage:
+    object_list: list
+    next_cursor: str = ""
+    previous_cursor: str = ""
+
+    @property
+    def has_next(self) -> bool:
+        return bool(self.next_cursor)
+
+    @property
+    def has_previous(self) -> bool:
+        return bool(self.previous_cursor)
+
+
+def encode_cursor(scanned_at: datetime, pk: int) -> str:
+    raw = f"{scanned_at.isoformat()}|{pk}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> tuple[datetime, int] | None:
+    """Return the (scanned_at, id) position, or None for a missing or bad cursor."""
+
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        scanned_at, pk = raw.split("|")
+        return datetime.fromisoformat(scanned_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def keyset_paginate(
+    queryset: QuerySet,
+    after: str | None = None,
+    before: str | None = None,
+    per_page: int = COUPON_PAGE_SIZE,
+) -> KeysetPage:
+    """Return the page after or before a cursor, newest first by (scanned_at, id).
+
+    Each page is one indexed range read of ``per_page + 1`` rows, so its cost
+    does not depend on how deep into the list it is.
+    """
+
+    queryset = queryset.order_by()
+    before_position = decode_cursor(before)
+    after_position = decode_cursor(after)
+
+    if before_position is not None:
+        scanned_at, pk = before_position
+        rows = list(
+            queryset.filter(Q(scanned_at__gt=scanned_at) | Q(scanned_at=scanned_at, pk__gt=pk))
+            .order_by("scanned_at", "pk")[: per_page + 1]
+        )
+        has_previous = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_next = True
+    else:
+        if after_position is not None:
+            scanned_at, pk = after_position
+            queryset = queryset.filter(
+                Q(scanned_at__lt=scanned_at) | Q(scanned_at=scanned_at, pk__lt=pk)
+            )
+        rows = list(queryset.order_by("-scanned_at", "-pk")[: per_page + 1])
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+        has_previous = after_position is not None
+
+    if not rows:
+        return KeysetPage([])
+    return KeysetPage(
+        rows,
+        next_cursor=encode_cursor(rows[-1].scanned_at, rows[-1].pk) if has_next else "",
+        previous_cursor=encode_cursor(rows[0].scanned_at, rows[0].pk) if has_previous else "",
+    )
+
+
+@dataclass(frozen=True)
+class CachedTotals:
+    value: object
+    loaded_at: float
+
+    @property
+    def age_seconds(self) -> int:
+        return int(time.monotonic() - self.loaded_at)
+
+
+# Coupon writes bump the version; totals from other processes age out by TTL.
+_totals_version = 0
+_totals: OrderedDict[tuple, tuple[int, CachedTotals]] = OrderedDict()
+_totals_lock = threading.Lock()
+
+
+def invalidate_list_totals() -> None:
+    """Mark cached totals as stale; safe to call inside open transactions."""
+
+    global _totals_version
+    _totals_version += 1
+
+
+def cached_list_totals(key: tuple, compute: Callable[[], object]) -> CachedTotals:
+    """Reuse the totals computed for the same filters within LIST_TOTALS_TTL."""
+
+    with _totals_lock:
+        version, cached = _totals.get(key, (None, None))
+        if (
+            cached is not None
+            and version == _totals_version
+            and time.monotonic() - cached.loaded_at < LIST_TOTALS_TTL
+        ):
+            _totals.move_to_end(key)
+            return cached
+
+    version = _totals_version
+    totals = CachedTotals(compute(), time.monotonic())
+    if version == _totals_version:
+        with _totals_lock:
+            _totals[key] = (version, totals)
+            _totals.move_to_end(key)
+            while len(_totals) > LIST_TOTALS_LIMIT:
+                _totals.popitem(last=False)
+    return totals
@@ -0,0 +1,106 @@
+"""Process-wide LRU cache of participants looked up by DNI.
+
+The scanner asks ``person_lookup`` for every DNI, and the entry views and the
+registration form then look the same participant up again. Regulars scan
+many times per night, so most of these reads can be answered from memory.
+Only hits are cached: a DNI registered on another terminal must be found at
+once, while a participant edited elsewhere is at worst ``PARTICIPANT_CACHE_TTL``
+seconds stale.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from django.db import DEFAULT_DB_ALIAS
+
+from ..models import Person
+
+PARTICIPANT_CACHE_SIZE = int(os.getenv("PARTICIPANT_CACHE_SIZE", "5000"))
+PARTICIPANT_CACHE_TTL = float(os.getenv("PARTICIPANT_CACHE_TTL", "60"))
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+# id_number -> (loaded_at, field values). Person writes bump the version so a
+# lookup that raced a write does not publish the old row.
+_version = 0
+_entries: OrderedDict[str, tuple[float, tuple]] = OrderedDict()
+_lock = threading.Lock()
+_hits = 0
+_misses = 0
+_FIELD_NAMES = [field.attname for field in Person._meta.concrete_fields]
+_PK_INDEX = _FIELD_NAMES.index(Person._meta.pk.attname)
+
+
+def get_participant(id_number: str) -> Person | None:
+    """Return the participant with the DNI, or None when there is none."""
+
+    global _hits, _misses
+    with _lock:
+        cached = _entries.get(id_number)
+        if cached is not None and time.monotonic() - cached[0] < PARTICIPANT_CACHE_TTL:
+            _entries.move_to_end(id_number)
+            _hits += 1
+            # Every caller gets its own instance; the cached row stays untouched.
+            return Person.from_db(DEFAULT_DB_ALIAS, _FIELD_NAMES, cached[1])
+        _misses += 1
+
+    version = _version
+    values = Person.objects.filter(id_number=id_number).values_list(*_FIELD_NAMES).first()
+    if values is None:
+        return None
+    if version == _version:
+        with _lock:
+            _entries[id_number] = (time.monotonic(), values)
+            _entries.move_to_end(id_number)
+            while len(_entries) > PARTICIPANT_CACHE_SIZE:
+                _entries.popitem(last=False)
+    return Person.from_db(DEFAULT_DB_ALIAS, _FIELD_NAMES, values)
+
+
+def participant_exists(id_number: str) -> bool:
+    return get_participant(id_number) is not None
+
+
+def forget_participant(person: Person) -> None:
+    """Drop a saved or deleted participant, also under a DNI it used to have."""
+
+    global _version
+    _version += 1
+    with _lock:
+        stale = [key for key, (_, values) in _entries.items() if values[_PK_INDEX] == person.pk]
+        for key in {person.id_number, *stale}:
+            _entries.pop(key, None)
+
+
+def refresh_participant(person: Person) -> Person | None:
+    """Drop a cached participant the database rejected and read its DNI again."""
+
+    forget_participant(person)
+    return get_participant(person.id_number)
+
+
+def clear_participant_cache() -> None:
+    """Forget every participant, for bulk changes that bypass the signals."""
+
+    global _version
+    _version += 1
+    with _lock:
+        _entries.clear()
+
+
+def participant_cache_info() -> CacheInfo:
+    """Hit and miss counts since the process started, like ``functools.lru_cache``."""
+
+    with _lock:
+        return CacheInfo(_hits, _misses, PARTICIPANT_CACHE_SIZE, len(_entries))
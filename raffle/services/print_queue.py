@@ -0,0 +1,122 @@
+"""In-process print spooler that keeps printer I/O out of the request cycle."""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List
+
+from django.db import close_old_connections, transaction
+
+from ..models import Coupon, ExportDataVersion
+from .printing import print_coupons_backend
+
+LOGGER = logging.getLogger(__name__)
+
+SHUTDOWN_TIMEOUT = 10
+# Coupons sent per ESC/POS stream; a failed stream only re-queues its batch.
+PRINT_BATCH_SIZE = 20
+
+
+@dataclass
+class PrintJob:
+    """Coupons printed together, in order, by the spooler worker."""
+
+    coupons: List[Coupon]
+    failed_ids: List[int] = field(default_factory=list)
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+
+class PrintSpooler:
+    """FIFO queue served by a single background printing thread."""
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        printer: Callable[[List[Coupon]], bool] = print_coupons_backend,
+        batch_size: int = PRINT_BATCH_SIZE,
+    ):
+        self.printer = printer
+        self.batch_size = max(1, batch_size)
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, coupons: Iterable[Coupon]) -> PrintJob:
+        """Queue the coupons once the surrounding transaction commits."""
+
+        job = PrintJob(list(coupons))
+        if job.coupons:
+            transaction.on_commit(lambda: self._enqueue(job))
+        else:
+            job.done.set()
+        return job
+
+    def process(self, job: PrintJob) -> PrintJob:
+        """Print the job in batches and flag the coupons of failed batches."""
+
+        for start in range(0, len(job.coupons), self.batch_size):
+            batch = job.coupons[start:start + self.batch_size]
+            try:
+                printed = self.printer(batch)
+            except Exception:  # pragma: no cover - hardware dependent
+                LOGGER.exception("Coupon batch %s could not be printed.", batch[0].code)
+                printed = False
+            if printed is False:
+                job.failed_ids.extend(coupon.pk for coupon in batch)
+        if job.failed_ids:
+            # Send them back to the pending list so an operator can retry.
+            Coupon.objects.filter(pk__in=job.failed_ids).update(printed=False)
+            ExportDataVersion.bump()
+        job.done.set()
+        return job
+
+    def join(self) -> None:
+        """Block until every queued job has been processed."""
+
+        self._queue.join()
+
+    def shutdown(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Let the worker finish queued jobs and stop."""
+
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join(timeout)
+
+    def _enqueue(self, job: PrintJob) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="coupon-print-spooler", daemon=True
+                )
+                self._thread.start()
+        self._queue.put(job)
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is self._STOP:
+                    return
+                self.process(job)
+            except Exception:  # pragma: no cover - defensive
+                LOGGER.exception("Print job failed.")
+            finally:
+                self._queue.task_done()
+                close_old_connections()
+
+
+COUPON_PRINT_SPOOLER = PrintSpooler()
+atexit.register(COUPON_PRINT_SPOOLER.shutdown)
+
+
+def spool_coupons(coupons: Iterable[Coupon]) -> PrintJob:
+    """Print coupons in the background after the current transaction commits."""
+
+    return COUPON_PRINT_SPOOLER.submit(coupons)
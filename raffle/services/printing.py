@@ -1,11 +1,13 @@
 import logging
-from typing import List
+from typing import Iterable, List
 
 from ..models import Coupon, PrinterConfiguration
 from ..utils.terminal import DEFAULT_PRINTER_NAME, DEFAULT_PRINTER_PORT, get_terminal_config
 from utils.printers import (
     USBPrinterError,
-    build_escpos_bytes,
+    USBPrinterSession,
+    build_escpos_batch,
+    find_usb_session,
     list_usb_printers,
     pyusb_available,
     raw_print_usb,
@@ -24,8 +26,18 @@ def get_or_create_printer_configuration() -> PrinterConfiguration:
     return configuration
 
 
-def print_coupon_backend(coupon: Coupon) -> None:
-    """Print a coupon using the configured printer backends."""
+def print_coupon_backend(coupon: Coupon) -> bool:
+    """Print a coupon using the configured printer backends; return whether it printed."""
+
+    return print_coupons_backend([coupon])
+
+
+def print_coupons_backend(coupons: Iterable[Coupon]) -> bool:
+    """Print several coupons as one ESC/POS job (one USB write or spooler document)."""
+
+    coupons = list(coupons)
+    if not coupons:
+        return True
 
     configuration = get_or_create_printer_configuration()
     terminal_config = get_terminal_config()
@@ -36,7 +48,8 @@ def print_coupon_backend(coupon: Coupon) -> None:
         printer_name = terminal_config.get("printer_name") or printer_name
         printer_port = terminal_config.get("printer_port") or printer_port
 
-    payload = build_escpos_bytes(coupon)
+    payload = build_escpos_batch(coupons)
+    document_name = "Cupon" if len(coupons) == 1 else f"Cupones x{len(coupons)}"
     errors: List[str] = []
     try:
         vendor_id, product_id = configuration.usb_identifiers()
@@ -45,19 +58,45 @@ def print_coupon_backend(coupon: Coupon) -> None:
     if vendor_id is not None and product_id is not None:
         try:
             raw_print_usb(vendor_id, product_id, payload)
-            return
+            return True
         except USBPrinterError as exc:  # pragma: no cover
             errors.append(f"USB printer error: {exc}")
         except Exception as exc:  # pragma: no cover
             errors.append(f"Unexpected USB error: {exc}")
     if printer_name:
         try:
-            raw_print_windows(printer_name, payload)
-            return
+            raw_print_windows(printer_name, payload, document_name)
+            return True
         except Exception as exc:  # pragma: no cover
             errors.append(f"Windows spooler error on {printer_port}: {exc}")
     if errors:  # pragma: no cover
         LOGGER.error("Coupon printing failed: %s", "; ".join(errors))
+    return False
+
+
+SESSION_STATE_LABELS = {
+    USBPrinterSession.DISCONNECTED: "Desconectada",
+    USBPrinterSession.CONNECTED: "Conectada",
+    USBPrinterSession.IDLE: "Inactiva",
+    USBPrinterSession.ERROR: "Error",
+}
+
+
+def printer_session_status(configuration: PrinterConfiguration | None = None) -> dict | None:
+    """Describe the USB session of the configured printer, if it has USB identifiers."""
+
+    configuration = configuration or get_or_create_printer_configuration()
+    try:
+        vendor_id, product_id = configuration.usb_identifiers()
+    except (TypeError, ValueError):
+        return None
+    session = find_usb_session(vendor_id, product_id)
+    if session is None:
+        status = USBPrinterSession(vendor_id, product_id).snapshot()
+    else:
+        status = session.snapshot()
+    status["label"] = SESSION_STATE_LABELS[status["state"]]
+    return status
 
 
 def available_printers():
@@ -72,4 +111,5 @@ def available_printers():
     return {
         "usb_devices": usb_devices,
         "pyusb_available": pyusb_available(),
+        "session": printer_session_status(),
     }
@@ -0,0 +1,117 @@
+"""Set-based purge of every participant, coupon and scan.
+
+``QuerySet.delete()`` loads each row and its cascaded reprints into memory
+and sends a signal per object before deleting. A full season is far too big
+for that, so the purge issues plain ``DELETE`` statements instead: child
+tables first, in primary-key order, at most ``PURGE_CHUNK_SIZE`` rows per
+statement. Each chunk commits on its own, so a purge never holds one huge
+transaction. The foreign keys stay valid between chunks, and an interrupted
+purge is finished by running it again.
+
+The code sequences are kept: other terminals may still hold leased number
+ranges in memory, so numbering continues past the purge instead of
+restarting and handing those ranges out twice.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+
+from django.db import connection, transaction
+
+from ..models import (
+    ArchivedCoupon,
+    ArchivedReprintLog,
+    ArchivedVoucherScan,
+    Coupon,
+    CouponArchive,
+    CouponReprint,
+    CouponReprintLog,
+    CouponRollup,
+    EntryRateState,
+    ExportDataVersion,
+    Person,
+    PersonSearchGram,
+    Terminal,
+    VoucherScan,
+)
+from .dashboard import invalidate_dashboard_snapshots
+from .pagination import invalidate_list_totals
+from .participants import clear_participant_cache
+from .terminals import forget_touched_terminals
+
+PURGE_CHUNK_SIZE = int(os.getenv("PURGE_CHUNK_SIZE", "5000"))
+
+# Referencing tables before the tables they point at.
+PURGE_ORDER = (
+    CouponReprintLog,
+    CouponReprint,
+    VoucherScan,
+    Coupon,
+    ArchivedReprintLog,
+    ArchivedVoucherScan,
+    ArchivedCoupon,
+    CouponArchive,
+    PersonSearchGram,
+    EntryRateState,
+    Person,
+    CouponRollup,
+    Terminal,
+)
+
+
+@dataclass(frozen=True)
+class PurgeReport:
+    counts: dict[str, int]
+    seconds: float
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+def _delete_before(model, boundary=None) -> int:
+    table = connection.ops.quote_name(model._meta.db_table)
+    sql, params = f"DELETE FROM {table}", []
+    if boundary is not None:
+        sql += f" WHERE {connection.ops.quote_name(model._meta.pk.column)} < %s"
+        params.append(boundary)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return max(cursor.rowcount, 0)
+
+
+def _purge_table(model, chunk_size: int) -> int:
+    # Each statement removes the rows below the chunk_size-th remaining id,
+    # found with one index seek, so gaps in the ids cost nothing.
+    ids = model._base_manager.order_by("pk").values_list("pk", flat=True)
+    deleted = 0
+    while True:
+        boundary = next(iter(ids[chunk_size : chunk_size + 1]), None)
+        deleted += _delete_before(model, boundary)
+        if boundary is None:
+            return deleted
+
+
+def purge_raffle_data(chunk_size: int = PURGE_CHUNK_SIZE) -> PurgeReport:
+    """Delete all raffle activity and report the rows removed."""
+
+    chunk_size = max(1, chunk_size)
+    started = time.perf_counter()
+    counts = {}
+    for model in PURGE_ORDER:
+        counts[model._meta.db_table] = _purge_table(model, chunk_size)
+
+    # Ids may restart too, so cached exports must not match the new rows.
+    ExportDataVersion.bump()
+
+    for forget in (
+        invalidate_dashboard_snapshots,
+        invalidate_list_totals,
+        clear_participant_cache,
+        forget_touched_terminals,
+    ):
+        forget()
+    return PurgeReport(counts, time.perf_counter() - started)
@@ -2,18 +2,20 @@
 
 from __future__ import annotations
 
-from io import BytesIO
+import tempfile
+from itertools import chain, islice
 
-from django.db.models import Count
-from django.db.models.functions import TruncDate
-from django.http import HttpResponse
+from django.db.models import Count, F
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from openpyxl import Workbook
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
 from openpyxl.utils import get_column_letter
 
+from ..models import Coupon
 from ..rooms import RoomDirectory
-from .summary import get_coupon_room_summary
+from .summary import get_coupon_room_summary, get_coupon_terminal_summary
 
 
 HEADER_FILL = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
@@ -26,11 +28,33 @@ TABLE_BORDER = Border(
 )
 ALT_ROW_FILL = PatternFill(start_color="F2F6FB", end_color="F2F6FB", fill_type="solid")
 
+# Rows fetched per database round trip while streaming detail sheets.
+EXPORT_CHUNK_SIZE = 2000
+# Write-only sheets emit their column widths before the first row, so widths
+# are measured on this many leading rows and the rest are streamed through.
+WIDTH_SAMPLE_ROWS = EXPORT_CHUNK_SIZE
+STREAM_BLOCK_SIZE = 64 * 1024
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+COUPON_EXPORT_FIELDS = (
+    "code",
+    "person__first_name",
+    "person__last_name",
+    "person__id_number",
+    "person__phone",
+    "person__email",
+    "room_id",
+    "terminal_name",
+    "source",
+    "scanned_at",
+)
+SOURCE_LABELS = dict(Coupon.SOURCE_CHOICES)
+
 
 def build_coupon_report_workbook(coupons) -> Workbook:
     """Build a styled workbook with coupon details and room summary."""
 
-    workbook = Workbook()
+    workbook = _new_workbook()
     _build_summary_sheet(workbook, coupons)
     _build_detail_sheet(workbook, coupons)
     return workbook
@@ -39,7 +63,7 @@ def build_coupon_report_workbook(coupons) -> Workbook:
 def build_room_report_workbook(coupons) -> Workbook:
     """Build a workbook grouped by room with totals and detailed rows."""
 
-    workbook = Workbook()
+    workbook = _new_workbook()
     _build_room_summary_sheet(workbook, coupons)
     _build_room_detail_sheet(workbook, coupons)
     return workbook
@@ -48,49 +72,144 @@ def build_room_report_workbook(coupons) -> Workbook:
 def build_daily_report_workbook(coupons) -> Workbook:
     """Build a workbook grouped by day with totals and detailed rows."""
 
-    workbook = Workbook()
+    workbook = _new_workbook()
     _build_daily_summary_sheet(workbook, coupons)
     _build_daily_detail_sheet(workbook, coupons)
     return workbook
 
 
-def render_workbook_response(workbook: Workbook, filename: str) -> HttpResponse:
+def render_workbook_response(workbook: Workbook, filename: str) -> StreamingHttpResponse:
     """Return an HTTP response streaming the workbook as an XLSX file."""
 
-    buffer = BytesIO()
-    workbook.save(buffer)
-    buffer.seek(0)
-    response = HttpResponse(
-        buffer.getvalue(),
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-    )
+    # The archive is assembled in a temporary file so memory stays flat
+    # regardless of how many rows the sheets hold.
+    archive = tempfile.TemporaryFile()
+    workbook.save(archive)
+    size = archive.tell()
+    archive.seek(0)
+    response = StreamingHttpResponse(_iter_file(archive), content_type=XLSX_CONTENT_TYPE)
+    response["Content-Length"] = str(size)
     response["Content-Disposition"] = f'attachment; filename="{filename}"'
     return response
 
 
-def _build_summary_sheet(workbook: Workbook, coupons) -> None:
-    """Create the summary tab grouped by room."""
+def _iter_file(handle):
+    """Yield the file in blocks and close it once the client has read it."""
+
+    try:
+        while True:
+            block = handle.read(STREAM_BLOCK_SIZE)
+            if not block:
+                break
+            yield block
+    finally:
+        handle.close()
+
+
+def _new_workbook() -> Workbook:
+    """Return a write-only workbook with the report cell styles registered."""
+
+    workbook = Workbook(write_only=True)
+    header = NamedStyle(name="report_header")
+    header.fill = HEADER_FILL
+    header.font = HEADER_FONT
+    header.alignment = Alignment(horizontal="center", vertical="center")
+    header.border = TABLE_BORDER
+    row = NamedStyle(name="report_row")
+    row.alignment = Alignment(vertical="center")
+    row.border = TABLE_BORDER
+    alt_row = NamedStyle(name="report_row_alt")
+    alt_row.alignment = Alignment(vertical="center")
+    alt_row.border = TABLE_BORDER
+    alt_row.fill = ALT_ROW_FILL
+    for style in (header, row, alt_row):
+        workbook.add_named_style(style)
+    return workbook
 
-    sheet = workbook.active
-    sheet.title = "Summary"
-    sheet.append(["Sala", "Cupones", "Última emisión"])
-    _style_header_row(sheet)
 
-    summary = get_coupon_room_summary(coupons)
-    for index, item in enumerate(summary, start=2):
-        last_coupon = coupons.filter(room_id=item["room"].id).order_by("-scanned_at").first()
-        last_date = _format_datetime(last_coupon.scanned_at) if last_coupon else "-"
-        sheet.append([item["room"].name, item["total"], last_date])
-        _style_data_row(sheet, index)
+def _write_sheet(workbook: Workbook, title: str, headers, rows) -> None:
+    """Stream rows into a styled write-only sheet with a frozen header."""
 
-    _autosize_columns(sheet)
+    sheet = workbook.create_sheet(title)
+    rows = iter(rows)
+    sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+    widths = [len(str(header)) for header in headers]
+    for row in sample:
+        for index, value in enumerate(row):
+            widths[index] = max(widths[index], len(str(value)) if value is not None else 0)
+    for index, width in enumerate(widths, start=1):
+        sheet.column_dimensions[get_column_letter(index)].width = max(14, min(width + 2, 50))
     sheet.freeze_panes = "A2"
 
+    sheet.append([_styled_cell(sheet, header, "report_header") for header in headers])
+    for row_index, row in enumerate(chain(sample, rows), start=2):
+        style = "report_row_alt" if row_index % 2 == 0 else "report_row"
+        sheet.append([_styled_cell(sheet, value, style) for value in row])
+
+
+def _styled_cell(sheet, value, style: str) -> WriteOnlyCell:
+    cell = WriteOnlyCell(sheet, value=value)
+    cell.style = style
+    return cell
+
+
+def _iter_coupon_values(coupons, *ordering):
+    """Yield coupon rows as dictionaries, fetched from the database in chunks."""
+
+    queryset = coupons.order_by(*ordering) if ordering else coupons
+    values = queryset.values_list(*COUPON_EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for row in values:
+        yield dict(zip(COUPON_EXPORT_FIELDS, row))
+
+
+def _participant_name(row) -> str:
+    return f"{row['person__first_name']} {row['person__last_name']}".strip()
+
+
+SUMMARY_HEADERS = [
+    "Cupones",
+    "Participantes",
+    "Primera emisión",
+    "Última emisión",
+    *(label for _, label in Coupon.SOURCE_CHOICES),
+]
+
+
+def _summary_values(item) -> list:
+    return [
+        item["total"],
+        item["participants"],
+        _format_datetime(item["first_scanned_at"]) or "-",
+        _format_datetime(item["last_scanned_at"]) or "-",
+        *(item["by_source"][source] for source, _ in Coupon.SOURCE_CHOICES),
+    ]
+
+
+def _room_summary_rows(coupons):
+    for item in get_coupon_room_summary(coupons):
+        yield [item["room_name"], *_summary_values(item)]
+
+
+def _terminal_summary_rows(coupons):
+    for item in get_coupon_terminal_summary(coupons):
+        yield [item["room_name"], item["terminal_name"] or "-", *_summary_values(item)]
+
+
+def _build_summary_sheet(workbook: Workbook, coupons) -> None:
+    """Create the summary tabs grouped by room and by terminal."""
+
+    _write_sheet(workbook, "Summary", ["Sala", *SUMMARY_HEADERS], _room_summary_rows(coupons))
+    _write_sheet(
+        workbook,
+        "Por terminal",
+        ["Sala", "Terminal", *SUMMARY_HEADERS],
+        _terminal_summary_rows(coupons),
+    )
+
 
 def _build_detail_sheet(workbook: Workbook, coupons) -> None:
     """Create the detailed tab with each coupon row."""
 
-    sheet = workbook.create_sheet("Cupones")
     headers = [
         "Código",
         "Participante",
@@ -102,59 +221,21 @@ def _build_detail_sheet(workbook: Workbook, coupons) -> None:
         "Origen",
         "Fecha escaneo",
     ]
-    sheet.append(headers)
-    _style_header_row(sheet)
-
-    for index, coupon in enumerate(coupons, start=2):
-        sheet.append(
-            [
-                coupon.code,
-                f"{coupon.person.first_name} {coupon.person.last_name}".strip(),
-                coupon.person.id_number,
-                coupon.person.phone,
-                coupon.person.email,
-                RoomDirectory.get(coupon.room_id).name,
-                coupon.terminal_name,
-                coupon.get_source_display(),
-                _format_datetime(coupon.scanned_at),
-            ]
-        )
-        _style_data_row(sheet, index)
-
-    _autosize_columns(sheet)
-    sheet.freeze_panes = "A2"
-
-
-def _style_header_row(sheet) -> None:
-    """Apply brand styling to the header row."""
-
-    for cell in sheet[1]:
-        cell.fill = HEADER_FILL
-        cell.font = HEADER_FONT
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = TABLE_BORDER
-
-
-def _style_data_row(sheet, row_index: int) -> None:
-    """Add subtle styling to data rows for readability."""
-
-    for cell in sheet[row_index]:
-        cell.border = TABLE_BORDER
-        cell.alignment = Alignment(vertical="center")
-        if row_index % 2 == 0:
-            cell.fill = ALT_ROW_FILL
-
-
-def _autosize_columns(sheet) -> None:
-    """Resize columns based on their longest value."""
-
-    for column_cells in sheet.columns:
-        max_length = 0
-        column = get_column_letter(column_cells[0].column)
-        for cell in column_cells:
-            value = str(cell.value) if cell.value is not None else ""
-            max_length = max(max_length, len(value))
-        sheet.column_dimensions[column].width = max(14, min(max_length + 2, 50))
+    rows = (
+        [
+            row["code"],
+            _participant_name(row),
+            row["person__id_number"],
+            row["person__phone"],
+            row["person__email"],
+            RoomDirectory.get(row["room_id"]).name,
+            row["terminal_name"],
+            SOURCE_LABELS.get(row["source"], row["source"]),
+            _format_datetime(row["scanned_at"]),
+        ]
+        for row in _iter_coupon_values(coupons)
+    )
+    _write_sheet(workbook, "Cupones", headers, rows)
 
 
 def _format_datetime(value) -> str:
@@ -186,26 +267,12 @@ def _format_date(value) -> str:
 def _build_room_summary_sheet(workbook: Workbook, coupons) -> None:
     """Create the room summary tab with counts and last scanned date."""
 
-    sheet = workbook.active
-    sheet.title = "Por sala"
-    sheet.append(["Sala", "Cupones", "Última emisión"])
-    _style_header_row(sheet)
-
-    summary = get_coupon_room_summary(coupons)
-    for index, item in enumerate(summary, start=2):
-        last_coupon = coupons.filter(room_id=item["room"].id).order_by("-scanned_at").first()
-        last_date = _format_datetime(last_coupon.scanned_at) if last_coupon else "-"
-        sheet.append([item["room"].name, item["total"], last_date])
-        _style_data_row(sheet, index)
-
-    _autosize_columns(sheet)
-    sheet.freeze_panes = "A2"
+    _write_sheet(workbook, "Por sala", ["Sala", *SUMMARY_HEADERS], _room_summary_rows(coupons))
 
 
 def _build_room_detail_sheet(workbook: Workbook, coupons) -> None:
     """Create the detail tab sorted by room."""
 
-    sheet = workbook.create_sheet("Cupones por sala")
     headers = [
         "Sala",
         "Código",
@@ -217,55 +284,43 @@ def _build_room_detail_sheet(workbook: Workbook, coupons) -> None:
         "Origen",
         "Fecha escaneo",
     ]
-    sheet.append(headers)
-    _style_header_row(sheet)
-
-    for index, coupon in enumerate(coupons.order_by("room_id", "-scanned_at"), start=2):
-        sheet.append(
-            [
-                RoomDirectory.get(coupon.room_id).name,
-                coupon.code,
-                f"{coupon.person.first_name} {coupon.person.last_name}".strip(),
-                coupon.person.id_number,
-                coupon.person.phone,
-                coupon.person.email,
-                coupon.terminal_name,
-                coupon.get_source_display(),
-                _format_datetime(coupon.scanned_at),
-            ]
-        )
-        _style_data_row(sheet, index)
-
-    _autosize_columns(sheet)
-    sheet.freeze_panes = "A2"
+    rows = (
+        [
+            RoomDirectory.get(row["room_id"]).name,
+            row["code"],
+            _participant_name(row),
+            row["person__id_number"],
+            row["person__phone"],
+            row["person__email"],
+            row["terminal_name"],
+            SOURCE_LABELS.get(row["source"], row["source"]),
+            _format_datetime(row["scanned_at"]),
+        ]
+        for row in _iter_coupon_values(coupons, "room_id", "-scanned_at")
+    )
+    _write_sheet(workbook, "Cupones por sala", headers, rows)
 
 
 def _build_daily_summary_sheet(workbook: Workbook, coupons) -> None:
     """Create the daily summary tab with totals per day."""
 
-    sheet = workbook.active
-    sheet.title = "Por día"
-    sheet.append(["Fecha", "Cupones"])
-    _style_header_row(sheet)
-
+    # Grouped on the exported queryset so the days match its archive scope
+    # and search filters, which the hourly rollups cannot express.
     daily_totals = (
-        coupons.annotate(day=TruncDate("scanned_at"))
-        .values("day")
+        coupons.values(day=F("scanned_date"))
         .annotate(total=Count("id"))
         .order_by("day")
     )
-    for index, item in enumerate(daily_totals, start=2):
-        sheet.append([item["day"].strftime("%d/%m/%Y") if item["day"] else "-", item["total"]])
-        _style_data_row(sheet, index)
-
-    _autosize_columns(sheet)
-    sheet.freeze_panes = "A2"
+    rows = (
+        [item["day"].strftime("%d/%m/%Y") if item["day"] else "-", item["total"]]
+        for item in daily_totals
+    )
+    _write_sheet(workbook, "Por día", ["Fecha", "Cupones"], rows)
 
 
 def _build_daily_detail_sheet(workbook: Workbook, coupons) -> None:
     """Create the detail tab sorted by day."""
 
-    sheet = workbook.create_sheet("Cupones por día")
     headers = [
         "Fecha",
         "Código",
@@ -278,25 +333,19 @@ def _build_daily_detail_sheet(workbook: Workbook, coupons) -> None:
         "Origen",
         "Hora",
     ]
-    sheet.append(headers)
-    _style_header_row(sheet)
-
-    for index, coupon in enumerate(coupons.order_by("scanned_at"), start=2):
-        sheet.append(
-            [
-                _format_date(coupon.scanned_at),
-                coupon.code,
-                f"{coupon.person.first_name} {coupon.person.last_name}".strip(),
-                coupon.person.id_number,
-                coupon.person.phone,
-                coupon.person.email,
-                RoomDirectory.get(coupon.room_id).name,
-                coupon.terminal_name,
-                coupon.get_source_display(),
-                _format_datetime(coupon.scanned_at),
-            ]
-        )
-        _style_data_row(sheet, index)
-
-    _autosize_columns(sheet)
-    sheet.freeze_panes = "A2"
+    rows = (
+        [
+            _format_date(row["scanned_at"]),
+            row["code"],
+            _participant_name(row),
+            row["person__id_number"],
+            row["person__phone"],
+            row["person__email"],
+            RoomDirectory.get(row["room_id"]).name,
+            row["terminal_name"],
+            SOURCE_LABELS.get(row["source"], row["source"]),
+            _format_datetime(row["scanned_at"]),
+        ]
+        for row in _iter_coupon_values(coupons, "scanned_at")
+    )
+    _write_sheet(workbook, "Cupones por día", headers, rows)
@@ -0,0 +1,230 @@
+"""Hourly coupon and voucher counters kept in step with the detail tables.
+
+Dashboards read these buckets instead of grouping the full ``Coupon`` and
+``VoucherScan`` tables, so their cost follows the number of buckets rather
+than the number of rows. Writers update the buckets in the same transaction
+as the rows they add or remove; ``rebuild_rollups`` recomputes everything,
+archived draws included, so totals keep the whole raffle's history.
+
+Because of that, views scoped to the live or to one archived draw, or
+filtered on anything outside the bucket key (printed state, participant or
+code search, distinct participants, first and last emission), still
+aggregate the detail tables through their indexes.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterable
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, QuerySet, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from ..models import ArchivedCoupon, ArchivedVoucherScan, Coupon, CouponRollup, VoucherScan
+from ..rooms import Room, RoomDirectory
+from .terminals import touch_terminals
+
+REBUILD_BATCH_SIZE = 1000
+KIND_MODELS = {
+    CouponRollup.Kind.COUPON: (Coupon, ArchivedCoupon),
+    CouponRollup.Kind.VOUCHER: (VoucherScan, ArchivedVoucherScan),
+}
+
+_state = threading.local()
+
+
+def hour_bucket(value):
+    """Truncate a timestamp to the start of its local hour."""
+
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _bucket_key(row) -> tuple:
+    return (
+        row.room_id,
+        row.terminal_name or "",
+        row.source,
+        getattr(row, "created_by_id", None) or 0,
+        hour_bucket(row.scanned_at),
+    )
+
+
+def _apply(kind: str, rows: Iterable, sign: int) -> None:
+    if getattr(_state, "paused", False):
+        return
+    deltas = Counter(_bucket_key(row) for row in rows)
+    for (room_id, terminal_name, source, user_id, hour), count in deltas.items():
+        bucket = CouponRollup.objects.filter(
+            kind=kind,
+            room_id=room_id,
+            terminal_name=terminal_name,
+            source=source,
+            user_id=user_id,
+            hour=hour,
+        )
+        if bucket.update(total=F("total") + sign * count) or sign < 0:
+            continue
+        try:
+            with transaction.atomic():
+                CouponRollup.objects.create(
+                    kind=kind,
+                    room_id=room_id,
+                    terminal_name=terminal_name,
+                    source=source,
+                    user_id=user_id,
+                    hour=hour,
+                    total=count,
+                )
+        except IntegrityError:
+            # A concurrent writer created the bucket first; add to theirs.
+            bucket.update(total=F("total") + count)
+
+
+def record_coupons(coupons: Iterable[Coupon]) -> None:
+    """Count newly created coupons and register their terminals."""
+
+    coupons = list(coupons)
+    _apply(CouponRollup.Kind.COUPON, coupons, 1)
+    touch_terminals(coupons)
+
+
+def forget_coupons(coupons: Iterable[Coupon]) -> None:
+    _apply(CouponRollup.Kind.COUPON, coupons, -1)
+
+
+def record_voucher_scans(scans: Iterable[VoucherScan]) -> None:
+    scans = list(scans)
+    _apply(CouponRollup.Kind.VOUCHER, scans, 1)
+    touch_terminals(scans)
+
+
+def forget_voucher_scans(scans: Iterable[VoucherScan]) -> None:
+    _apply(CouponRollup.Kind.VOUCHER, scans, -1)
+
+
+@contextmanager
+def rollups_paused():
+    """Skip per-row bucket updates for a bulk change, then rebuild once."""
+
+    _state.paused = True
+    try:
+        yield
+    finally:
+        _state.paused = False
+    rebuild_rollups()
+
+
+def rebuild_rollups() -> int:
+    """Recompute every bucket from the detail tables and return how many exist."""
+
+    created = 0
+    with transaction.atomic():
+        CouponRollup.objects.all().delete()
+        for kind, models in KIND_MODELS.items():
+            # Live and archived rows of the same hour share one bucket.
+            totals = Counter()
+            for model in models:
+                user_field = "created_by_id" if kind == CouponRollup.Kind.COUPON else None
+                fields = ["room_id", "terminal_name", "source", *filter(None, [user_field])]
+                rows = (
+                    model.objects.annotate(bucket=TruncHour("scanned_at"))
+                    .values(*fields, "bucket")
+                    .annotate(count=Count("id"))
+                    .order_by()
+                )
+                for row in rows.iterator(chunk_size=REBUILD_BATCH_SIZE):
+                    key = (
+                        row["room_id"],
+                        row["terminal_name"] or "",
+                        row["source"],
+                        (row.get(user_field) if user_field else None) or 0,
+                        row["bucket"],
+                    )
+                    totals[key] += row["count"]
+
+            batch = []
+            for (room_id, terminal_name, source, user_id, hour), total in totals.items():
+                batch.append(
+                    CouponRollup(
+                        kind=kind,
+                        room_id=room_id,
+                        terminal_name=terminal_name,
+                        source=source,
+                        user_id=user_id,
+                        hour=hour,
+                        total=total,
+                    )
+                )
+                if len(batch) >= REBUILD_BATCH_SIZE:
+                    CouponRollup.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+            CouponRollup.objects.bulk_create(batch)
+            created += len(batch)
+    return created
+
+
+def filter_rollups(
+    kind: str,
+    room_id: int | None = None,
+    terminal_name: str = "",
+    source: str | None = None,
+    start=None,
+    end=None,
+) -> QuerySet:
+    """Buckets of one kind matching the dashboard filters."""
+
+    rollups = CouponRollup.objects.filter(kind=kind)
+    if room_id:
+        rollups = rollups.filter(room_id=room_id)
+    if terminal_name:
+        rollups = rollups.filter(terminal_name=terminal_name)
+    if source:
+        rollups = rollups.filter(source=source)
+    if start is not None:
+        rollups = rollups.filter(hour__gte=hour_bucket(start))
+    if end is not None:
+        rollups = rollups.filter(hour__lte=end)
+    return rollups
+
+
+def rollup_total(rollups: QuerySet) -> int:
+    return rollups.aggregate(value=Sum("total"))["value"] or 0
+
+
+def rollup_room_summary(rollups: QuerySet) -> list[dict]:
+    """Per-room totals shaped like ``get_coupon_room_summary`` entries."""
+
+    rooms = {room.id: room for room in RoomDirectory.all()}
+    rows = (
+        rollups.values("room_id")
+        .annotate(count=Sum("total"))
+        .filter(count__gt=0)
+        .order_by("room_id")
+    )
+    summary = []
+    for item in rows:
+        room = rooms.get(item["room_id"]) or Room(id=item["room_id"], name=str(item["room_id"]))
+        summary.append(
+            {"room": room, "room_id": room.id, "room_name": room.name, "total": item["count"]}
+        )
+    return summary
+
+
+def rollup_user_totals(rollups: QuerySet) -> list[tuple[int, int]]:
+    """(user id, total) pairs for buckets created by a user, largest first."""
+
+    rows = (
+        rollups.exclude(user_id=0)
+        .values("user_id")
+        .annotate(count=Sum("total"))
+        .filter(count__gt=0)
+        .order_by("-count", "user_id")
+    )
+    return [(row["user_id"], row["count"]) for row in rows]
@@ -0,0 +1,141 @@
+"""Trigram index behind the participant and coupon code searches.
+
+Each participant's folded name/DNI and phone/email keys, and the codes of
+their coupons, are split into three-character grams stored in
+``PersonSearchGram``. A search first narrows to the people holding every gram
+of the query through the ``(kind, gram, person)`` index, then checks the
+folded key itself, so it never scans the coupon or participant tables.
+Queries shorter than a gram fall back to a substring match on ``Person``.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Count, Q, QuerySet
+
+from ..models import ArchivedCoupon, Coupon, Person, PersonSearchGram
+from ..utils.search import GRAM_SIZE, fold_search_text, trigrams
+
+REBUILD_BATCH_SIZE = 1000
+SEARCH_KEY_FIELDS = {"search_name", "search_contact"}
+# Archived draws stay searchable through the archive filter.
+CODE_MODELS = (Coupon, ArchivedCoupon)
+Kind = PersonSearchGram.Kind
+
+
+def _grams(person_id: int, kind: str, text: str) -> list[PersonSearchGram]:
+    return [PersonSearchGram(person_id=person_id, kind=kind, gram=gram) for gram in trigrams(text)]
+
+
+def index_people(people: Iterable[Person]) -> None:
+    """Replace the name and contact grams of the given participants."""
+
+    people = list(people)
+    if not people:
+        return
+    PersonSearchGram.objects.filter(
+        person__in=[person.pk for person in people], kind__in=(Kind.NAME, Kind.CONTACT)
+    ).delete()
+    grams = []
+    for person in people:
+        grams += _grams(person.pk, Kind.NAME, person.search_name)
+        grams += _grams(person.pk, Kind.CONTACT, person.search_contact)
+    PersonSearchGram.objects.bulk_create(grams, batch_size=REBUILD_BATCH_SIZE)
+
+
+def index_coupon_codes(coupons: Iterable[Coupon]) -> None:
+    """Add the grams of new coupon codes to their participants."""
+
+    # Sequential codes share most of their grams, within a batch and with the
+    # participant's earlier coupons, so duplicates are dropped here and in SQL.
+    keys = {
+        (coupon.person_id, gram)
+        for coupon in coupons
+        for gram in trigrams(fold_search_text(coupon.code))
+    }
+    PersonSearchGram.objects.bulk_create(
+        [PersonSearchGram(person_id=person_id, kind=Kind.CODE, gram=gram) for person_id, gram in keys],
+        batch_size=REBUILD_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def rebuild_search_index() -> int:
+    """Recompute every participant's keys and grams; return how many were indexed."""
+
+    indexed = 0
+    with transaction.atomic():
+        PersonSearchGram.objects.all().delete()
+        batch = []
+        for person in Person.objects.order_by("pk").iterator(chunk_size=REBUILD_BATCH_SIZE):
+            batch.append(person)
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                indexed += _reindex_batch(batch)
+                batch = []
+        indexed += _reindex_batch(batch)
+
+        grams = []
+        for model in CODE_MODELS:
+            coupons = model.objects.values_list("person_id", "code").order_by()
+            for person_id, code in coupons.iterator(chunk_size=REBUILD_BATCH_SIZE):
+                grams += _grams(person_id, Kind.CODE, fold_search_text(code))
+                if len(grams) >= REBUILD_BATCH_SIZE:
+                    PersonSearchGram.objects.bulk_create(grams, ignore_conflicts=True)
+                    grams = []
+        PersonSearchGram.objects.bulk_create(grams, ignore_conflicts=True)
+    return indexed
+
+
+def _reindex_batch(people: list[Person]) -> int:
+    # bulk_update skips pre_save, so derive the folded keys first.
+    for person in people:
+        for field in SEARCH_KEY_FIELDS:
+            Person._meta.get_field(field).pre_save(person, False)
+    Person.objects.bulk_update(people, sorted(SEARCH_KEY_FIELDS))
+    index_people(people)
+    return len(people)
+
+
+def _people_with_grams(kind: str, folded: str) -> QuerySet:
+    grams = trigrams(folded)
+    return (
+        PersonSearchGram.objects.filter(kind=kind, gram__in=grams)
+        .values("person_id")
+        .annotate(hits=Count("gram"))
+        .filter(hits=len(grams))
+        .values("person_id")
+    )
+
+
+def _people_matching(kind: str, key_field: str, folded: str) -> QuerySet:
+    people = Person.objects.filter(**{f"{key_field}__contains": folded})
+    if len(folded) >= GRAM_SIZE:
+        people = people.filter(pk__in=_people_with_grams(kind, folded))
+    return people.values("pk")
+
+
+def participant_search_q(query: str, prefix: str = "") -> Q:
+    """Match a participant's first name, last name or DNI."""
+
+    folded = fold_search_text(query)
+    return Q(**{f"{prefix}person__in": _people_matching(Kind.NAME, "search_name", folded)})
+
+
+def coupon_search_q(query: str, prefix: str = "", indexed_codes: bool = True) -> Q:
+    """Match a coupon code or its participant's phone or email.
+
+    Pass ``indexed_codes=False`` for voucher scans: their codes are not in the
+    gram index, so they are only compared directly.
+    """
+
+    folded = fold_search_text(query)
+    contact = Q(
+        **{f"{prefix}person__in": _people_matching(Kind.CONTACT, "search_contact", folded)}
+    )
+    code = Q(**{f"{prefix}code__icontains": query})
+    if indexed_codes and len(folded) >= GRAM_SIZE:
+        # Only coupons of people holding every gram of the query are compared.
+        code &= Q(**{f"{prefix}person__in": _people_with_grams(Kind.CODE, folded)})
+    return contact | code
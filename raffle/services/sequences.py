@@ -0,0 +1,162 @@
+"""Leased number ranges for coupon sequences.
+
+Each process leases a block of numbers from ``CouponSequence`` with a single
+atomic update and hands them out from memory. Unused numbers are returned on
+a clean shutdown when nobody leased after us; after a crash they simply stay
+as gaps, so codes remain unique.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import F
+
+from ..models import CouponSequence
+
+
+COUPON_SEQUENCE_BLOCK_SIZE = max(1, int(os.getenv("COUPON_SEQUENCE_BLOCK_SIZE", "50")))
+
+
+@dataclass
+class CouponNumberLease:
+    """Range of sequence numbers reserved by this process."""
+
+    next_number: int
+    last_number: int
+    # Value of the sequence row before this lease bumped it.
+    previous_number: int = 0
+    # Row the numbers came from, so a release never rewinds another row.
+    sequence_id: int | None = None
+    connection: Any = field(default=None, repr=False)
+    confirmed: bool = False
+
+    @property
+    def remaining(self) -> int:
+        return self.last_number - self.next_number + 1
+
+    def confirm(self) -> None:
+        self.confirmed = True
+
+    def take(self, count: int) -> List[int]:
+        count = min(count, self.remaining)
+        numbers = list(range(self.next_number, self.next_number + count))
+        self.next_number += count
+        return numbers
+
+
+_LEASES: Dict[Tuple[int, str], CouponNumberLease] = {}
+_LOCK = threading.Lock()
+
+
+def _lease_is_live(lease: CouponNumberLease) -> bool:
+    # A lease taken inside a transaction is only trustworthy once committed
+    # (``confirm`` runs on commit). Until then only the connection that took
+    # it may draw from it, inside that same transaction.
+    if lease.confirmed:
+        return True
+    current = transaction.get_connection()
+    if current is not lease.connection or not current.in_atomic_block:
+        return False
+    # A rolled back savepoint may have undone the bump. Re-assert it: a no-op
+    # while it stands, a fresh reservation if it was undone. The transaction
+    # keeps the row locked, so nobody else moved it in between.
+    reasserted = CouponSequence.objects.filter(
+        pk=lease.sequence_id, last_number__in=(lease.previous_number, lease.last_number)
+    ).update(last_number=lease.last_number)
+    if reasserted:
+        transaction.on_commit(lease.confirm)
+    return bool(reasserted)
+
+
+def _acquire_lease(room_id: int, terminal_name: str, size: int) -> CouponNumberLease:
+    """Reserve ``size`` numbers with one atomic bump of the sequence row."""
+
+    sequence = CouponSequence.objects.filter(room_id=room_id, terminal_name=terminal_name)
+    with transaction.atomic():
+        if not sequence.update(last_number=F("last_number") + size):
+            try:
+                with transaction.atomic():
+                    CouponSequence.objects.create(
+                        room_id=room_id, terminal_name=terminal_name, last_number=size
+                    )
+            except IntegrityError:
+                sequence.update(last_number=F("last_number") + size)
+        last_number, sequence_id = sequence.values_list("last_number", "pk").get()
+        lease = CouponNumberLease(
+            next_number=last_number - size + 1,
+            last_number=last_number,
+            previous_number=last_number - size,
+            sequence_id=sequence_id,
+            connection=transaction.get_connection(),
+        )
+        transaction.on_commit(lease.confirm)
+    return lease
+
+
+def allocate_coupon_numbers(
+    room_id: int,
+    terminal_name: str,
+    count: int = 1,
+    block_size: int | None = None,
+) -> List[int]:
+    """Return ``count`` unused sequence numbers for the room and terminal."""
+
+    block_size = max(1, block_size or COUPON_SEQUENCE_BLOCK_SIZE)
+    key = (room_id, terminal_name)
+    numbers: List[int] = []
+    while len(numbers) < count:
+        with _LOCK:
+            lease = _LEASES.get(key)
+            if lease is not None and lease.remaining > 0 and _lease_is_live(lease):
+                numbers.extend(lease.take(count - len(numbers)))
+                continue
+        # Lease outside the process lock: the sequence row lock may block
+        # until another thread's transaction commits.
+        lease = _acquire_lease(room_id, terminal_name, max(block_size, count - len(numbers)))
+        # The new lease covers the rest; draw before publishing it.
+        numbers.extend(lease.take(count - len(numbers)))
+        with _LOCK:
+            _LEASES[key] = lease
+    return numbers
+
+
+def release_coupon_leases() -> int:
+    """Give unused numbers back to the sequences; return how many were released."""
+
+    with _LOCK:
+        leases = list(_LEASES.items())
+        _LEASES.clear()
+
+    released = 0
+    for (room_id, terminal_name), lease in leases:
+        if not lease.confirmed or lease.remaining <= 0:
+            continue
+        # Compare-and-swap: only rewind if nobody leased after this process.
+        try:
+            rewound = CouponSequence.objects.filter(
+                pk=lease.sequence_id,
+                room_id=room_id,
+                terminal_name=terminal_name,
+                last_number=lease.last_number,
+            ).update(last_number=lease.next_number - 1)
+        except DatabaseError:
+            continue
+        if rewound:
+            released += lease.remaining
+    return released
+
+
+def reset_coupon_leases() -> None:
+    """Forget in-memory leases without touching the database."""
+
+    with _LOCK:
+        _LEASES.clear()
+
+
+atexit.register(release_coupon_leases)
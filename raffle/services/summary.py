@@ -1,15 +1,60 @@
-from django.db.models import Count, QuerySet
+from django.db.models import Count, Max, Min, Q, QuerySet
 
 from ..models import Coupon
-from ..rooms import RoomDirectory
+from ..rooms import Room, RoomDirectory
 
 
-def get_coupon_room_summary(queryset: QuerySet | None = None):
-    """Build a list with coupon quantities per room."""
+def _summary_aggregates() -> dict:
+    """Aggregates shared by the room and terminal summaries."""
+
+    aggregates = {
+        "total": Count("id"),
+        "first_scanned_at": Min("scanned_at"),
+        "last_scanned_at": Max("scanned_at"),
+        "participants": Count("person_id", distinct=True),
+    }
+    for source, _ in Coupon.SOURCE_CHOICES:
+        aggregates[f"source_{source}"] = Count("id", filter=Q(source=source))
+    return aggregates
+
+
+def _summarize(queryset: QuerySet | None, group_by: tuple[str, ...]) -> list[dict]:
+    """Run one grouped aggregate query and shape each row for the templates."""
+
+    # Avoid `queryset or ...`: truth-testing a queryset loads every row.
+    coupon_qs = queryset if queryset is not None else Coupon.objects.all()
+    rooms = {room.id: room for room in RoomDirectory.all()}
+    rows = coupon_qs.values(*group_by).annotate(**_summary_aggregates()).order_by(*group_by)
 
-    coupon_qs = queryset or Coupon.objects.all()
     summary = []
-    for item in coupon_qs.values("room_id").annotate(total=Count("id")).order_by("room_id"):
-        room = RoomDirectory.get(item["room_id"])
-        summary.append({"room": room, "total": item["total"]})
+    for item in rows:
+        room_id = item["room_id"]
+        room = rooms.get(room_id) or Room(id=room_id, name=str(room_id))
+        entry = {
+            "room": room,
+            "room_id": room_id,
+            "room_name": room.name,
+            "total": item["total"],
+            "first_scanned_at": item["first_scanned_at"],
+            "last_scanned_at": item["last_scanned_at"],
+            "participants": item["participants"],
+            "by_source": {
+                source: item[f"source_{source}"] for source, _ in Coupon.SOURCE_CHOICES
+            },
+        }
+        if "terminal_name" in group_by:
+            entry["terminal_name"] = item["terminal_name"]
+        summary.append(entry)
     return summary
+
+
+def get_coupon_room_summary(queryset: QuerySet | None = None):
+    """Per-room totals, first/last emission, participants and sources in one query."""
+
+    return _summarize(queryset, ("room_id",))
+
+
+def get_coupon_terminal_summary(queryset: QuerySet | None = None):
+    """The room summary broken down by terminal, also in a single query."""
+
+    return _summarize(queryset, ("room_id", "terminal_name"))
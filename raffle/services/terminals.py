@@ -0,0 +1,77 @@
+"""Registry of terminals that have issued coupons or burned vouchers."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Iterable
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Value, When
+
+from ..models import Terminal
+
+# A terminal's last activity is refreshed at most this often (seconds) per
+# process, so steady traffic does not turn into a registry write per coupon.
+TERMINAL_TOUCH_INTERVAL = float(os.getenv("TERMINAL_TOUCH_INTERVAL", "300"))
+
+# terminal name -> monotonic time of the last committed registry write.
+_touched: dict[str, float] = {}
+_lock = threading.Lock()
+
+
+def _mark_touched(names: Iterable[str]) -> None:
+    now = time.monotonic()
+    with _lock:
+        for name in names:
+            _touched[name] = now
+
+
+def touch_terminals(rows: Iterable) -> None:
+    """Register the terminals of new coupons or scans and extend their activity."""
+
+    latest = {}
+    for row in rows:
+        name = row.terminal_name
+        if name and (name not in latest or row.scanned_at > latest[name]):
+            latest[name] = row.scanned_at
+
+    now = time.monotonic()
+    written = []
+    for name, seen_at in latest.items():
+        touched_at = _touched.get(name)
+        if touched_at is not None and now - touched_at < TERMINAL_TOUCH_INTERVAL:
+            continue
+        updated = Terminal.objects.filter(name=name).update(
+            last_seen_at=Case(
+                When(last_seen_at__lt=seen_at, then=Value(seen_at)),
+                default=F("last_seen_at"),
+            )
+        )
+        if not updated:
+            try:
+                with transaction.atomic():
+                    Terminal.objects.create(name=name, first_seen_at=seen_at, last_seen_at=seen_at)
+            except IntegrityError:
+                # Registered concurrently by another process; nothing left to do.
+                pass
+        written.append(name)
+
+    if written:
+        # Only trust the cache once the registry write is committed.
+        transaction.on_commit(lambda: _mark_touched(written))
+
+
+def forget_touched_terminals() -> None:
+    """Drop the per-process touch times, e.g. after the registry was purged."""
+
+    with _lock:
+        _touched.clear()
+
+
+def terminal_names() -> list[str]:
+    """Names of every registered terminal, for the filter dropdowns."""
+
+    return list(Terminal.objects.order_by("name").values_list("name", flat=True))
+
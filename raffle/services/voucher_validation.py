@@ -3,12 +3,18 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
 from dataclasses import dataclass
-from urllib import error, request
+from http import client
+
+from django.core import signing
 
 from ..rooms import RoomDirectory
 from ..utils.terminal import get_terminal_ip
+from .http_pool import HTTPConnectionPool, RequestTimings
+
+LOGGER = logging.getLogger(__name__)
 
 
 @dataclass
@@ -17,11 +23,21 @@ class VoucherValidationResult:
 
     is_valid: bool
     message: str
+    timings: RequestTimings | None = None
 
 
 VALIDATION_ENABLED = os.getenv("VOUCHER_VALIDATION_ENABLED", "1") == "1"
 VALIDATION_TIMEOUT = float(os.getenv("VOUCHER_VALIDATION_TIMEOUT", "5"))
 VALIDATION_ACTION = os.getenv("VOUCHER_VALIDATION_ACTION", "getTicket")
+VALIDATION_PATH = "/api_app.php"
+VALIDATION_TOKEN_MAX_AGE = int(os.getenv("VOUCHER_VALIDATION_TOKEN_MAX_AGE", "120"))
+VALIDATION_TOKEN_SALT = "raffle.voucher_validation"
+
+# Shared by every request and thread so room endpoints see persistent connections.
+ROOM_API_POOL = HTTPConnectionPool(
+    timeout=VALIDATION_TIMEOUT,
+    idle_timeout=float(os.getenv("VOUCHER_VALIDATION_IDLE_TIMEOUT", "30")),
+)
 
 
 def validate_voucher_code(code: str, room_id: int, room_ip: str | None = None) -> VoucherValidationResult:
@@ -34,21 +50,43 @@ def validate_voucher_code(code: str, room_id: int, room_ip: str | None = None) -
     if not selected_ip:
         return VoucherValidationResult(True, "Sala sin endpoint configurado.")
 
-    url = f"http://{selected_ip}/api_app.php"
     payload = json.dumps({"strAction": VALIDATION_ACTION, "validCode": code}).encode("utf-8")
     headers = {"Content-Type": "application/json"}
-    request_obj = request.Request(url, data=payload, headers=headers, method="POST")
 
     try:
-        with request.urlopen(request_obj, timeout=VALIDATION_TIMEOUT) as response:
-            body = response.read().decode("utf-8")
-        data = json.loads(body)
-    except (error.URLError, json.JSONDecodeError, ValueError):
+        response = ROOM_API_POOL.request(
+            selected_ip, "POST", VALIDATION_PATH, body=payload, headers=headers
+        )
+        if response.status >= 400:
+            raise ValueError(f"HTTP {response.status}")
+        data = json.loads(response.body.decode("utf-8"))
+    except (OSError, client.HTTPException, json.JSONDecodeError, ValueError):
         return VoucherValidationResult(False, "Tiempo de espera de la API excedido.")
 
+    LOGGER.debug("Voucher validation on %s: %s", selected_ip, response.timings.as_milliseconds())
     is_valid = not bool(data.get("error"))
     message = (
         data.get("message")
         or ("Cupón Generado Correctamente" if is_valid else "Cupón No Pertenece a la Sala")
     )
-    return VoucherValidationResult(is_valid, message)
+    return VoucherValidationResult(is_valid, message, response.timings)
+
+
+def issue_validation_token(code: str, room_id: int, terminal_name: str) -> str:
+    """Return a short-lived signed token proving the voucher was validated."""
+
+    return signing.dumps(
+        {"code": code, "room": room_id, "terminal": terminal_name}, salt=VALIDATION_TOKEN_SALT
+    )
+
+
+def verify_validation_token(token: str, code: str, room_id: int, terminal_name: str) -> bool:
+    """Check the token is authentic, unexpired and bound to the same voucher context."""
+
+    if not token:
+        return False
+    try:
+        payload = signing.loads(token, salt=VALIDATION_TOKEN_SALT, max_age=VALIDATION_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return payload == {"code": code, "room": room_id, "terminal": terminal_name}
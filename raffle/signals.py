@@ -0,0 +1,115 @@
+"""Signal handlers that keep caches and rollups in sync with the database."""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import (
+    Coupon,
+    CouponReprintLog,
+    ExportDataVersion,
+    Person,
+    Room,
+    SystemSettings,
+    VoucherScan,
+)
+from .rooms import RoomDirectory
+from .services.dashboard import invalidate_dashboard_snapshots
+from .services.pagination import invalidate_list_totals
+from .services.rollups import (
+    forget_coupons,
+    forget_voucher_scans,
+    record_coupons,
+    record_voucher_scans,
+)
+from .services.participants import forget_participant
+from .services.search import SEARCH_KEY_FIELDS, index_coupon_codes, index_people
+from utils.printers import invalidate_coupon_template
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def invalidate_room_directory(sender, **kwargs):
+    # Drop the cached catalog now and again once the write is committed, so a
+    # reload racing the open transaction cannot keep serving old rows.
+    RoomDirectory.invalidate()
+    transaction.on_commit(RoomDirectory.invalidate)
+
+
+@receiver(post_save, sender=SystemSettings)
+@receiver(post_delete, sender=SystemSettings)
+def invalidate_coupon_template_cache(sender, **kwargs):
+    # The compiled coupon header and legend come from SystemSettings.
+    invalidate_coupon_template()
+    transaction.on_commit(invalidate_coupon_template)
+
+
+@receiver(post_save, sender=Person)
+def index_person(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Saves that leave the folded keys alone cannot change the grams.
+    if raw or (update_fields is not None and not SEARCH_KEY_FIELDS & set(update_fields)):
+        return
+    index_people([instance])
+
+
+@receiver(post_save, sender=Person)
+@receiver(post_delete, sender=Person)
+def forget_cached_participant(sender, instance, **kwargs):
+    forget_participant(instance)
+    transaction.on_commit(lambda: forget_participant(instance))
+
+
+@receiver(post_save, sender=Coupon)
+def count_coupon(sender, instance, created, raw=False, **kwargs):
+    # Single inserts only; bulk_create callers record their batch themselves.
+    if created and not raw:
+        record_coupons([instance])
+
+
+@receiver(post_save, sender=Coupon)
+def index_coupon_code(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        index_coupon_codes([instance])
+
+
+@receiver(post_delete, sender=Coupon)
+def uncount_coupon(sender, instance, **kwargs):
+    forget_coupons([instance])
+
+
+@receiver(post_save, sender=VoucherScan)
+def count_voucher_scan(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        record_voucher_scans([instance])
+
+
+@receiver(post_delete, sender=VoucherScan)
+def uncount_voucher_scan(sender, instance, **kwargs):
+    forget_voucher_scans([instance])
+
+
+@receiver(post_save, sender=Coupon)
+@receiver(post_delete, sender=Coupon)
+@receiver(post_save, sender=VoucherScan)
+@receiver(post_delete, sender=VoucherScan)
+@receiver(post_save, sender=CouponReprintLog)
+@receiver(post_delete, sender=CouponReprintLog)
+def invalidate_coupon_aggregates(sender, **kwargs):
+    for invalidate in (invalidate_dashboard_snapshots, invalidate_list_totals):
+        invalidate()
+        transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=Coupon)
+@receiver(post_delete, sender=Coupon)
+@receiver(post_save, sender=VoucherScan)
+@receiver(post_delete, sender=VoucherScan)
+@receiver(post_save, sender=CouponReprintLog)
+@receiver(post_delete, sender=CouponReprintLog)
+@receiver(post_save, sender=Person)
+@receiver(post_delete, sender=Person)
+def bump_export_data_version(sender, created=False, raw=False, **kwargs):
+    # Inserts already move the export row counts; edits and deletes bump the
+    # counter so a cached export with the old values is not reused.
+    if not created and not raw:
+        ExportDataVersion.bump()
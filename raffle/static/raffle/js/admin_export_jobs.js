@@ -0,0 +1,50 @@
+(function () {
+    const POLL_INTERVAL = 3000;
+
+    document.addEventListener('DOMContentLoaded', () => {
+        const table = document.querySelector('[data-export-jobs]');
+        if (!table) { return; }
+        const statusUrl = table.dataset.statusUrl;
+
+        const poll = () => {
+            const activeRows = table.querySelectorAll('[data-export-active]');
+            if (!activeRows.length) { return; }
+            const query = Array.from(activeRows)
+                .map(row => `id=${encodeURIComponent(row.dataset.exportJob)}`)
+                .join('&');
+            fetch(`${statusUrl}?${query}`, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+                .then(response => response.json())
+                .then(data => {
+                    (data.jobs || []).forEach(updateRow);
+                })
+                .catch(() => {})
+                .finally(() => {
+                    window.setTimeout(poll, POLL_INTERVAL);
+                });
+        };
+
+        const updateRow = job => {
+            const row = table.querySelector(`[data-export-job="${job.id}"]`);
+            if (!row) { return; }
+            const status = row.querySelector('[data-export-status]');
+            const progress = row.querySelector('[data-export-progress]');
+            const download = row.querySelector('[data-export-download]');
+            status.textContent = job.error ? `${job.status_label}: ${job.error}` : job.status_label;
+            progress.textContent = job.total_rows
+                ? `${job.progress}% · ${job.rows_written}/${job.total_rows}`
+                : `${job.progress}%`;
+            if (job.status !== 'pending' && job.status !== 'running') {
+                row.removeAttribute('data-export-active');
+            }
+            if (job.download_url && !download.querySelector('a')) {
+                const link = document.createElement('a');
+                link.className = 'admin-button admin-button--ghost';
+                link.href = job.download_url;
+                link.textContent = 'Descargar';
+                download.appendChild(link);
+            }
+        };
+
+        window.setTimeout(poll, POLL_INTERVAL);
+    });
+})();
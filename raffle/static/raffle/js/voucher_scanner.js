@@ -21,6 +21,7 @@
         const trigger = form.querySelector("[data-scan-trigger]");
         const captureInput = form.querySelector("[data-scan-capture]");
         const hiddenInput = form.querySelector('input[name="voucher_code"]');
+        const tokenInput = form.querySelector('input[name="validation_token"]');
         const status = form.querySelector("[data-scan-status]");
         const idInput = form.querySelector('input[name="id_number"]');
         const registerUrl = form.dataset.registerUrl;
@@ -55,6 +56,7 @@
             buffer = "";
             captureInput.value = "";
             hiddenInput.value = "";
+            if (tokenInput) tokenInput.value = "";
         };
 
         const finishScan = () => {
@@ -85,6 +87,8 @@
                         validation.message || STATUS.confirm,
                         "success"
                     );
+                    // Let the entry POST skip a second round trip to the room API.
+                    if (tokenInput) tokenInput.value = validation.token || "";
                     trigger.disabled = false;
                     form.submit();
                 })
@@ -121,6 +125,7 @@
                 return {
                     valid: Boolean(data?.valid),
                     message: data?.message || STATUS.confirm,
+                    token: data?.token || "",
                 };
             } catch (err) {
                 return { valid: false, message: STATUS.invalidVoucher };
@@ -0,0 +1,201 @@
+from datetime import date, datetime, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import (
+    ArchivedCoupon,
+    ArchivedReprintLog,
+    ArchivedVoucherScan,
+    Coupon,
+    CouponArchive,
+    CouponReprint,
+    CouponReprintLog,
+    CouponRollup,
+    EntryRateState,
+    Person,
+    VoucherScan,
+)
+from ..services.archive import archive_through, coupon_queryset
+from ..services import get_or_create_system_settings, validate_entry_rules
+from ..services.coupons import create_coupons
+from ..services.entry_rules import compute_entry_rate_state
+from ..services.filters import filter_coupon_queryset
+from ..services.rollups import rebuild_rollups, rollup_total
+from ..services.search import rebuild_search_index
+from ..services.voucher_validation import VoucherValidationResult
+from ..utils.terms import get_draw_dates
+
+FIRST_DRAW = date(2025, 12, 9)
+SECOND_DRAW = date(2025, 12, 16)
+
+
+def _moment(day, hour=12):
+    value = datetime(2025, 12, day, hour)
+    return timezone.make_aware(value) if settings.USE_TZ else value
+
+
+def _local_day(value):
+    return (timezone.localtime(value) if timezone.is_aware(value) else value).date()
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.admin = User.objects.create_user(
+            username="admin_archive", password="secret", role=User.Role.ADMIN
+        )
+        self.person = Person.objects.create(
+            first_name="Archivo",
+            last_name="Prueba",
+            id_number="70000000",
+            phone="5557000",
+            birth_date=date(1990, 1, 1),
+        )
+        # Two coupons per period: before the first draw, between draws, still active.
+        self.coupons = create_coupons(
+            self.person, 6, Coupon.REGISTER, room_id=1, terminal_name="CAJA-A"
+        )
+        moments = [_moment(5), _moment(9, 20), _moment(9, 22), _moment(12), timezone.now(), timezone.now()]
+        for coupon, moment in zip(self.coupons, moments):
+            Coupon.objects.filter(pk=coupon.pk).update(
+                scanned_at=moment, scanned_date=_local_day(moment)
+            )
+        for code, moment in (("VA-1", _moment(5)), ("VA-2", _moment(12)), ("VA-3", timezone.now())):
+            VoucherScan.objects.filter(
+                pk=VoucherScan.objects.create(
+                    code=code, person=self.person, room_id=1, source=Coupon.ENTRY
+                ).pk
+            ).update(scanned_at=moment, scanned_date=_local_day(moment))
+        self.reprint = CouponReprint.objects.create(coupon=self.coupons[0], user=self.admin)
+        self.log = CouponReprintLog.objects.create(coupon=self.coupons[2], user=self.admin, room_id=1)
+        rebuild_rollups()
+
+    def _archive(self, chunk_size=2):
+        return archive_through(SECOND_DRAW, chunk_size, draw_dates=[FIRST_DRAW, SECOND_DRAW])
+
+    def test_rows_move_to_the_draw_they_belong_to(self):
+        report = self._archive()
+
+        self.assertEqual((report.coupons, report.voucher_scans, report.reprint_logs), (4, 2, 1))
+        self.assertEqual(
+            set(Coupon.objects.values_list("pk", flat=True)), {c.pk for c in self.coupons[4:]}
+        )
+        self.assertEqual(list(VoucherScan.objects.values_list("code", flat=True)), ["VA-3"])
+        self.assertFalse(CouponReprint.objects.exists())
+        self.assertFalse(CouponReprintLog.objects.exists())
+
+        by_draw = dict(ArchivedCoupon.objects.values_list("pk", "draw_date"))
+        self.assertEqual(
+            by_draw,
+            {
+                self.coupons[0].pk: FIRST_DRAW,
+                self.coupons[1].pk: FIRST_DRAW,
+                self.coupons[2].pk: SECOND_DRAW,
+                self.coupons[3].pk: SECOND_DRAW,
+            },
+        )
+        reprinted = ArchivedCoupon.objects.get(pk=self.coupons[0].pk)
+        self.assertEqual(
+            (reprinted.reprinted_by, reprinted.reprinted_at), (self.admin, self.reprint.created_at)
+        )
+        self.assertIsNone(ArchivedCoupon.objects.get(pk=self.coupons[1].pk).reprinted_by)
+        log = ArchivedReprintLog.objects.get()
+        self.assertEqual(
+            (log.pk, log.coupon_id, log.draw_date), (self.log.pk, self.coupons[2].pk, SECOND_DRAW)
+        )
+        self.assertEqual(
+            dict(ArchivedVoucherScan.objects.values_list("code", "draw_date")),
+            {"VA-1": FIRST_DRAW, "VA-2": SECOND_DRAW},
+        )
+        self.assertEqual(
+            list(CouponArchive.objects.values_list("draw_date", "coupons", "voucher_scans", "reprint_logs")),
+            [(SECOND_DRAW, 2, 1, 1), (FIRST_DRAW, 2, 1, 0)],
+        )
+
+        # Archiving again finds nothing left in the hot tables.
+        self.assertEqual(self._archive().coupons, 0)
+
+    def test_coupon_list_and_exports_read_the_selected_archive(self):
+        self._archive()
+        self.client.force_login(self.admin)
+
+        response = self.client.get(reverse("raffle_admin:coupons"))
+        self.assertEqual(
+            [coupon.pk for coupon in response.context["coupons"]],
+            [c.pk for c in reversed(self.coupons[4:])],
+        )
+
+        response = self.client.get(reverse("raffle_admin:coupons"), {"archive": "2025-12-09"})
+        self.assertEqual(
+            {coupon.pk for coupon in response.context["coupons"]}, {c.pk for c in self.coupons[:2]}
+        )
+        self.assertNotContains(response, "data-print-coupon ")
+
+        response = self.client.get(
+            reverse("raffle_admin:coupons_export"), {"format": "csv", "archive": "all"}
+        )
+        content = b"".join(response.streaming_content).decode("utf-8")
+        for coupon in self.coupons:
+            self.assertEqual(coupon.code in content, coupon in self.coupons[:4])
+
+    def test_archived_voucher_stays_used(self):
+        self._archive()
+        payload = {"id_number": self.person.id_number, "room_id": "1", "voucher_code": "va-1"}
+        with patch(
+            "raffle.controllers.public.validate_voucher_code",
+            return_value=VoucherValidationResult(True, "OK"),
+        ):
+            response = self.client.post(reverse("raffle:entry"), data=payload)
+
+        self.assertContains(response, "El voucher ya fue utilizado.", status_code=200)
+        self.assertFalse(VoucherScan.objects.filter(code="VA-1").exists())
+
+    def test_archived_codes_stay_searchable_after_an_index_rebuild(self):
+        self._archive()
+        rebuild_search_index()
+        code = self.coupons[0].code
+
+        for scope in ("all", FIRST_DRAW.isoformat()):
+            params = {"archive": scope, "coupon": code}
+            coupons, _ = filter_coupon_queryset(coupon_queryset(params), params)
+            self.assertEqual(list(coupons.values_list("code", flat=True)), [code])
+
+    def test_entry_state_rebuilt_after_archiving_keeps_recent_scan(self):
+        Coupon.objects.create(
+            person=self.person, code="ENT-TODAY", source=Coupon.ENTRY, room_id=1
+        )
+        last_scan_at = VoucherScan.objects.get(code="VA-3").scanned_at
+        tomorrow = _local_day(timezone.now()) + timedelta(days=1)
+        archive_through(tomorrow, draw_dates=[])
+        self.assertFalse(VoucherScan.objects.exists())
+
+        state = compute_entry_rate_state(self.person)
+        self.assertEqual((state.last_scan_at, state.coupons_today), (last_scan_at, 1))
+
+        call_command("backfill_entry_state", stdout=StringIO())
+        state = EntryRateState.objects.get(person=self.person)
+        self.assertEqual((state.last_scan_at, state.coupons_today), (last_scan_at, 1))
+        result = validate_entry_rules(self.person, get_or_create_system_settings()[0])
+        self.assertEqual(result.message, "Solo puedes escanear un ticket cada dos horas.")
+
+    def test_rollups_keep_counting_archived_rows(self):
+        before = rollup_total(CouponRollup.objects.filter(kind=CouponRollup.Kind.COUPON))
+        self._archive()
+        rebuild_rollups()
+
+        self.assertEqual(before, 6)
+        self.assertEqual(rollup_total(CouponRollup.objects.filter(kind=CouponRollup.Kind.COUPON)), 6)
+        self.assertEqual(rollup_total(CouponRollup.objects.filter(kind=CouponRollup.Kind.VOUCHER)), 3)
+
+    def test_draw_dates_are_read_from_the_terms(self):
+        dates = get_draw_dates()
+
+        self.assertEqual(len(dates), 21)
+        self.assertEqual((dates[0], dates[-1]), (FIRST_DRAW, date(2026, 3, 5)))
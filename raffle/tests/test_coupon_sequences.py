@@ -0,0 +1,156 @@
+from datetime import date
+
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Coupon, CouponSequence, Person
+from ..services import create_coupons, generate_coupon_code, get_or_create_system_settings
+from ..services import sequences
+from ..services.sequences import (
+    allocate_coupon_numbers,
+    release_coupon_leases,
+    reset_coupon_leases,
+)
+
+
+def _sequence_queries(captured) -> int:
+    return sum(
+        1 for query in captured.captured_queries if '"raffle_couponsequence"' in query["sql"]
+    )
+
+
+class CouponSequenceLeaseTests(TestCase):
+    def setUp(self):
+        reset_coupon_leases()
+
+    def tearDown(self):
+        reset_coupon_leases()
+
+    def test_codes_come_from_a_single_lease(self):
+        """A block of codes costs one sequence bump instead of one per code."""
+
+        with CaptureQueriesContext(connection) as captured:
+            # The lease is confirmed once the first code's transaction commits.
+            with self.captureOnCommitCallbacks(execute=True):
+                codes = [generate_coupon_code(1, "T1")]
+            codes += [generate_coupon_code(1, "T1") for _ in range(4)]
+
+        self.assertEqual(codes[0], "SCNT1-000001")
+        self.assertEqual(codes[-1], "SCNT1-000005")
+        self.assertEqual(len(set(codes)), 5)
+        self.assertLessEqual(_sequence_queries(captured), 3)
+        sequence = CouponSequence.objects.get(room_id=1, terminal_name="T1")
+        self.assertEqual(sequence.last_number, 50)
+
+    def test_exhausted_lease_takes_next_block(self):
+        """Numbers keep increasing across lease boundaries."""
+
+        numbers = allocate_coupon_numbers(2, "T1", count=7, block_size=3)
+
+        self.assertEqual(numbers, list(range(1, 8)))
+        sequence = CouponSequence.objects.get(room_id=2, terminal_name="T1")
+        self.assertGreaterEqual(sequence.last_number, 7)
+
+    def test_rolled_back_lease_is_not_reused(self):
+        """Numbers leased in a rolled back transaction are leased again."""
+
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                allocate_coupon_numbers(3, "T1", count=2, block_size=10)
+                raise RuntimeError
+
+        self.assertFalse(CouponSequence.objects.filter(room_id=3).exists())
+        self.assertEqual(allocate_coupon_numbers(3, "T1", count=2, block_size=10), [1, 2])
+        sequence = CouponSequence.objects.get(room_id=3, terminal_name="T1")
+        self.assertEqual(sequence.last_number, 10)
+
+    def test_lease_survives_a_rolled_back_savepoint_in_the_same_transaction(self):
+        """A savepoint rollback that undid the bump does not let numbers repeat."""
+
+        with transaction.atomic():
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    allocate_coupon_numbers(5, "T1", count=2, block_size=10)
+                    raise RuntimeError
+            # The row was created in the rolled back savepoint, so the lease is dropped.
+            self.assertFalse(CouponSequence.objects.filter(room_id=5).exists())
+            numbers = allocate_coupon_numbers(5, "T1", count=2, block_size=10)
+
+        self.assertEqual(numbers, [1, 2])
+        self.assertEqual(CouponSequence.objects.get(room_id=5).last_number, 10)
+
+    def test_unconfirmed_lease_reasserts_an_undone_bump(self):
+        """Inside its transaction a lease whose bump was undone reserves it again."""
+
+        with transaction.atomic():
+            allocate_coupon_numbers(6, "T1", count=1, block_size=10)
+            sequence = CouponSequence.objects.filter(room_id=6)
+            sequence.update(last_number=0)  # As if a savepoint rolled back the bump.
+
+            self.assertEqual(allocate_coupon_numbers(6, "T1", count=2, block_size=10), [2, 3])
+            self.assertEqual(sequence.get().last_number, 10)
+
+    def test_release_returns_unused_tail(self):
+        """Shutdown hands unused numbers back when nobody leased after us."""
+
+        allocate_coupon_numbers(4, "T1", count=3, block_size=10)
+        for lease in sequences._LEASES.values():
+            lease.confirm()
+
+        self.assertEqual(release_coupon_leases(), 7)
+        sequence = CouponSequence.objects.get(room_id=4, terminal_name="T1")
+        self.assertEqual(sequence.last_number, 3)
+
+
+class BulkCouponCreationTests(TestCase):
+    def setUp(self):
+        reset_coupon_leases()
+        self.person = Person.objects.create(
+            first_name="Bulk",
+            last_name="Create",
+            id_number="55556666",
+            phone="5552222",
+            birth_date=date(1985, 2, 2),
+        )
+        self.settings, _ = get_or_create_system_settings()
+
+    def tearDown(self):
+        reset_coupon_leases()
+
+    def _create(self, quantity: int, **kwargs):
+        reset_coupon_leases()
+        with CaptureQueriesContext(connection) as captured:
+            coupons = create_coupons(
+                person=self.person,
+                quantity=quantity,
+                source=Coupon.REGISTER,
+                room_id=1,
+                terminal_name="T1",
+                system_settings=self.settings,
+                **kwargs,
+            )
+        return coupons, len(captured.captured_queries)
+
+    def test_query_count_does_not_grow_with_quantity(self):
+        """Five or fifty coupons cost the same number of queries."""
+
+        self._create(1)  # First use also inserts the sequence row.
+        small, small_queries = self._create(5)
+        large, large_queries = self._create(50)
+
+        self.assertEqual(len(small), 5)
+        self.assertEqual(len(large), 50)
+        self.assertEqual(small_queries, large_queries)
+        self.assertTrue(all(coupon.pk for coupon in small + large))
+        self.assertEqual(Coupon.objects.filter(person=self.person).count(), 56)
+
+    def test_batched_and_row_by_row_codes_continue_the_sequence(self):
+        """Both modes draw from the same sequence without collisions."""
+
+        first, _ = self._create(2, batched=False)
+        second, _ = self._create(2)
+
+        codes = [coupon.code for coupon in first + second]
+        self.assertEqual(len(set(codes)), 4)
+        self.assertTrue(all(code.startswith("SCNT1-") for code in codes))
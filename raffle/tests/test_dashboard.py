@@ -0,0 +1,53 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Coupon, Person
+from ..services import create_coupons, dashboard
+
+
+class DashboardSnapshotTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        admin = User.objects.create_user(
+            username="admin_snapshot", password="secret", role=User.Role.ADMIN
+        )
+        self.client.force_login(admin)
+        self.person = Person.objects.create(
+            first_name="Instantánea",
+            last_name="Tablero",
+            id_number="88889999",
+            phone="5556666",
+            birth_date=date(1979, 9, 9),
+        )
+        dashboard.invalidate_dashboard_snapshots()
+
+    def _dashboard(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("raffle_admin:dashboard"), params)
+        return response, len(queries)
+
+    def test_repeat_views_are_served_from_the_snapshot(self):
+        """Only session and settings lookups run while the snapshot is fresh."""
+
+        create_coupons(self.person, 2, Coupon.REGISTER, room_id=1, terminal_name="CAJA-D")
+        first, cold_queries = self._dashboard()
+        second, warm_queries = self._dashboard()
+
+        self.assertLess(warm_queries, cold_queries)
+        self.assertEqual(second.context["dashboard_dataset"]["totalCoupons"], 2)
+        self.assertContains(second, "hace 0 s")
+
+    def test_writes_and_filters_get_their_own_refresh(self):
+        self._dashboard()
+        create_coupons(self.person, 3, Coupon.REGISTER, room_id=2, terminal_name="CAJA-D")
+
+        response, _ = self._dashboard()
+        filtered, _ = self._dashboard(room="1")
+
+        self.assertEqual(response.context["dashboard_dataset"]["totalCoupons"], 3)
+        self.assertEqual(filtered.context["dashboard_dataset"]["totalCoupons"], 0)
@@ -9,7 +9,7 @@ from django.utils import timezone
 from openpyxl import load_workbook
 
 from ..models import Coupon, Person, VoucherScan
-from ..services.voucher_validation import VoucherValidationResult
+from ..services.voucher_validation import VoucherValidationResult, issue_validation_token
 from utils.printers import build_escpos_bytes
 
 
@@ -51,14 +51,14 @@ class EntryViewTests(TestCase):
         self.validation_patcher.stop()
 
     def test_entry_scan_generates_coupon_and_triggers_print(self):
-        """Ensure scanning a voucher generates a coupon and prints it."""
+        """Ensure scanning a voucher generates a coupon and queues it for printing."""
 
         payload = {
             "id_number": self.person.id_number,
             "room_id": "1",
             "voucher_code": "scan-001",
         }
-        with patch("raffle.controllers.public.print_coupon_backend") as mock_print:
+        with patch("raffle.controllers.public.spool_coupons") as mock_spool:
             response = self.client.post(reverse("raffle:entry"), data=payload)
 
         self.assertEqual(response.status_code, 302)
@@ -69,9 +69,9 @@ class EntryViewTests(TestCase):
 
         coupons = Coupon.objects.filter(person=self.person, source=Coupon.ENTRY)
         self.assertEqual(coupons.count(), 1)
-        mock_print.assert_called_once()
-        printed_coupon = mock_print.call_args[0][0]
-        self.assertEqual(printed_coupon.id, coupons.first().id)
+        mock_spool.assert_called_once()
+        spooled_coupons = mock_spool.call_args[0][0]
+        self.assertEqual([coupon.id for coupon in spooled_coupons], [coupons.first().id])
 
     def test_entry_rejects_scans_within_two_hours_for_same_person(self):
         """Block scans if the participant used a voucher within two hours."""
@@ -81,7 +81,7 @@ class EntryViewTests(TestCase):
             "room_id": "1",
             "voucher_code": "scan-001",
         }
-        with patch("raffle.controllers.public.print_coupon_backend"):
+        with patch("raffle.controllers.public.spool_coupons"):
             self.client.post(reverse("raffle:entry"), data=payload)
 
         follow_up_payload = {
@@ -128,6 +128,43 @@ class EntryViewTests(TestCase):
             status_code=200,
         )
 
+    def test_validation_token_skips_second_remote_validation(self):
+        """A token issued by the validation endpoint replaces the live check."""
+
+        response = self.client.post(reverse("raffle:entry_validate"), {"voucher_code": "tok-001"})
+        token = response.json()["token"]
+        payload = {
+            "id_number": self.person.id_number,
+            "room_id": "1",
+            "voucher_code": "tok-001",
+            "validation_token": token,
+        }
+        with patch("raffle.controllers.public.spool_coupons"):
+            response = self.client.post(reverse("raffle:entry"), data=payload)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.mock_validate.call_count, 1)
+        self.assertTrue(VoucherScan.objects.filter(code="TOK-001").exists())
+
+    def test_token_for_another_voucher_falls_back_to_live_validation(self):
+        """Tokens are bound to the voucher code they were issued for."""
+
+        token = issue_validation_token("OTHER-001", 1, "001")
+        self.mock_validate.return_value = VoucherValidationResult(
+            False, "Cupón No Pertenece a la Sala"
+        )
+        payload = {
+            "id_number": self.person.id_number,
+            "room_id": "1",
+            "voucher_code": "tok-002",
+            "validation_token": token,
+        }
+        response = self.client.post(reverse("raffle:entry"), data=payload)
+
+        self.mock_validate.assert_called_once()
+        self.assertContains(response, "Cupón No Pertenece a la Sala", status_code=200)
+        self.assertFalse(VoucherScan.objects.filter(code="TOK-002").exists())
+
 
 class CouponPrintingTests(TestCase):
     def test_coupon_payload_contains_trailing_blank_lines(self):
@@ -185,7 +222,7 @@ class CouponExportTests(TestCase):
             "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         )
 
-        workbook = load_workbook(BytesIO(response.content))
+        workbook = load_workbook(BytesIO(b"".join(response.streaming_content)))
         self.assertIn("Cupones", workbook.sheetnames)
         detail_sheet = workbook["Cupones"]
         self.assertGreaterEqual(detail_sheet.max_row, 2)
@@ -0,0 +1,100 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Coupon, EntryRateState, Person, VoucherScan
+from ..services import get_or_create_system_settings, record_entry_scan, validate_entry_rules
+from ..services.entry_rules import compute_entry_rate_state
+
+
+class EntryRateStateTests(TestCase):
+    def setUp(self):
+        self.person = Person.objects.create(
+            first_name="Rate",
+            last_name="Limit",
+            id_number="66667777",
+            phone="5553333",
+            birth_date=date(1988, 8, 8),
+        )
+        self.settings, _ = get_or_create_system_settings()
+
+    def test_validation_is_a_single_primary_key_read_once_state_exists(self):
+        """After the first check the rules only read the state row."""
+
+        validate_entry_rules(self.person, self.settings)
+        with self.assertNumQueries(1):
+            result = validate_entry_rules(self.person, self.settings, lock_rows=True)
+        self.assertTrue(result.is_valid)
+
+    def test_recorded_scan_blocks_the_next_two_hours(self):
+        """Recording a scan enforces the two hour rule without scanning history."""
+
+        validate_entry_rules(self.person, self.settings)
+        record_entry_scan(self.person, timezone.now(), 1)
+
+        result = validate_entry_rules(self.person, self.settings)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.message, "Solo puedes escanear un ticket cada dos horas.")
+
+    def test_daily_counter_resets_on_a_new_day(self):
+        """Coupons recorded yesterday do not count against today's limit."""
+
+        yesterday = timezone.now() - timedelta(days=1)
+        EntryRateState.objects.create(
+            person=self.person,
+            last_scan_at=yesterday,
+            current_day=yesterday.date(),
+            coupons_today=10,
+        )
+
+        self.assertTrue(validate_entry_rules(self.person, self.settings).is_valid)
+        record_entry_scan(self.person, timezone.now(), 2)
+        state = EntryRateState.objects.get(pk=self.person.pk)
+        self.assertEqual(state.coupons_today, 2)
+        self.assertEqual(state.current_day, timezone.now().date())
+
+    def test_backfill_command_rebuilds_state_from_history(self):
+        """The backfill command derives counters from scans and coupons."""
+
+        scanned_at = timezone.now() - timedelta(hours=3)
+        VoucherScan.objects.create(
+            code="BACKFILL-1",
+            person=self.person,
+            room_id=1,
+            source=Coupon.ENTRY,
+            scanned_at=scanned_at,
+        )
+        for index in range(3):
+            Coupon.objects.create(
+                person=self.person,
+                code=f"BACKFILL-{index}",
+                source=Coupon.ENTRY,
+                room_id=1,
+                scanned_at=timezone.now(),
+            )
+
+        call_command("backfill_entry_state", stdout=StringIO())
+
+        state = EntryRateState.objects.get(pk=self.person.pk)
+        self.assertEqual(state.last_scan_at, scanned_at)
+        self.assertEqual(state.coupons_today, 3)
+
+    def test_scanned_date_is_stored_on_every_insert_path(self):
+        """The local day is derived on save and bulk_create and drives the daily count."""
+
+        yesterday = timezone.now() - timedelta(days=1)
+        Coupon.objects.create(
+            person=self.person, code="DAY-1", source=Coupon.ENTRY, room_id=1, scanned_at=yesterday
+        )
+        Coupon.objects.bulk_create(
+            [Coupon(person=self.person, code="DAY-2", source=Coupon.ENTRY, room_id=1)]
+        )
+
+        self.assertEqual(
+            dict(Coupon.objects.values_list("code", "scanned_date")),
+            {"DAY-1": yesterday.date(), "DAY-2": timezone.now().date()},
+        )
+        self.assertEqual(compute_entry_rate_state(self.person).coupons_today, 1)
@@ -0,0 +1,143 @@
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Coupon, ExportJob, Person
+from ..services import export_jobs
+from ..services.export_jobs import evict_export_files, request_export, run_export_job
+from ..services.normalization import prepare_normalization_job, run_normalization_job
+from ..services.reprints import register_reprint
+
+
+class ExportJobTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = patch.object(export_jobs, "EXPORT_JOB_DIR", Path(directory.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.person = Person.objects.create(
+            first_name="Fondo",
+            last_name="Trabajo",
+            id_number="11110000",
+            phone="5550000",
+            birth_date=date(1988, 8, 8),
+        )
+        for index in range(3):
+            self._add_coupon(index)
+
+    def _add_coupon(self, index):
+        return Coupon.objects.create(
+            person=self.person,
+            code=f"JOB-{index}",
+            source=Coupon.REGISTER,
+            room_id=1 + index % 2,
+        )
+
+    def test_identical_requests_share_one_job(self):
+        """Repeated clicks with the same filters reuse the queued job."""
+
+        with patch.object(export_jobs.EXPORT_EXECUTOR, "submit") as submit:
+            with self.captureOnCommitCallbacks(execute=True):
+                first, created = request_export("coupons", "csv", {"room": "2", "coupon": ""})
+                second, created_again = request_export("coupons", "csv", {"room": "2"})
+
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(first.pk, second.pk)
+        submit.assert_called_once()
+
+    def test_finished_file_is_served_until_data_changes(self):
+        """A done job is reused while the rows are unchanged, then rebuilt."""
+
+        with patch.object(export_jobs.EXPORT_EXECUTOR, "submit"):
+            job, _ = request_export("coupons", "csv", {"room": "2"})
+            run_export_job(job.pk)
+            job.refresh_from_db()
+
+            self.assertEqual(job.status, ExportJob.Status.DONE)
+            self.assertEqual((job.rows_written, job.total_rows, job.progress), (1, 1, 100))
+            self.assertIn(b"JOB-1", Path(job.file_path).read_bytes())
+            self.assertEqual(request_export("coupons", "csv", {"room": "2"})[0].pk, job.pk)
+
+            self._add_coupon(3)
+            self.assertNotEqual(request_export("coupons", "csv", {"room": "2"})[0].pk, job.pk)
+
+    def test_edits_to_exported_rows_change_the_data_version(self):
+        """Renames, printed flags and reprints are not served from a stale file."""
+
+        User = get_user_model()
+        admin = User.objects.create_user(
+            username="admin_version", password="secret", role=User.Role.ADMIN
+        )
+        versions = [export_jobs.data_version("coupons")]
+
+        self.person.first_name = "Renombrado"
+        self.person.save()
+        versions.append(export_jobs.data_version("coupons"))
+
+        Person.objects.filter(pk=self.person.pk).update(first_name="fondo", last_name="trabajo")
+        run_normalization_job(prepare_normalization_job().pk)
+        versions.append(export_jobs.data_version("coupons"))
+
+        register_reprint(Coupon.objects.get(code="JOB-0"), admin)
+        versions.append(export_jobs.data_version("coupons"))
+
+        self.assertEqual(len(set(versions)), len(versions))
+
+    def test_concurrent_identical_request_shares_the_active_job(self):
+        """The unique active fingerprint turns a lost race into a shared job."""
+
+        with patch.object(export_jobs.EXPORT_EXECUTOR, "submit"):
+            first, _ = request_export("coupons", "csv", {"room": "2"})
+            # Simulate the second request missing the first job in its lookup.
+            with patch.object(export_jobs.ExportJob.objects, "filter") as lookup:
+                lookup.return_value.order_by.return_value.first.return_value = None
+                second, created = request_export("coupons", "csv", {"room": "2"})
+
+        self.assertFalse(created)
+        self.assertEqual(second.pk, first.pk)
+        self.assertEqual(ExportJob.objects.count(), 1)
+
+    def test_admin_downloads_finished_xlsx(self):
+        """The admin page queues a job and serves the finished file."""
+
+        User = get_user_model()
+        admin = User.objects.create_user(username="admin_jobs", password="secret", role=User.Role.ADMIN)
+        self.client.force_login(admin)
+        with patch.object(export_jobs.EXPORT_EXECUTOR, "submit"):
+            response = self.client.post(
+                reverse("raffle_admin:export_jobs"),
+                {"dataset": "coupons", "format": "xlsx", "params": "room=1&page=3"},
+            )
+        job = ExportJob.objects.get()
+        self.assertRedirects(response, f"{reverse('raffle_admin:export_jobs')}?job={job.pk}")
+        self.assertEqual(job.params, {"room": "1"})
+
+        run_export_job(job.pk)
+        response = self.client.get(reverse("raffle_admin:export_job_download", args=[job.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"PK"))
+
+    def test_old_files_are_evicted(self):
+        """Finished files past the age limit are deleted and marked expired."""
+
+        with patch.object(export_jobs.EXPORT_EXECUTOR, "submit"):
+            job, _ = request_export("vouchers", "ndjson", {})
+        run_export_job(job.pk)
+        ExportJob.objects.filter(pk=job.pk).update(
+            finished_at=timezone.now() - timedelta(seconds=export_jobs.EXPORT_JOB_MAX_AGE + 1)
+        )
+        job.refresh_from_db()
+
+        self.assertEqual(evict_export_files(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.EXPIRED)
+        self.assertFalse(Path(job.file_path).exists())
@@ -0,0 +1,95 @@
+"""Tests for the keep-alive pool against a local stand-in room endpoint."""
+
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import SimpleTestCase
+
+from raffle.services.http_pool import HTTPConnectionPool
+
+
+class _RoomAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.counter_lock:
+            self.server.accepted += 1
+
+    def do_POST(self):  # noqa: N802
+        length = int(self.headers.get("Content-Length", 0))
+        request_data = json.loads(self.rfile.read(length) or b"{}")
+        body = json.dumps({"error": False, "message": request_data.get("validCode", "")}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.drop_after_response:
+            # Close without announcing it, like a server expiring idle sockets.
+            self.close_connection = True
+
+    def log_message(self, format, *args):  # noqa: A002
+        return
+
+
+class HTTPConnectionPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _RoomAPIHandler)
+        self.server.accepted = 0
+        self.server.counter_lock = threading.Lock()
+        self.server.drop_after_response = False
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.host = f"127.0.0.1:{self.server.server_port}"
+        self.pool = HTTPConnectionPool(timeout=2)
+
+    def tearDown(self):
+        self.pool.clear()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _post(self, code: str):
+        payload = json.dumps({"validCode": code}).encode()
+        headers = {"Content-Type": "application/json"}
+        return self.pool.request(self.host, "POST", "/api_app.php", body=payload, headers=headers)
+
+    def test_sequential_requests_share_one_connection(self):
+        """Keep-alive reuses the same socket for consecutive requests."""
+
+        responses = [self._post(f"V{index}") for index in range(5)]
+
+        self.assertEqual(self.server.accepted, 1)
+        messages = [json.loads(response.body)["message"] for response in responses]
+        self.assertEqual(messages, [f"V{index}" for index in range(5)])
+        self.assertFalse(responses[0].timings.reused)
+        self.assertTrue(all(response.timings.reused for response in responses[1:]))
+        self.assertGreater(responses[0].timings.connect, 0)
+        self.assertEqual(responses[1].timings.connect, 0)
+        self.assertGreaterEqual(responses[1].timings.total, responses[1].timings.request)
+
+    def test_connections_are_shared_across_threads(self):
+        """Threads borrow idle connections instead of opening new ones."""
+
+        for _ in range(3):
+            workers = [threading.Thread(target=self._post, args=(f"T{i}",)) for i in range(2)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        self.assertLessEqual(self.server.accepted, 2)
+
+    def test_broken_idle_socket_is_recycled(self):
+        """A socket closed by the server is replaced transparently."""
+
+        self.server.drop_after_response = True
+        first = self._post("A")
+        second = self._post("B")
+
+        self.assertEqual(json.loads(second.body)["message"], "B")
+        self.assertEqual(first.status, 200)
+        self.assertEqual(self.server.accepted, 2)
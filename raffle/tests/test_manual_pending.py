@@ -33,7 +33,7 @@ class CashierManualPendingTests(TestCase):
             "room_id": "1",
         }
 
-        with patch("raffle.controllers.admin.print_coupon_backend") as print_mock:
+        with patch("raffle.controllers.admin.spool_coupons") as print_mock:
             response = self.client.post(reverse("raffle_admin:cashier_register"), data=payload)
 
         self.assertEqual(response.status_code, 302)
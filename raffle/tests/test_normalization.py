@@ -0,0 +1,87 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import NormalizationJob, Person, PersonSearchGram
+from ..services.normalization import prepare_normalization_job, run_normalization_job
+from ..services.participants import get_participant
+
+
+class _Interrupted(Exception):
+    pass
+
+
+class NormalizationJobTests(TestCase):
+    def setUp(self):
+        names = [("  juan  carlos", "pérez"), ("Ana", "Gómez"), ("maría", "  LÓPEZ "), ("luis", "díaz"), ("Eva", "Sosa")]
+        self.people = [
+            Person.objects.create(
+                first_name=first,
+                last_name=last,
+                id_number=f"3100000{index}",
+                phone="5550000",
+                birth_date=date(1990, 1, 1),
+            )
+            for index, (first, last) in enumerate(names)
+        ]
+
+    def test_batches_normalize_names_and_refresh_the_search_index(self):
+        get_participant("31000000")
+        job = run_normalization_job(prepare_normalization_job().pk, batch_size=2)
+
+        self.assertEqual(job.status, NormalizationJob.Status.DONE)
+        self.assertEqual((job.processed, job.updated, job.total), (5, 3, 5))
+        self.assertEqual(
+            list(Person.objects.order_by("pk").values_list("first_name", "last_name")),
+            [("Juan Carlos", "Pérez"), ("Ana", "Gómez"), ("María", "López"), ("Luis", "Díaz"), ("Eva", "Sosa")],
+        )
+        self.assertEqual(get_participant("31000000").first_name, "Juan Carlos")
+        self.assertTrue(
+            PersonSearchGram.objects.filter(
+                person=self.people[0], kind=PersonSearchGram.Kind.NAME, gram="n c"
+            ).exists()
+        )
+
+    def test_interrupted_run_resumes_after_the_last_committed_batch(self):
+        def stop_after_first_batch(job):
+            raise _Interrupted("corte")
+
+        job = run_normalization_job(
+            prepare_normalization_job().pk, batch_size=2, on_batch=stop_after_first_batch
+        )
+        self.assertEqual(job.status, NormalizationJob.Status.FAILED)
+        self.assertEqual((job.last_pk, job.processed), (self.people[1].pk, 2))
+        self.assertEqual(Person.objects.get(pk=self.people[2].pk).first_name, "maría")
+
+        output = StringIO()
+        call_command("normalize_participants", "--batch-size", "2", stdout=output)
+
+        job.refresh_from_db()
+        self.assertEqual(NormalizationJob.objects.count(), 1)
+        self.assertEqual(job.status, NormalizationJob.Status.DONE)
+        self.assertEqual((job.processed, job.updated), (5, 3))
+        self.assertIn(f"Reanudando desde el participante #{self.people[1].pk}", output.getvalue())
+        self.assertEqual(Person.objects.get(pk=self.people[3].pk).first_name, "Luis")
+
+    def test_configuration_button_queues_a_single_background_job(self):
+        User = get_user_model()
+        admin = User.objects.create_user(username="admin_norm", password="secret", role=User.Role.ADMIN)
+        self.client.force_login(admin)
+        url = reverse("raffle_admin:normalize_participants")
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(url)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(callbacks), 1)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.post(url)
+        self.assertEqual(callbacks, [])
+        self.assertEqual(NormalizationJob.objects.get().status, NormalizationJob.Status.PENDING)
+
+        page = self.client.get(f"{reverse('raffle_admin:configuration')}?tab=system")
+        self.assertContains(page, "En cola · 0%")
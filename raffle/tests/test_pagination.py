@@ -0,0 +1,75 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Coupon, Person
+from ..services.pagination import invalidate_list_totals, keyset_paginate
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        person = Person.objects.create(
+            first_name="Página",
+            last_name="Cursor",
+            id_number="13131313",
+            phone="5558888",
+            birth_date=date(1992, 2, 2),
+        )
+        base = timezone.now()
+        # Pairs of coupons share a timestamp so the id tie-break is exercised.
+        Coupon.objects.bulk_create(
+            Coupon(
+                person=person,
+                code=f"PAGE-{index:03d}",
+                source=Coupon.REGISTER,
+                room_id=1,
+                scanned_at=base - timedelta(minutes=index // 2),
+            )
+            for index in range(25)
+        )
+        self.expected = list(
+            Coupon.objects.order_by("-scanned_at", "-pk").values_list("code", flat=True)
+        )
+        invalidate_list_totals()
+
+    def test_next_and_previous_cursors_walk_every_row_once(self):
+        pages, page = [], keyset_paginate(Coupon.objects.all(), per_page=10)
+        pages.append(page)
+        while page.has_next:
+            page = keyset_paginate(Coupon.objects.all(), after=page.next_cursor, per_page=10)
+            pages.append(page)
+
+        codes = [coupon.code for page in pages for coupon in page.object_list]
+        self.assertEqual(codes, self.expected)
+        self.assertFalse(pages[0].has_previous)
+
+        back = keyset_paginate(Coupon.objects.all(), before=pages[2].previous_cursor, per_page=10)
+        self.assertEqual(back.object_list, pages[1].object_list)
+        self.assertTrue(back.has_previous and back.has_next)
+
+    def test_deep_pages_cost_the_same_as_the_first(self):
+        """Later pages reuse the cached totals and read one indexed range."""
+
+        User = get_user_model()
+        admin = User.objects.create_user(
+            username="admin_pages", password="secret", role=User.Role.ADMIN
+        )
+        self.client.force_login(admin)
+        url = reverse("raffle_admin:coupons")
+
+        first = self.client.get(url)
+        cursor = keyset_paginate(Coupon.objects.all(), per_page=23).next_cursor
+        with CaptureQueriesContext(connection) as deep_queries:
+            deep = self.client.get(url, {"after": cursor})
+        with CaptureQueriesContext(connection) as repeat_queries:
+            self.client.get(url)
+
+        self.assertEqual(first.context["coupon_count"], 25)
+        self.assertEqual([c.code for c in deep.context["coupons"]], self.expected[23:])
+        self.assertEqual(len(deep_queries), len(repeat_queries))
+        self.assertFalse(any("COUNT" in query["sql"] for query in repeat_queries))
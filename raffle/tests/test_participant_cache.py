@@ -0,0 +1,138 @@
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from ..forms import RegistrationForm
+from ..models import Coupon, Person, PersonSearchGram, VoucherScan
+from ..services import get_or_create_system_settings
+from ..services.entry_rules import EntryValidationError, register_entry
+from ..services.participants import (
+    clear_participant_cache,
+    get_participant,
+    participant_cache_info,
+)
+
+
+class ParticipantCacheTests(TestCase):
+    def setUp(self):
+        clear_participant_cache()
+        self.person = Person.objects.create(
+            first_name="Habitual",
+            last_name="Cliente",
+            id_number="40404040",
+            phone="5554040",
+            birth_date=date(1985, 4, 4),
+        )
+
+    def test_repeated_lookups_are_served_from_memory(self):
+        before = participant_cache_info()
+        self.assertEqual(get_participant("40404040").pk, self.person.pk)
+
+        with self.assertNumQueries(0):
+            for _ in range(3):
+                response = self.client.get(reverse("raffle:person_lookup"), {"id_number": "40404040"})
+                self.assertEqual(response.json()["fullName"], "Habitual Cliente")
+
+        info = participant_cache_info()
+        self.assertEqual(info.misses - before.misses, 1)
+        self.assertEqual(info.hits - before.hits, 3)
+
+    def test_returned_instances_are_independent_copies(self):
+        first = get_participant("40404040")
+        first.first_name = "Cambiado"
+        self.assertEqual(get_participant("40404040").first_name, "Habitual")
+
+    def test_unknown_dni_is_not_cached(self):
+        self.assertIsNone(get_participant("50505050"))
+        Person.objects.create(
+            first_name="Nuevo",
+            last_name="Registro",
+            id_number="50505050",
+            phone="5555050",
+            birth_date=date(1990, 5, 5),
+        )
+        self.assertIsNotNone(get_participant("50505050"))
+
+    def test_saves_and_deletes_evict_the_participant(self):
+        get_participant("40404040")
+        self.person.id_number = "41414141"
+        self.person.save()
+        self.assertIsNone(get_participant("40404040"))
+        self.assertEqual(get_participant("41414141").pk, self.person.pk)
+
+        self.person.delete()
+        self.assertIsNone(get_participant("41414141"))
+
+    def test_registration_duplicate_check_uses_the_cache(self):
+        get_participant("40404040")
+        form = RegistrationForm(
+            data={
+                "first_name": "Otra",
+                "last_name": "Persona",
+                "id_number": "40404040",
+                "email": "",
+                "phone": "5550000",
+                "birth_date": "1990-01-01",
+                "room_id": "1",
+            }
+        )
+        with self.assertNumQueries(0):
+            self.assertFalse(form.is_valid())
+        self.assertIn("id_number", form.errors)
+
+
+class StaleParticipantEntryTests(TransactionTestCase):
+    def setUp(self):
+        clear_participant_cache()
+        self.addCleanup(clear_participant_cache)
+        self.person = Person.objects.create(
+            first_name="Fusionado",
+            last_name="Afuera",
+            id_number="42424242",
+            phone="5554242",
+            birth_date=date(1984, 2, 4),
+        )
+        self.settings, _ = get_or_create_system_settings()
+        self.cached = get_participant("42424242")
+        # Changes below bypass the signals, like ones made by another process.
+        PersonSearchGram.objects.filter(person=self.person).delete()
+
+    def _register(self, voucher_code):
+        return register_entry(self.cached, voucher_code, 1, "Terminal-1", self.settings)
+
+    def test_entry_retries_with_the_participant_merged_elsewhere(self):
+        """A row re-keyed by another terminal is read again instead of reported as used."""
+
+        Person.objects.filter(pk=self.person.pk).update(id=self.person.pk + 100)
+
+        coupons = self._register("MERGED-1")
+
+        self.assertEqual([coupon.person_id for coupon in coupons], [self.person.pk + 100])
+        self.assertEqual(VoucherScan.objects.get(code="MERGED-1").person_id, self.person.pk + 100)
+
+    def test_entry_for_a_deleted_participant_is_not_a_used_voucher(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {Person._meta.db_table} WHERE id = %s", [self.person.pk]
+            )
+
+        with self.assertRaisesMessage(EntryValidationError, "No existe un participante"):
+            self._register("DELETED-1")
+
+        self.assertFalse(VoucherScan.objects.exists())
+        self.assertFalse(Coupon.objects.exists())
+
+    def test_used_voucher_is_still_reported(self):
+        other = Person.objects.create(
+            first_name="Otro",
+            last_name="Cliente",
+            id_number="43434343",
+            phone="5554343",
+            birth_date=date(1986, 3, 4),
+        )
+        VoucherScan.objects.create(code="USED-1", person=other, room_id=2, source=Coupon.ENTRY)
+
+        with self.assertRaisesMessage(EntryValidationError, "El voucher ya fue utilizado."):
+            self._register("USED-1")
@@ -0,0 +1,201 @@
+from datetime import date
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Coupon, Person
+from ..services import get_or_create_system_settings
+from ..services.print_queue import PrintJob, PrintSpooler
+from ..services.printing import print_coupons_backend
+from utils.printers import (
+    ESCPOS_CUT,
+    ESCPOS_INIT,
+    build_escpos_batch,
+    build_escpos_bytes,
+    invalidate_coupon_template,
+)
+
+
+class PrintSpoolerTests(TestCase):
+    def setUp(self):
+        self.person = Person.objects.create(
+            first_name="Spool",
+            last_name="Er",
+            id_number="77778888",
+            phone="5554444",
+            birth_date=date(1979, 9, 9),
+        )
+        self.coupons = [
+            Coupon.objects.create(
+                person=self.person, code=f"SPOOL-{index}", source=Coupon.REGISTER, room_id=1
+            )
+            for index in range(3)
+        ]
+
+    def test_worker_prints_jobs_in_order_after_commit(self):
+        """Jobs reach the printer thread only once the transaction commits."""
+
+        printed = []
+        spooler = PrintSpooler(
+            printer=lambda batch: printed.extend(coupon.code for coupon in batch) or True
+        )
+        try:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                spooler.submit(self.coupons[:2])
+                spooler.submit(self.coupons[2:])
+                self.assertEqual(printed, [])
+            spooler.join()
+        finally:
+            spooler.shutdown()
+
+        self.assertEqual(len(callbacks), 2)
+        self.assertEqual(printed, ["SPOOL-0", "SPOOL-1", "SPOOL-2"])
+
+    def test_failed_coupons_return_to_pending(self):
+        """Coupons the printer rejects are flagged as not printed."""
+
+        spooler = PrintSpooler(
+            printer=lambda batch: all(coupon.code != "SPOOL-1" for coupon in batch),
+            batch_size=1,
+        )
+        job = spooler.process(PrintJob(self.coupons))
+
+        self.assertTrue(job.done.is_set())
+        self.assertEqual(job.failed_ids, [self.coupons[1].pk])
+        self.assertEqual(
+            list(Coupon.objects.filter(printed=False).values_list("code", flat=True)),
+            ["SPOOL-1"],
+        )
+
+    def test_batch_is_sent_as_one_stream_with_a_cut_per_coupon(self):
+        """Several coupons share one initialization and one USB session."""
+
+        with patch("raffle.services.printing.raw_print_usb") as usb_mock:
+            self.assertTrue(print_coupons_backend(self.coupons))
+
+        usb_mock.assert_called_once()
+        payload = usb_mock.call_args[0][2]
+        self.assertTrue(payload.startswith(ESCPOS_INIT))
+        self.assertEqual(payload.count(ESCPOS_INIT), 1)
+        self.assertEqual(payload.count(ESCPOS_CUT), 3)
+        self.assertIn(b"SPOOL-2", payload)
+
+    def test_single_coupon_batch_matches_legacy_payload(self):
+        """A one-coupon batch produces exactly the single coupon payload."""
+
+        with patch("raffle.services.printing.raw_print_usb") as usb_mock:
+            print_coupons_backend(self.coupons[:1])
+
+        self.assertEqual(usb_mock.call_args[0][2], build_escpos_bytes(self.coupons[0]))
+
+
+class CouponTemplateTests(TestCase):
+    def setUp(self):
+        invalidate_coupon_template()
+        self.addCleanup(invalidate_coupon_template)
+        person = Person.objects.create(
+            first_name="Plantilla",
+            last_name="Cacheada",
+            id_number="66665555",
+            phone="5553333",
+            birth_date=date(1982, 2, 2),
+        )
+        self.coupons = [
+            Coupon(person=person, code=f"TPL-{index}", source=Coupon.REGISTER, room_id=1)
+            for index in range(100)
+        ]
+
+    def test_batch_of_coupons_runs_no_queries_once_compiled(self):
+        """The settings are read once; every coupon after that is pure formatting."""
+
+        build_escpos_batch(self.coupons[:1])
+
+        with self.assertNumQueries(0):
+            payload = build_escpos_batch(self.coupons)
+
+        self.assertEqual(payload.count(ESCPOS_CUT), 100)
+        self.assertEqual(payload.count("CASINOS GALA".encode("cp858")), 100)
+
+    def test_saving_settings_recompiles_the_template(self):
+        """A new company name shows up on the next coupon."""
+
+        build_escpos_batch(self.coupons[:1])
+        settings_instance, _ = get_or_create_system_settings()
+        settings_instance.company_name = "Sala Nueva"
+        settings_instance.save()
+
+        payload = build_escpos_batch(self.coupons[:1])
+
+        self.assertIn(b"SALA NUEVA", payload)
+        self.assertNotIn(b"CASINOS GALA", payload)
+
+
+class ManualListSpoolTests(TestCase):
+    def test_manual_list_claims_batch_and_spools_it(self):
+        """Printing pending coupons marks them and hands them to the spooler."""
+
+        User = get_user_model()
+        cashier = User.objects.create_user(
+            username="cashier_spool", password="secret", role=User.Role.CASHIER
+        )
+        self.client.force_login(cashier)
+        person = Person.objects.create(
+            first_name="Pending",
+            last_name="Batch",
+            id_number="77779999",
+            phone="5555555",
+            birth_date=date(1980, 1, 1),
+        )
+        for index in range(2):
+            Coupon.objects.create(
+                person=person,
+                code=f"PENDING-{index}",
+                source=Coupon.MANUAL,
+                room_id=1,
+                created_by=cashier,
+                printed=False,
+            )
+
+        with patch("raffle.controllers.admin.spool_coupons") as spool_mock:
+            response = self.client.post(reverse("raffle_admin:manual_list"))
+
+        self.assertEqual(response.status_code, 302)
+        spool_mock.assert_called_once()
+        self.assertEqual(len(spool_mock.call_args[0][0]), 2)
+        self.assertFalse(Coupon.objects.filter(printed=False).exists())
+
+    def test_failed_entry_coupons_are_listed_for_reprint(self):
+        """Entry coupons the spooler sent back can be printed again from the list."""
+
+        User = get_user_model()
+        cashier = User.objects.create_user(
+            username="cashier_retry", password="secret", role=User.Role.CASHIER
+        )
+        person = Person.objects.create(
+            first_name="Entrada",
+            last_name="Fallida",
+            id_number="77770000",
+            phone="5556666",
+            birth_date=date(1981, 3, 3),
+        )
+        failed, printed = [
+            Coupon.objects.create(
+                person=person, code=f"ENTRY-{index}", source=Coupon.ENTRY, room_id=1
+            )
+            for index in range(2)
+        ]
+        PrintSpooler(printer=lambda batch: False).process(PrintJob([failed]))
+        self.client.force_login(cashier)
+
+        response = self.client.get(reverse("raffle_admin:manual_list"))
+
+        self.assertEqual(
+            [coupon.code for coupon in response.context["coupons"]], ["ENTRY-0"]
+        )
+        with patch("raffle.controllers.admin.spool_coupons") as spool_mock:
+            self.client.post(reverse("raffle_admin:manual_list"))
+
+        self.assertEqual([coupon.pk for coupon in spool_mock.call_args[0][0]], [failed.pk])
+        self.assertTrue(Coupon.objects.get(pk=failed.pk).printed)
@@ -0,0 +1,82 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from utils import printers
+from utils.printers import USBError, USBPrinterError, USBPrinterSession
+
+
+class USBPrinterSessionTests(SimpleTestCase):
+    def setUp(self):
+        self.endpoint = MagicMock()
+        interface = MagicMock(bInterfaceNumber=0)
+        self.device = MagicMock()
+        self.device.get_active_configuration.return_value = [interface]
+        self.device.is_kernel_driver_active.return_value = False
+        self.usb = MagicMock()
+        self.usb.find.return_value = self.device
+        self.usb_util = MagicMock()
+        self.usb_util.find_descriptor.return_value = self.endpoint
+        patchers = [
+            patch.object(printers, "usb", self.usb),
+            patch.object(printers, "usb_util", self.usb_util),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_device_is_configured_once_for_many_writes(self):
+        """Only the first write enumerates, configures and claims the printer."""
+
+        session = USBPrinterSession(0x0416, 0x5011)
+        self.assertEqual(session.state, USBPrinterSession.DISCONNECTED)
+
+        for _ in range(3):
+            session.write(b"ticket")
+
+        self.usb.find.assert_called_once()
+        self.device.set_configuration.assert_called_once()
+        self.usb_util.claim_interface.assert_called_once()
+        self.assertEqual(self.endpoint.write.call_count, 3)
+        self.assertEqual(session.state, USBPrinterSession.CONNECTED)
+        self.assertEqual(session.snapshot()["writes"], 3)
+
+    def test_usb_error_reconnects_and_retries_the_write(self):
+        """A dropped device is reopened and the payload is sent again."""
+
+        session = USBPrinterSession(0x0416, 0x5011)
+        session.write(b"first")
+        self.endpoint.write.side_effect = [USBError("pipe error"), None]
+
+        session.write(b"second")
+
+        self.assertEqual(self.usb.find.call_count, 2)
+        self.usb_util.dispose_resources.assert_called_once_with(self.device)
+        self.assertEqual(session.reconnects, 1)
+        self.assertEqual(session.state, USBPrinterSession.CONNECTED)
+
+    def test_missing_device_reports_error_state(self):
+        """A printer that cannot be found leaves the session in error."""
+
+        self.usb.find.return_value = None
+        session = USBPrinterSession(0x0416, 0x5011)
+
+        with self.assertRaises(USBPrinterError):
+            session.write(b"ticket")
+
+        snapshot = session.snapshot()
+        self.assertEqual(snapshot["state"], USBPrinterSession.ERROR)
+        self.assertIn("not found", snapshot["last_error"])
+
+    def test_idle_state_after_quiet_period(self):
+        """An open session with no recent writes is reported as idle."""
+
+        session = USBPrinterSession(0x0416, 0x5011, idle_after=0)
+        session.write(b"ticket")
+
+        with patch.object(printers.time, "monotonic", return_value=session.last_write_at + 1):
+            self.assertEqual(session.state, USBPrinterSession.IDLE)
+
+        session.close()
+        self.assertEqual(session.state, USBPrinterSession.DISCONNECTED)
+        self.usb_util.release_interface.assert_called_once_with(self.device, 0)
@@ -0,0 +1,80 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import (
+    Coupon,
+    CouponReprint,
+    CouponReprintLog,
+    CouponRollup,
+    CouponSequence,
+    EntryRateState,
+    ManualCouponSequence,
+    Person,
+    PersonSearchGram,
+    Terminal,
+    VoucherScan,
+)
+from ..services.coupons import create_coupons, generate_manual_coupon_code
+from ..services.participants import get_participant
+from ..services.purge import purge_raffle_data
+from ..services.sequences import allocate_coupon_numbers, reset_coupon_leases
+
+
+class PurgeTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.admin = User.objects.create_user(
+            username="admin_purge", password="secret", role=User.Role.ADMIN
+        )
+        for index in range(3):
+            person = Person.objects.create(
+                first_name="Purga",
+                last_name=f"Prueba {index}",
+                id_number=f"6000000{index}",
+                phone="5556000",
+                birth_date=date(1990, 1, 1),
+            )
+            coupons = create_coupons(person, 4, Coupon.REGISTER, room_id=1, terminal_name="CAJA-P")
+            VoucherScan.objects.create(
+                code=f"VOUCHER-P{index}", person=person, room_id=1, source=Coupon.ENTRY
+            )
+            EntryRateState.objects.create(person=person, coupons_today=1)
+            CouponReprint.objects.create(coupon=coupons[0], user=self.admin)
+            CouponReprintLog.objects.create(coupon=coupons[0], user=self.admin, room_id=1)
+        generate_manual_coupon_code(1)
+        get_participant("60000000")
+
+    def test_purge_removes_every_row_in_small_chunks_and_keeps_the_sequences(self):
+        report = purge_raffle_data(chunk_size=5)
+
+        for model in (
+            Coupon,
+            VoucherScan,
+            Person,
+            CouponReprint,
+            CouponReprintLog,
+            EntryRateState,
+            PersonSearchGram,
+            CouponRollup,
+            Terminal,
+        ):
+            self.assertFalse(model.objects.exists(), model.__name__)
+        self.assertEqual(report.counts[Coupon._meta.db_table], 12)
+        self.assertEqual(report.counts[Person._meta.db_table], 3)
+        self.assertGreaterEqual(report.seconds, 0)
+
+        self.assertIsNone(get_participant("60000000"))
+        # Ranges leased before the purge stay reserved, so nothing is reissued.
+        leased = CouponSequence.objects.get(room_id=1, terminal_name="CAJA-P").last_number
+        reset_coupon_leases()
+        self.assertEqual(allocate_coupon_numbers(1, "CAJA-P"), [leased + 1])
+        self.assertTrue(generate_manual_coupon_code(1).endswith("-000002"))
+        self.assertEqual(ManualCouponSequence.objects.get(room_id=1).last_number, 2)
+
+    def test_clear_database_view_reports_the_counts(self):
+        self.client.force_login(self.admin)
+        response = self.client.post(reverse("raffle_admin:clear_database"), follow=True)
+        self.assertContains(response, "12 cupones, 3 vouchers y 3 participantes")
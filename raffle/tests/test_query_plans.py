@@ -0,0 +1,105 @@
+import re
+from datetime import date, datetime
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Count, Q
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Coupon, CouponReprintLog, Person, PersonSearchGram, VoucherScan
+from ..services.dashboard import DashboardFilters, build_dashboard_data
+from ..services.filters import filter_coupon_queryset
+
+# Tables large enough that a full scan on a hot path is a regression.
+HOT_TABLES = {
+    Coupon._meta.db_table,
+    VoucherScan._meta.db_table,
+    CouponReprintLog._meta.db_table,
+    Person._meta.db_table,
+    PersonSearchGram._meta.db_table,
+}
+FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+
+
+def _hot_querysets(person, user):
+    """The filters used by the dashboard, lists, pending prints and entry rules."""
+
+    pending = Coupon.objects.select_related("person", "created_by").filter(
+        source__in=(Coupon.MANUAL, Coupon.REGISTER), printed=False
+    )
+    coupons = Coupon.objects.select_related("person")
+    cursor_at = datetime(2026, 1, 1, 12, 0)
+    return {
+        "recent coupons": coupons.order_by("-scanned_at")[:30],
+        "coupons by room": coupons.filter(room_id=1).order_by("-scanned_at")[:30],
+        "coupons by terminal": coupons.filter(terminal_name="CAJA-1").order_by("-scanned_at")[:30],
+        "coupon page after cursor": coupons.filter(
+            Q(scanned_at__lt=cursor_at) | Q(scanned_at=cursor_at, pk__lt=1000)
+        ).order_by("-scanned_at", "-pk")[:101],
+        "coupons by date": coupons.filter(scanned_date__gte=date.today()),
+        "coupon list filters": filter_coupon_queryset(
+            coupons, {"room": "1", "source": Coupon.ENTRY, "date_start": date.today().isoformat()}
+        )[0],
+        "participant search": filter_coupon_queryset(coupons, {"participant": "gómez"})[0],
+        "coupon or contact search": filter_coupon_queryset(coupons, {"coupon": "caja-1-0042"})[0],
+        "pending prints": pending.order_by("scanned_at"),
+        "pending prints by room": pending.filter(room_id=1).order_by("scanned_at"),
+        "pending prints by cashier": pending.filter(created_by=user).order_by("scanned_at"),
+        "entry coupons today": Coupon.objects.filter(
+            person=person, source=Coupon.ENTRY, scanned_date=date.today()
+        ),
+        "daily totals": Coupon.objects.values("scanned_date").annotate(total=Count("id")),
+        "last voucher scan": VoucherScan.objects.filter(person=person)
+        .order_by("-scanned_at")
+        .values_list("scanned_at", flat=True)[:1],
+        "burned vouchers": VoucherScan.objects.order_by("-scanned_at")[:10],
+        "burned vouchers by room": VoucherScan.objects.filter(room_id=1).order_by("-scanned_at")[:10],
+        "reprint logs": CouponReprintLog.objects.order_by("-created_at")[:50],
+        "reprint logs by room": CouponReprintLog.objects.filter(room_id=1).order_by("-created_at")[:50],
+    }
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite specific.")
+class QueryPlanTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(username="planner", password="secret")
+        self.person = Person.objects.create(
+            first_name="Plan",
+            last_name="Consulta",
+            id_number="12121212",
+            phone="5557777",
+            birth_date=date(1991, 1, 1),
+        )
+
+    def _full_scans(self, sql, params=()):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            details = [row[-1] for row in cursor.fetchall()]
+        return [
+            detail
+            for detail in details
+            if (match := FULL_SCAN.match(detail)) and match.group(1) in HOT_TABLES
+        ]
+
+    def test_hot_queries_use_indexes(self):
+        """Every hot query reads an index instead of scanning a whole table."""
+
+        for label, queryset in _hot_querysets(self.person, self.user).items():
+            with self.subTest(label):
+                sql, params = queryset.query.sql_with_params()
+                self.assertEqual(self._full_scans(sql, params), [])
+
+    def test_dashboard_queries_use_indexes(self):
+        for filters in (
+            DashboardFilters(),
+            DashboardFilters(room_id=1, source=Coupon.ENTRY),
+            DashboardFilters(start_date=date(2026, 1, 1), end_date=date(2026, 1, 31)),
+        ):
+            with CaptureQueriesContext(connection) as queries:
+                build_dashboard_data(filters)
+            for query in queries:
+                with self.subTest(filters=filters, sql=query["sql"]):
+                    self.assertEqual(self._full_scans(query["sql"]), [])
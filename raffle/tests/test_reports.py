@@ -0,0 +1,201 @@
+import csv
+import gzip
+import json
+from datetime import date
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from ..models import Coupon, CouponReprintLog, Person, VoucherScan
+from ..rooms import RoomDirectory
+from ..services.summary import get_coupon_room_summary, get_coupon_terminal_summary
+
+
+class StreamingCouponExportTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        admin = User.objects.create_user(
+            username="admin_export", password="secret", role=User.Role.ADMIN
+        )
+        self.client.force_login(admin)
+        self.person = Person.objects.create(
+            first_name="Exportada",
+            last_name="Streaming",
+            id_number="44443333",
+            phone="5551111",
+            email="export@example.com",
+            birth_date=date(1985, 5, 5),
+        )
+
+    def _add_coupons(self, count, offset=0):
+        Coupon.objects.bulk_create(
+            Coupon(
+                person=self.person,
+                code=f"EXP-{offset + index:05d}",
+                source=Coupon.REGISTER,
+                room_id=1 + index % 2,
+                terminal_name="CAJA-1",
+            )
+            for index in range(count)
+        )
+
+    def _export(self, export_type):
+        url = f"{reverse('raffle_admin:coupons_export')}?export={export_type}"
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+            content = b"".join(response.streaming_content)
+        return response, content, len(queries)
+
+    def test_export_streams_a_styled_workbook(self):
+        """Every export type yields a readable XLSX with all coupon rows."""
+
+        self._add_coupons(5)
+        for export_type, detail_title in (
+            ("all", "Cupones"),
+            ("room", "Cupones por sala"),
+            ("day", "Cupones por día"),
+        ):
+            response, content, _ = self._export(export_type)
+
+            self.assertIsInstance(response, StreamingHttpResponse)
+            self.assertEqual(int(response["Content-Length"]), len(content))
+            workbook = load_workbook(BytesIO(content))
+            detail = workbook[detail_title]
+            self.assertEqual(detail.max_row, 6)
+            self.assertEqual(detail.freeze_panes, "A2")
+            self.assertEqual(detail["A1"].font.color.rgb, "00FFFFFF")
+
+        summary = load_workbook(BytesIO(self._export("all")[1]))["Summary"]
+        self.assertEqual([summary["B2"].value, summary["B3"].value], [3, 2])
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """Rows are read through one chunked cursor, not one query per coupon."""
+
+        self._add_coupons(3)
+        self._export("all")
+        baseline = self._export("all")[2]
+        self._add_coupons(40, offset=3)
+
+        self.assertEqual(self._export("all")[2], baseline)
+
+
+class TextExportTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.admin = User.objects.create_user(
+            username="admin_text", password="secret", role=User.Role.ADMIN
+        )
+        self.client.force_login(self.admin)
+        self.person = Person.objects.create(
+            first_name="Auditoría",
+            last_name="Notarial",
+            id_number="22221111",
+            phone="5559999",
+            birth_date=date(1975, 7, 7),
+        )
+        for index, room_id in enumerate((1, 2, 2)):
+            coupon = Coupon.objects.create(
+                person=self.person,
+                code=f"TXT-{index}",
+                source=Coupon.ENTRY,
+                room_id=room_id,
+                terminal_name="CAJA-2",
+            )
+            VoucherScan.objects.create(
+                code=f"VOU-{index}",
+                person=self.person,
+                room_id=room_id,
+                terminal_name="CAJA-2",
+                source=Coupon.ENTRY,
+            )
+        CouponReprintLog.objects.create(coupon=coupon, user=self.admin, room_id=2)
+
+    def _get(self, name, query):
+        response = self.client.get(f"{reverse(name)}?{query}")
+        self.assertIsInstance(response, StreamingHttpResponse)
+        return response, b"".join(response.streaming_content)
+
+    def test_coupon_csv_respects_filters(self):
+        """The CSV format streams only the rows matching the list filters."""
+
+        response, content = self._get("raffle_admin:coupons_export", "format=csv&room=2")
+
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        rows = list(csv.reader(content.decode("utf-8-sig").splitlines()))
+        self.assertEqual(rows[0][:2], ["codigo", "nombre"])
+        self.assertEqual(sorted(row[0] for row in rows[1:]), ["TXT-1", "TXT-2"])
+        self.assertEqual(rows[1][1], "Auditoría")
+
+    def test_voucher_ndjson_can_be_gzipped(self):
+        """NDJSON dumps can be compressed on the fly for large audits."""
+
+        response, content = self._get(
+            "raffle_admin:voucher_scans_export", "format=ndjson&gzip=1&room=1"
+        )
+
+        self.assertIn(".ndjson.gz", response["Content-Disposition"])
+        lines = gzip.decompress(content).decode("utf-8").splitlines()
+        self.assertEqual([json.loads(line)["voucher"] for line in lines], ["VOU-0"])
+
+    def test_voucher_export_searches_voucher_codes(self):
+        """Voucher codes are matched directly, not through the coupon code index."""
+
+        _, content = self._get("raffle_admin:voucher_scans_export", "format=csv&coupon=vou-1")
+        rows = list(csv.reader(content.decode("utf-8-sig").splitlines()))
+        self.assertEqual([row[0] for row in rows[1:]], ["VOU-1"])
+
+    def test_reprint_export_filters_through_the_coupon(self):
+        """Reprint logs reuse the coupon filters on their related coupon."""
+
+        _, content = self._get("raffle_admin:reprints_export", "terminal=CAJA-2")
+        rows = list(csv.reader(content.decode("utf-8-sig").splitlines()))
+        self.assertEqual([row[0] for row in rows[1:]], ["TXT-2"])
+
+        _, content = self._get("raffle_admin:reprints_export", "terminal=OTRA")
+        self.assertEqual(len(content.decode("utf-8-sig").splitlines()), 1)
+
+
+class RoomSummaryTests(TestCase):
+    def test_room_and_terminal_summaries_take_one_query_each(self):
+        """Totals, emission range, participants and sources come from one aggregate."""
+
+        people = [
+            Person.objects.create(
+                first_name=f"Resumen{index}",
+                last_name="Sala",
+                id_number=f"3333000{index}",
+                phone="5550101",
+                birth_date=date(1990, 1, 1),
+            )
+            for index in range(2)
+        ]
+        for index, (person, source, terminal) in enumerate(
+            [
+                (people[0], Coupon.ENTRY, "CAJA-1"),
+                (people[0], Coupon.REGISTER, "CAJA-1"),
+                (people[1], Coupon.ENTRY, "CAJA-2"),
+            ]
+        ):
+            Coupon.objects.create(
+                person=person, code=f"SUM-{index}", source=source, room_id=3, terminal_name=terminal
+            )
+        RoomDirectory.all()
+
+        with self.assertNumQueries(1):
+            (room,) = get_coupon_room_summary(Coupon.objects.all())
+        with self.assertNumQueries(1):
+            terminals = get_coupon_terminal_summary(Coupon.objects.all())
+
+        self.assertEqual((room["room_id"], room["total"], room["participants"]), (3, 3, 2))
+        self.assertEqual(room["by_source"][Coupon.ENTRY], 2)
+        self.assertLessEqual(room["first_scanned_at"], room["last_scanned_at"])
+        self.assertEqual(
+            [(item["terminal_name"], item["total"]) for item in terminals],
+            [("CAJA-1", 2), ("CAJA-2", 1)],
+        )
@@ -0,0 +1,100 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Coupon, Person, Room
+from ..rooms import RoomDirectory
+
+
+def _room_queries(captured) -> int:
+    return sum(1 for query in captured.captured_queries if '"raffle_room"' in query["sql"])
+
+
+class RoomDirectoryCacheTests(TestCase):
+    def setUp(self):
+        RoomDirectory.invalidate()
+
+    def tearDown(self):
+        RoomDirectory.invalidate()
+
+    def test_lookups_are_served_from_cache(self):
+        """Repeated lookups hit the database only once."""
+
+        Room.objects.create(id=1, name="Central")
+        with CaptureQueriesContext(connection) as captured:
+            for _ in range(20):
+                RoomDirectory.get(1)
+                RoomDirectory.choices()
+                RoomDirectory.default_room_id()
+        self.assertEqual(_room_queries(captured), 1)
+
+    def test_room_save_and_delete_invalidate_cache(self):
+        """Saving or deleting a room is visible on the next lookup."""
+
+        room = Room.objects.create(id=1, name="Central")
+        self.assertEqual(RoomDirectory.get(1).name, "Central")
+
+        room.name = "Fontana"
+        room.save()
+        self.assertEqual(RoomDirectory.get(1).name, "Fontana")
+
+        Room.objects.create(id=2, name="Sáenz Peña")
+        Room.objects.filter(pk=1).delete()
+        self.assertEqual(RoomDirectory.choices(), ((2, "Sáenz Peña"),))
+
+
+class CouponExportRoomQueryTests(TestCase):
+    def setUp(self):
+        RoomDirectory.invalidate()
+        User = get_user_model()
+        admin = User.objects.create_user(
+            username="admin_rooms", password="secret", role=User.Role.ADMIN
+        )
+        self.client.force_login(admin)
+        self.person = Person.objects.create(
+            first_name="Room",
+            last_name="Cache",
+            id_number="33334444",
+            phone="5551111",
+            birth_date=date(1980, 1, 1),
+        )
+        Room.objects.create(id=1, name="Central")
+        Room.objects.create(id=2, name="Fontana")
+
+    def tearDown(self):
+        RoomDirectory.invalidate()
+
+    def _create_coupons(self, start: int, count: int) -> None:
+        for index in range(start, start + count):
+            Coupon.objects.create(
+                person=self.person,
+                code=f"ROOMS-{index:04d}",
+                source=Coupon.ENTRY,
+                room_id=1 + index % 2,
+            )
+
+    def _export_room_queries(self, export_type: str) -> int:
+        RoomDirectory.invalidate()
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(
+                reverse("raffle_admin:coupons_export"), {"export": export_type}
+            )
+        self.assertEqual(response.status_code, 200)
+        return _room_queries(captured)
+
+    def test_export_issues_constant_room_queries(self):
+        """Room lookups during an export do not grow with the row count."""
+
+        for export_type in ("all", "room", "day"):
+            self._create_coupons(0, 4)
+            small = self._export_room_queries(export_type)
+            self._create_coupons(100, 40)
+            large = self._export_room_queries(export_type)
+            Coupon.objects.all().delete()
+
+            self.assertEqual(small, large)
+            self.assertLessEqual(large, 1)
@@ -0,0 +1,110 @@
+from datetime import date
+
+from django.db.models import Q
+from django.test import TestCase
+
+from ..models import Coupon, Person, PersonSearchGram
+from ..services.coupons import create_coupons
+from ..services.filters import filter_coupon_queryset
+from ..services.rollups import rollups_paused
+from ..services.search import rebuild_search_index
+from ..utils.search import fold_search_text, trigrams
+
+
+class SearchTextTests(TestCase):
+    def test_folding_drops_accents_and_case(self):
+        self.assertEqual(fold_search_text("Núñez ÁLVAREZ"), "nunez alvarez")
+
+    def test_trigrams_do_not_span_fields(self):
+        self.assertEqual(trigrams("ana\x1fsol"), {"ana", "sol"})
+
+
+class ParticipantSearchTests(TestCase):
+    def setUp(self):
+        self.people = [
+            Person.objects.create(
+                first_name=first,
+                last_name=last,
+                id_number=id_number,
+                phone=phone,
+                email=email,
+                birth_date=date(1990, 1, 1),
+            )
+            for first, last, id_number, phone, email in (
+                ("Ana", "Gómez", "30111222", "1155550001", "ana@example.com"),
+                ("Mariana", "Pérez", "30111333", "1155550002", ""),
+                ("Juan", "Rodríguez", "28999111", "2215550003", "juanr@example.org"),
+            )
+        ]
+        for index, person in enumerate(self.people):
+            for number in range(2):
+                Coupon.objects.create(
+                    person=person,
+                    code=f"CAJA{index}-{number:06d}",
+                    source=Coupon.REGISTER,
+                    room_id=1,
+                )
+
+    def _legacy_codes(self, params):
+        coupons = Coupon.objects.all()
+        if "participant" in params:
+            value = params["participant"]
+            coupons = coupons.filter(
+                Q(person__first_name__icontains=value)
+                | Q(person__last_name__icontains=value)
+                | Q(person__id_number__icontains=value)
+            )
+        if "coupon" in params:
+            value = params["coupon"]
+            coupons = coupons.filter(
+                Q(code__icontains=value)
+                | Q(person__phone__icontains=value)
+                | Q(person__email__icontains=value)
+            )
+        return set(coupons.values_list("code", flat=True))
+
+    def _codes(self, params):
+        coupons, _ = filter_coupon_queryset(Coupon.objects.all(), params)
+        return set(coupons.values_list("code", flat=True))
+
+    def test_results_match_the_previous_icontains_filters(self):
+        for params in (
+            {"participant": "ana"},
+            {"participant": "an"},
+            {"participant": "ANA"},
+            {"participant": "30111"},
+            {"participant": "rodríguez"},
+            {"coupon": "caja1-000001"},
+            {"coupon": "-0000"},
+            {"coupon": "5555000"},
+            {"coupon": "example.org"},
+            {"coupon": "@"},
+            {"participant": "ana", "coupon": "caja0"},
+            {"participant": "nadie"},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self._codes(params), self._legacy_codes(params))
+
+    def test_coupon_codes_are_indexed_even_with_rollups_paused(self):
+        with rollups_paused():
+            (coupon,) = create_coupons(
+                self.people[1], 1, Coupon.MANUAL, room_id=1, terminal_name="OTRA"
+            )
+
+        self.assertEqual(self._codes({"coupon": coupon.code}), {coupon.code})
+
+    def test_accents_are_optional_in_queries(self):
+        self.assertEqual(self._codes({"participant": "gomez"}), {"CAJA0-000000", "CAJA0-000001"})
+        self.assertEqual(self._codes({"participant": "rodriguez"}), {"CAJA2-000000", "CAJA2-000001"})
+
+    def test_edits_and_rebuild_keep_the_index_current(self):
+        person = self.people[1]
+        person.last_name = "Benítez"
+        person.save()
+        self.assertEqual(self._codes({"participant": "benitez"}), {"CAJA1-000000", "CAJA1-000001"})
+        self.assertEqual(self._codes({"participant": "perez"}), set())
+
+        grams = set(PersonSearchGram.objects.values_list("person_id", "kind", "gram"))
+        PersonSearchGram.objects.all().delete()
+        self.assertEqual(rebuild_search_index(), 3)
+        self.assertEqual(set(PersonSearchGram.objects.values_list("person_id", "kind", "gram")), grams)
@@ -0,0 +1,64 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Coupon, Person, Terminal, VoucherScan
+from ..services import create_coupons, terminals
+
+
+class TerminalRegistryTests(TestCase):
+    def setUp(self):
+        self.person = Person.objects.create(
+            first_name="Registro",
+            last_name="Terminal",
+            id_number="66667777",
+            phone="5554444",
+            birth_date=date(1988, 8, 8),
+        )
+        self.addCleanup(terminals._touched.clear)
+
+    def test_first_activity_registers_the_terminal_once(self):
+        """A terminal is written when first seen, then served from the process cache."""
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_coupons(self.person, 2, Coupon.REGISTER, room_id=1, terminal_name="CAJA-T")
+        terminal = Terminal.objects.get(name="CAJA-T")
+        self.assertLessEqual(terminal.first_seen_at, terminal.last_seen_at)
+
+        coupons = list(Coupon.objects.filter(terminal_name="CAJA-T"))
+        with self.assertNumQueries(0):
+            terminals.touch_terminals(coupons)
+
+    def test_later_activity_extends_last_seen(self):
+        VoucherScan.objects.create(
+            code="TERM-1", person=self.person, room_id=1, terminal_name="CAJA-V", source=Coupon.ENTRY
+        )
+        first = Terminal.objects.get(name="CAJA-V")
+        later = VoucherScan(
+            code="TERM-2",
+            person=self.person,
+            terminal_name="CAJA-V",
+            scanned_at=first.last_seen_at + timedelta(hours=1),
+        )
+
+        terminals.touch_terminals([later])
+
+        terminal = Terminal.objects.get(name="CAJA-V")
+        self.assertEqual(terminal.first_seen_at, first.first_seen_at)
+        self.assertEqual(terminal.last_seen_at, later.scanned_at)
+
+    def test_filter_dropdowns_read_the_registry(self):
+        User = get_user_model()
+        admin = User.objects.create_user(
+            username="admin_term", password="secret", role=User.Role.ADMIN
+        )
+        self.client.force_login(admin)
+        Terminal.objects.create(
+            name="CAJA-SOLO", first_seen_at=date(2026, 1, 1), last_seen_at=date(2026, 1, 1)
+        )
+
+        for name in ("raffle_admin:dashboard", "raffle_admin:coupons", "raffle_admin:reprints"):
+            response = self.client.get(reverse(name))
+            self.assertContains(response, "CAJA-SOLO")
@@ -3,30 +3,23 @@
 from __future__ import annotations
 
 import json
-from contextlib import contextmanager
 from types import SimpleNamespace
 from unittest import mock
 
 from django.test import SimpleTestCase
 
 from raffle.services import voucher_validation
+from raffle.services.http_pool import PooledResponse, RequestTimings
 
 
-@contextmanager
-def stubbed_response(body: str):
-    """Yield a fake HTTP response object with a fixed body."""
+def stubbed_response(body: str, status: int = 200) -> PooledResponse:
+    """Return a fake pooled HTTP response with a fixed body."""
 
-    class _Stub:
-        def __enter__(self):
-            return self
-
-        def __exit__(self, exc_type, exc_val, exc_tb):
-            return False
-
-        def read(self):
-            return body.encode("utf-8")
-
-    yield _Stub()
+    return PooledResponse(
+        status=status,
+        body=body.encode("utf-8"),
+        timings=RequestTimings(connect=0.0, request=0.0, total=0.0, reused=False),
+    )
 
 
 class VoucherValidationTests(SimpleTestCase):
@@ -40,8 +33,8 @@ class VoucherValidationTests(SimpleTestCase):
 
         payload = json.dumps({"error": False, "message": "OK"})
         with mock.patch.object(voucher_validation.RoomDirectory, "get", return_value=self.room):
-            with mock.patch.object(voucher_validation.request, "urlopen") as urlopen_mock:
-                urlopen_mock.return_value = stubbed_response(payload)
+            with mock.patch.object(voucher_validation.ROOM_API_POOL, "request") as request_mock:
+                request_mock.return_value = stubbed_response(payload)
                 result = voucher_validation.validate_voucher_code("ABC", room_id=1)
 
         self.assertTrue(result.is_valid)
@@ -51,8 +44,8 @@ class VoucherValidationTests(SimpleTestCase):
         """Validation fails with timeout message when API returns nothing."""
 
         with mock.patch.object(voucher_validation.RoomDirectory, "get", return_value=self.room):
-            with mock.patch.object(voucher_validation.request, "urlopen") as urlopen_mock:
-                urlopen_mock.return_value = stubbed_response("")
+            with mock.patch.object(voucher_validation.ROOM_API_POOL, "request") as request_mock:
+                request_mock.return_value = stubbed_response("")
                 result = voucher_validation.validate_voucher_code("ABC", room_id=1)
 
         self.assertFalse(result.is_valid)
@@ -63,9 +56,20 @@ class VoucherValidationTests(SimpleTestCase):
 
         payload = json.dumps({"error": True, "message": "Cupón No Pertenece a la Sala"})
         with mock.patch.object(voucher_validation.RoomDirectory, "get", return_value=self.room):
-            with mock.patch.object(voucher_validation.request, "urlopen") as urlopen_mock:
-                urlopen_mock.return_value = stubbed_response(payload)
+            with mock.patch.object(voucher_validation.ROOM_API_POOL, "request") as request_mock:
+                request_mock.return_value = stubbed_response(payload)
                 result = voucher_validation.validate_voucher_code("ABC", room_id=1)
 
         self.assertFalse(result.is_valid)
         self.assertEqual(result.message, "Cupón No Pertenece a la Sala")
+
+    def test_validation_handles_http_error_status(self):
+        """Validation fails with timeout message when the endpoint answers 5xx."""
+
+        with mock.patch.object(voucher_validation.RoomDirectory, "get", return_value=self.room):
+            with mock.patch.object(voucher_validation.ROOM_API_POOL, "request") as request_mock:
+                request_mock.return_value = stubbed_response("{}", status=500)
+                result = voucher_validation.validate_voucher_code("ABC", room_id=1)
+
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.message, "Tiempo de espera de la API excedido.")
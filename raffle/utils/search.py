@@ -0,0 +1,30 @@
+"""Text folding and trigram helpers behind the participant search index."""
+
+from __future__ import annotations
+
+import unicodedata
+from typing import Iterable
+
+GRAM_SIZE = 3
+# Joins the fields of one search key so a match never spans two fields.
+FIELD_SEPARATOR = "\x1f"
+
+
+def fold_search_text(value: str | None) -> str:
+    """Lower-case and strip accents so "Núñez" and "nunez" compare equal."""
+
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def search_key(values: Iterable[str | None]) -> str:
+    return FIELD_SEPARATOR.join(fold_search_text(value) for value in values)
+
+
+def trigrams(text: str) -> set[str]:
+    """Every three-character window of each field in a folded search key."""
+
+    grams = set()
+    for part in text.split(FIELD_SEPARATOR):
+        grams.update(part[index : index + GRAM_SIZE] for index in range(len(part) - GRAM_SIZE + 1))
+    return grams
@@ -3,12 +3,19 @@
 from __future__ import annotations
 
 import json
+import re
+from datetime import date
 from pathlib import Path
 
 from django.conf import settings
 
 TERMS_CONFIG_FILENAME = "terms_config.json"
 TERMS_CONFIG_PATH = Path(settings.BASE_DIR) / TERMS_CONFIG_FILENAME
+# Numbered entries of the draw schedule ("3. 16/12/2025 Sala ...") and the final draw.
+DRAW_DATE_PATTERN = re.compile(
+    r"^\s*\d+\.\s*(\d{2})/(\d{2})/(\d{4})|sorteo final el d[ií]a (\d{2})/(\d{2})/(\d{4})",
+    re.MULTILINE | re.IGNORECASE,
+)
 DEFAULT_TERMS_TEXT = """“EL JUEGO COMPULSIVO ES PERJUDICIAL PARA LA SALUD Y PRODUCE ADICCIÓN. LEY 1647-C”
 BASES Y CONDICIONES PROMOCIÓN
 La ciudad de la suerte
@@ -190,3 +197,17 @@ def save_terms_config(terms_text: str) -> dict[str, str]:
     path = get_terms_config_path()
     path.write_text(json.dumps(payload, indent=4, ensure_ascii=False), encoding="utf-8")
     return payload
+
+
+def get_draw_dates(terms_text: str | None = None) -> list[date]:
+    """Return the draw dates listed in the terms, in chronological order."""
+
+    text = get_terms_text() if terms_text is None else terms_text
+    dates = set()
+    for match in DRAW_DATE_PATTERN.finditer(text):
+        day, month, year = (int(value) for value in match.groups() if value is not None)
+        try:
+            dates.add(date(year, month, day))
+        except ValueError:
+            continue
+    return sorted(dates)
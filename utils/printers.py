@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
+import atexit
+import os
 import textwrap
+import threading
+import time
 
 try:
     import win32print
@@ -26,6 +31,12 @@ if TYPE_CHECKING:  # pragma: no cover - type checking only
 MAX_LINE_LENGTH = 48
 LABEL_WIDTH = 14
 SEPARATOR_LINE = "=" * 40
+ESCPOS_INIT = b"\x1b\x40"
+ESCPOS_CUT = b"\x1d\x56\x00"
+CUT_PADDING = b"\n" * 5
+USB_WRITE_CHUNK = 4096
+# Seconds without writes after which an open session is reported as idle.
+USB_IDLE_AFTER = 60
 
 
 class USBPrinterError(RuntimeError):
@@ -38,12 +49,12 @@ def pyusb_available() -> bool:
     return usb is not None and usb_util is not None
 
 
-def raw_print_windows(printer_name: str, payload: bytes):
+def raw_print_windows(printer_name: str, payload: bytes, document_name: str = "Cupon"):
     if win32print is None:
         raise RuntimeError("win32print is not available on this platform.")
     h = win32print.OpenPrinter(printer_name)
     try:
-        win32print.StartDocPrinter(h, 1, ("Cupon", None, "RAW"))
+        win32print.StartDocPrinter(h, 1, (document_name, None, "RAW"))
         win32print.StartPagePrinter(h)
         win32print.WritePrinter(h, payload)
         win32print.EndPagePrinter(h)
@@ -52,48 +63,191 @@ def raw_print_windows(printer_name: str, payload: bytes):
         win32print.ClosePrinter(h)
 
 
-def raw_print_usb(vendor_id: int, product_id: int, payload: bytes) -> None:
-    if not pyusb_available():
-        raise USBPrinterError("pyusb is not available in this environment.")
-    device = usb.find(idVendor=vendor_id, idProduct=product_id)
-    if device is None:
-        raise USBPrinterError("USB printer not found for the provided identifiers.")
-    try:
-        device.set_configuration()
-        configuration = device.get_active_configuration()
-        endpoint = None
-        selected_interface = None
-        for interface in configuration:
-            endpoint = usb_util.find_descriptor(
-                interface,
-                custom_match=lambda e: usb_util.endpoint_direction(e.bEndpointAddress)
-                == usb_util.ENDPOINT_OUT,
-            )
-            if endpoint is not None:
-                selected_interface = interface
-                break
-        if endpoint is None or selected_interface is None:
-            raise USBPrinterError("USB printer endpoint not found.")
-        interface_number = selected_interface.bInterfaceNumber
-        kernel_detached = False
-        try:
-            if device.is_kernel_driver_active(interface_number):  # pragma: no cover
-                device.detach_kernel_driver(interface_number)
-                kernel_detached = True
-        except (NotImplementedError, USBError):  # pragma: no cover
-            pass
-        usb_util.claim_interface(device, interface_number)
+class USBPrinterSession:
+    """Long-lived, thread-safe connection to one USB printer.
+
+    The device is configured and its interface claimed once; later writes go
+    straight to the resolved OUT endpoint. A ``USBError`` drops the handle and
+    the write is retried once on a fresh connection.
+    """
+
+    DISCONNECTED = "disconnected"
+    CONNECTED = "connected"
+    IDLE = "idle"
+    ERROR = "error"
+
+    def __init__(self, vendor_id: int, product_id: int, idle_after: float = USB_IDLE_AFTER):
+        self.vendor_id = vendor_id
+        self.product_id = product_id
+        self.idle_after = idle_after
+        self.last_error = ""
+        self.last_write_at: float | None = None
+        self.writes = 0
+        self.reconnects = 0
+        self._device = None
+        self._endpoint = None
+        self._interface_number = None
+        self._kernel_detached = False
+        self._failed = False
+        self._lock = threading.RLock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._failed:
+                return self.ERROR
+            if self._device is None:
+                return self.DISCONNECTED
+            last_activity = self.last_write_at or 0.0
+            if time.monotonic() - last_activity > self.idle_after:
+                return self.IDLE
+            return self.CONNECTED
+
+    def snapshot(self) -> dict:
+        """Return the session state for status pages."""
+
+        with self._lock:
+            idle_for = None
+            if self.last_write_at is not None:
+                idle_for = round(time.monotonic() - self.last_write_at, 1)
+            return {
+                "vendor_id": f"0x{self.vendor_id:04X}",
+                "product_id": f"0x{self.product_id:04X}",
+                "state": self.state,
+                "last_error": self.last_error,
+                "idle_seconds": idle_for,
+                "writes": self.writes,
+                "reconnects": self.reconnects,
+            }
+
+    def write(self, payload: bytes) -> None:
+        """Send the payload, reconnecting once if the device went away."""
+
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._device is None:
+                        self._open()
+                        if attempt:
+                            self.reconnects += 1
+                    # Chunked writes keep long batches within the per-transfer timeout.
+                    for offset in range(0, len(payload), USB_WRITE_CHUNK):
+                        self._endpoint.write(payload[offset:offset + USB_WRITE_CHUNK])
+                except USBPrinterError as exc:
+                    self._fail(str(exc))
+                    raise
+                except USBError as exc:
+                    self._fail(str(exc))
+                    if attempt:
+                        raise USBPrinterError(f"USB write failed: {exc}") from exc
+                else:
+                    self._failed = False
+                    self.last_error = ""
+                    self.last_write_at = time.monotonic()
+                    self.writes += 1
+                    return
+
+    def close(self) -> None:
+        """Release the interface and hand the device back to the kernel."""
+
+        with self._lock:
+            device, self._device = self._device, None
+            self._endpoint = None
+            if device is None:
+                return
+            try:
+                usb_util.release_interface(device, self._interface_number)
+            except USBError:  # pragma: no cover - device already gone
+                pass
+            usb_util.dispose_resources(device)
+            if self._kernel_detached:  # pragma: no cover
+                try:
+                    device.attach_kernel_driver(self._interface_number)
+                except USBError:
+                    pass
+            self._kernel_detached = False
+
+    def _fail(self, message: str) -> None:
+        self.close()
+        self._failed = True
+        self.last_error = message
+
+    def _open(self) -> None:
+        if not pyusb_available():
+            raise USBPrinterError("pyusb is not available in this environment.")
+        device = usb.find(idVendor=self.vendor_id, idProduct=self.product_id)
+        if device is None:
+            raise USBPrinterError("USB printer not found for the provided identifiers.")
         try:
-            endpoint.write(payload)
-        finally:
-            usb_util.release_interface(device, interface_number)
-    finally:
-        usb_util.dispose_resources(device)
-        if "kernel_detached" in locals() and kernel_detached:  # pragma: no cover
+            device.set_configuration()
+            configuration = device.get_active_configuration()
+            endpoint = None
+            selected_interface = None
+            for interface in configuration:
+                endpoint = usb_util.find_descriptor(
+                    interface,
+                    custom_match=lambda e: usb_util.endpoint_direction(e.bEndpointAddress)
+                    == usb_util.ENDPOINT_OUT,
+                )
+                if endpoint is not None:
+                    selected_interface = interface
+                    break
+            if endpoint is None or selected_interface is None:
+                raise USBPrinterError("USB printer endpoint not found.")
+            interface_number = selected_interface.bInterfaceNumber
+            self._kernel_detached = False
             try:
-                device.attach_kernel_driver(interface_number)
-            except USBError:
+                if device.is_kernel_driver_active(interface_number):  # pragma: no cover
+                    device.detach_kernel_driver(interface_number)
+                    self._kernel_detached = True
+            except (NotImplementedError, USBError):  # pragma: no cover
                 pass
+            usb_util.claim_interface(device, interface_number)
+        except BaseException:
+            usb_util.dispose_resources(device)
+            raise
+        self._device = device
+        self._endpoint = endpoint
+        self._interface_number = interface_number
+
+
+_USB_SESSIONS: dict[tuple[int, int], USBPrinterSession] = {}
+_USB_SESSIONS_LOCK = threading.Lock()
+
+
+def get_usb_session(vendor_id: int, product_id: int) -> USBPrinterSession:
+    """Return the shared session for the printer with these identifiers."""
+
+    key = (vendor_id, product_id)
+    with _USB_SESSIONS_LOCK:
+        session = _USB_SESSIONS.get(key)
+        if session is None:
+            session = _USB_SESSIONS[key] = USBPrinterSession(vendor_id, product_id)
+        return session
+
+
+def find_usb_session(vendor_id: int, product_id: int) -> USBPrinterSession | None:
+    """Return the session for these identifiers without creating one."""
+
+    with _USB_SESSIONS_LOCK:
+        return _USB_SESSIONS.get((vendor_id, product_id))
+
+
+def close_usb_sessions() -> None:
+    """Close every open printer session, e.g. after the identifiers change."""
+
+    with _USB_SESSIONS_LOCK:
+        sessions = list(_USB_SESSIONS.values())
+        _USB_SESSIONS.clear()
+    for session in sessions:
+        session.close()
+
+
+atexit.register(close_usb_sessions)
+
+
+def raw_print_usb(vendor_id: int, product_id: int, payload: bytes) -> None:
+    get_usb_session(vendor_id, product_id).write(payload)
 
 
 def list_usb_printers() -> list[dict[str, str]]:
@@ -126,40 +280,109 @@ def list_usb_printers() -> list[dict[str, str]]:
     return devices
 
 
-def build_coupon_text(coupon: "Coupon") -> str:
-    """Return the standardized coupon text for ESC/POS printers."""
+def _truncate(line: str) -> str:
+    return line[:MAX_LINE_LENGTH]
+
+
+def _center_header(text: str) -> str:
+    return _truncate(text.center(len(SEPARATOR_LINE)))
 
-    def truncate(line: str) -> str:
-        return line[:MAX_LINE_LENGTH]
 
-    def center_header(text: str) -> str:
-        return truncate(text.center(len(SEPARATOR_LINE)))
+def _format_field(label: str, value: str) -> str:
+    label_text = f"{label}:"
+    return _truncate(f"{label_text:<{LABEL_WIDTH}} {value}")
 
-    def format_field(label: str, value: str) -> str:
-        label_text = f"{label}:"
-        return truncate(f"{label_text:<{LABEL_WIDTH}} {value}")
 
-    person = getattr(coupon, "person", None)
-    full_name = ""
-    id_number = ""
-    phone = ""
+def _encode(text: str) -> bytes:
+    return text.encode("cp858", "ignore")
 
-    if person is not None:
-        names = [getattr(person, "first_name", ""), getattr(person, "last_name", "")]
-        full_name = " ".join(part for part in names if part).strip()
-        id_number = getattr(person, "id_number", "")
-        phone = getattr(person, "phone", "")
 
-    full_name = full_name or "-"
-    id_number = id_number or "-"
-    phone = phone or "-"
-    coupon_code = getattr(coupon, "code", "-")
-    room_name = getattr(coupon, "room_name", "-")
-    scanned_at = getattr(coupon, "scanned_at", None)
-    formatted_date = "-"
+@dataclass(frozen=True)
+class CouponTemplate:
+    """Coupon layout with the settings-dependent sections already rendered."""
 
-    if scanned_at is not None:
-        formatted_date = scanned_at.strftime("%d/%m/%Y %H:%M")
+    header: str
+    footer: str
+    header_bytes: bytes
+    # Footer plus feed and cut, ready to be appended after the coupon fields.
+    footer_bytes: bytes
+
+    @classmethod
+    def compile(cls, company_name: str, coupon_legend: str) -> "CouponTemplate":
+        header_lines = [
+            "",
+            SEPARATOR_LINE,
+            _center_header(company_name.upper()),
+            _center_header("CIUDAD DE LA SUERTE"),
+            SEPARATOR_LINE,
+        ]
+        # SEPARADOR antes de la leyenda, leyenda envuelta y SEPARADOR debajo.
+        footer_lines = ["", SEPARATOR_LINE]
+        footer_lines.extend(textwrap.wrap(coupon_legend, MAX_LINE_LENGTH) or [coupon_legend])
+        footer_lines.append(SEPARATOR_LINE)
+        # 2 líneas extra en blanco
+        footer_lines.extend(["", ""])
+
+        header = "\n".join(header_lines) + "\n"
+        footer = "\n" + "\n".join(footer_lines)
+        return cls(
+            header=header,
+            footer=footer,
+            header_bytes=_encode(header),
+            footer_bytes=_encode(footer) + CUT_PADDING + ESCPOS_CUT,
+        )
+
+    @staticmethod
+    def coupon_fields(coupon: "Coupon") -> str:
+        """Return the per-coupon lines between the header and the legend."""
+
+        person = getattr(coupon, "person", None)
+        full_name = ""
+        id_number = ""
+        phone = ""
+
+        if person is not None:
+            names = [getattr(person, "first_name", ""), getattr(person, "last_name", "")]
+            full_name = " ".join(part for part in names if part).strip()
+            id_number = getattr(person, "id_number", "")
+            phone = getattr(person, "phone", "")
+
+        scanned_at = getattr(coupon, "scanned_at", None)
+        formatted_date = "-"
+        if scanned_at is not None:
+            formatted_date = scanned_at.strftime("%d/%m/%Y %H:%M")
+
+        return "\n".join(
+            [
+                _format_field("Nombre", full_name or "-"),
+                _format_field("DNI", id_number or "-"),
+                _format_field("Teléfono", phone or "-"),
+                "",
+                _format_field("Código cupón", getattr(coupon, "code", "-")),
+                _format_field("Fecha", formatted_date),
+                _format_field("Sala", getattr(coupon, "room_name", "-")),
+            ]
+        )
+
+    def render_text(self, coupon: "Coupon") -> str:
+        return self.header + self.coupon_fields(coupon) + self.footer
+
+    def render_bytes(self, coupon: "Coupon") -> bytes:
+        """Return the coupon text plus feed and cut, encoded for the printer."""
+
+        return self.header_bytes + _encode(self.coupon_fields(coupon)) + self.footer_bytes
+
+
+# Process-wide template: (version, loaded_at, template). SystemSettings writes
+# bump the version; the TTL covers edits made from another process.
+COUPON_TEMPLATE_TTL = float(os.getenv("COUPON_TEMPLATE_TTL", "300"))
+_template_version = 0
+_template_cache: tuple[int, float, CouponTemplate] | None = None
+_template_lock = threading.Lock()
+
+
+def _load_coupon_template() -> tuple[CouponTemplate, bool]:
+    """Compile the template from SystemSettings; flag whether it may be cached."""
 
     try:
         from raffle.services import get_or_create_system_settings
@@ -173,44 +396,61 @@ def build_coupon_text(coupon: "Coupon") -> str:
         "coupon_legend",
         "El Juego Compulsivo es Perjudicial para la Salud y Produce Adicción ley 6169",
     )
+    return CouponTemplate.compile(company_name, coupon_legend), settings_instance is not None
+
+
+def get_coupon_template() -> CouponTemplate:
+    """Return the compiled coupon template, reloading it when settings change."""
+
+    global _template_cache
 
-    # --- CUERPO PRINCIPAL ---
-    lines = [
-        "",
-        SEPARATOR_LINE,
-        center_header(company_name.upper()),
-        center_header("CIUDAD DE LA SUERTE"),
-        SEPARATOR_LINE,
-        format_field("Nombre", full_name),
-        format_field("DNI", id_number),
-        format_field("Teléfono", phone),
-        "",
-        format_field("Código cupón", coupon_code),
-        format_field("Fecha", formatted_date),
-        format_field("Sala", room_name),
-        "",
-        # SEPARADOR antes de la leyenda
-        SEPARATOR_LINE,
-    ]
-
-    # --- LEYENDA ENVUELTA ---
-    wrapped_legend = textwrap.wrap(coupon_legend, MAX_LINE_LENGTH) or [coupon_legend]
-    lines.extend(wrapped_legend)
-
-    # SEPARADOR debajo de la leyenda
-    lines.append(SEPARATOR_LINE)
-
-    # 2 líneas extra en blanco
-    lines.append("")
-    lines.append("")
-
-    return "\n".join(lines)
+    cached = _template_cache
+    if (
+        cached is not None
+        and cached[0] == _template_version
+        and time.monotonic() - cached[1] < COUPON_TEMPLATE_TTL
+    ):
+        return cached[2]
+
+    with _template_lock:
+        # The first load may create the settings row, which bumps the version;
+        # read once more so the template is cached against the settled version.
+        for _ in range(2):
+            version = _template_version
+            template, cacheable = _load_coupon_template()
+            if version == _template_version:
+                break
+        # Defaults used while the settings are unreadable are not cached.
+        if cacheable and version == _template_version:
+            _template_cache = (version, time.monotonic(), template)
+    return template
+
+
+def invalidate_coupon_template() -> None:
+    """Force the next coupon to recompile the template from SystemSettings."""
+
+    global _template_cache, _template_version
+
+    # No lock: loading the template may itself save SystemSettings.
+    _template_version += 1
+    _template_cache = None
+
+
+def build_coupon_text(coupon: "Coupon") -> str:
+    """Return the standardized coupon text for ESC/POS printers."""
+
+    return get_coupon_template().render_text(coupon)
 
 
 def build_escpos_bytes(coupon):
     # Assemble the ESC/POS bytes, including initialization and cut commands.
-    text = build_coupon_text(coupon)
-    padding = b"\n" * 5
-    return b"".join(
-        [b"\x1b\x40", text.encode("cp858", "ignore"), padding, b"\x1d\x56\x00"]
-    )
+    return build_escpos_batch([coupon])
+
+
+def build_escpos_batch(coupons) -> bytes:
+    """Return a single ESC/POS stream with a feed and cut after each coupon."""
+
+    template = get_coupon_template()
+    parts = [ESCPOS_INIT]
+    parts.extend(template.render_bytes(coupon) for coupon in coupons)
+    return b"".join(parts)